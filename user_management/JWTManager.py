@@ -1,13 +1,86 @@
 import jwt
 import datetime
+import hashlib
+import uuid
+from functools import lru_cache
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from jwt import ExpiredSignatureError, InvalidTokenError
+from jwt.algorithms import get_default_algorithms
+from users.caching import BoundedTTLCache
+from user_management.metrics import span
+
+SUPPORTED_ALGORITHMS = ('RS256', 'ES256', 'EdDSA')
+
+
+@lru_cache(maxsize=None)
+def _read_pem(path):
+    with open(path) as f:
+        return f.read()
+
+
+def _pem(name):
+    """
+    Returns the PEM text from settings.<name>, or read from settings.<name>_PATH on first use.
+    """
+    pem = getattr(settings, name, None)
+    if pem:
+        return pem
+    path = getattr(settings, f'{name}_PATH', None)
+    if not path:
+        raise ImproperlyConfigured(f'Set {name}_PATH (or {name}) to use JWTManager')
+    return _read_pem(path)
+
+
+@lru_cache(maxsize=None)
+def _load_key(algorithm, pem):
+    """
+    Parses a PEM encoded key into a key object once per process.
+    Args:
+        algorithm (str): The JWT algorithm the key is used with.
+        pem (str): The PEM encoded private or public key.
+    Returns:
+        object: The key object expected by PyJWT for the algorithm.
+    """
+    return get_default_algorithms()[algorithm].prepare_key(pem)
+
+
+_verified_token_cache = None
+
 
 class JWTManager:
     """
     A utility class for handling JWT tokens (creation, validation, and refreshing).
     """
 
+    @staticmethod
+    def get_algorithm():
+        """
+        Returns the signing algorithm configured in settings.JWT_ALGORITHM.
+        Raises:
+            ImproperlyConfigured: If the algorithm is not supported.
+        """
+        algorithm = settings.JWT_ALGORITHM
+        if algorithm not in SUPPORTED_ALGORITHMS:
+            raise ImproperlyConfigured(
+                f"JWT_ALGORITHM must be one of {', '.join(SUPPORTED_ALGORITHMS)}, got '{algorithm}'"
+            )
+        return algorithm
+
+    @staticmethod
+    def get_signing_key():
+        """
+        Returns the parsed private key used to sign tokens.
+        """
+        return _load_key(JWTManager.get_algorithm(), _pem('ACCESS_PRIVATE_KEY'))
+
+    @staticmethod
+    def get_verifying_key():
+        """
+        Returns the parsed public key used to verify tokens.
+        """
+        return _load_key(JWTManager.get_algorithm(), _pem('ACCESS_PUBLIC_KEY'))
+
     @staticmethod
     def create_access_token(user_id):
         """
@@ -17,13 +90,15 @@ class JWTManager:
         Returns:
             str: Encoded JWT access token.
         """
+        now = datetime.datetime.utcnow()
         payload = {
             'user_id': user_id,
             'type': 'access',
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(minutes=settings.ACCESS_EXPIRATION_MINUTES),
-            'iat': datetime.datetime.utcnow(),
+            'exp': now + datetime.timedelta(minutes=settings.ACCESS_EXPIRATION_MINUTES),
+            'iat': now,
         }
-        return jwt.encode(payload, settings.ACCESS_PRIVATE_KEY, algorithm='RS256')
+        with span('jwt'):
+            return jwt.encode(payload, JWTManager.get_signing_key(), algorithm=JWTManager.get_algorithm())
 
     @staticmethod
     def create_refresh_token(user_id):
@@ -34,13 +109,16 @@ class JWTManager:
         Returns:
             str: Encoded JWT refresh token.
         """
+        now = datetime.datetime.utcnow()
         payload = {
             'user_id': user_id,
             'type': 'refresh',
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(days=settings.REFRESH_EXPIRATION_MINUTES // (24 * 60)),
-            'iat': datetime.datetime.utcnow(),
+            'exp': now + datetime.timedelta(days=settings.REFRESH_EXPIRATION_MINUTES // (24 * 60)),
+            'iat': now,
+            'jti': uuid.uuid4().hex,
         }
-        return jwt.encode(payload, settings.ACCESS_PRIVATE_KEY, algorithm='RS256')
+        with span('jwt'):
+            return jwt.encode(payload, JWTManager.get_signing_key(), algorithm=JWTManager.get_algorithm())
 
     @staticmethod
     def decode_token(token):
@@ -55,16 +133,32 @@ class JWTManager:
             InvalidTokenError: If the token is invalid or tampered with.
         """
         try:
-            return jwt.decode(token, settings.ACCESS_PUBLIC_KEY, algorithms=['RS256'])
+            with span('jwt'):
+                return jwt.decode(token, JWTManager.get_verifying_key(), algorithms=[JWTManager.get_algorithm()])
         except ExpiredSignatureError:
             raise ExpiredSignatureError("Token has expired")
         except InvalidTokenError:
             raise InvalidTokenError("Invalid token")
 
+    @staticmethod
+    def get_verified_token_cache():
+        """
+        Returns the per-process cache of verified access tokens, or None when
+        settings.ACCESS_TOKEN_CACHE_SIZE is 0.
+        """
+        global _verified_token_cache
+        if not settings.ACCESS_TOKEN_CACHE_SIZE:
+            return None
+        if _verified_token_cache is None:
+            _verified_token_cache = BoundedTTLCache(settings.ACCESS_TOKEN_CACHE_SIZE)
+        return _verified_token_cache
+
     @staticmethod
     def validate_access_token(token):
         """
         Validates an access token.
+        Tokens that already passed verification are served from the verified
+        token cache (keyed by a SHA-256 digest of the token) until their expiry.
         Args:
             token (str): The JWT access token to validate.
         Returns:
@@ -73,9 +167,19 @@ class JWTManager:
             ExpiredSignatureError: If the token has expired.
             InvalidTokenError: If the token is invalid or tampered with.
         """
+        cache = JWTManager.get_verified_token_cache()
+        if cache is not None:
+            digest = hashlib.sha256(token.encode() if isinstance(token, str) else token).digest()
+            payload = cache.get(digest)
+            if payload is not None:
+                return dict(payload)
+
         payload = JWTManager.decode_token(token)
         if payload.get('type') != 'access':
             raise InvalidTokenError("Invalid token type: expected 'access'")
+
+        if cache is not None and 'exp' in payload:
+            cache.set(digest, dict(payload), payload['exp'])
         return payload
 
     @staticmethod
@@ -90,23 +194,54 @@ class JWTManager:
             ExpiredSignatureError: If the token has expired.
             InvalidTokenError: If the token is invalid or tampered with.
         """
+        from users.revocation import revocation_store
+
         payload = JWTManager.decode_token(token)
         if payload.get('type') != 'refresh':
             raise InvalidTokenError("Invalid token type: expected 'refresh'")
+        if revocation_store.is_revoked(payload.get('jti')):
+            raise InvalidTokenError("Token has been revoked")
         return payload
 
     @staticmethod
-    def refresh_access_token(refresh_token):
+    def revoke_refresh_token(refresh_token):
         """
-        Generates a new access token from a valid refresh token.
+        Revokes a valid refresh token until it expires.
         Args:
             refresh_token (str): The JWT refresh token.
         Returns:
-            str: New JWT access token.
+            dict: Decoded payload of the revoked token.
         Raises:
             ExpiredSignatureError: If the refresh token has expired.
-            InvalidTokenError: If the refresh token is invalid or tampered with.
+            InvalidTokenError: If the refresh token is invalid, already revoked or has no jti.
         """
+        from users.revocation import revocation_store
+
         payload = JWTManager.validate_refresh_token(refresh_token)
+        if not payload.get('jti'):
+            raise InvalidTokenError("Token cannot be revoked: missing 'jti'")
+        if not revocation_store.revoke(payload['jti'], payload['exp']):
+            raise InvalidTokenError("Token has been revoked")
+        return payload
+
+    @staticmethod
+    def refresh_access_token(refresh_token, rotate=False):
+        """
+        Generates a new access token from a valid refresh token.
+        Args:
+            refresh_token (str): The JWT refresh token.
+            rotate (bool): Also revoke the refresh token and issue a new one (optional, default=False).
+        Returns:
+            str: New JWT access token, or a tuple (access token, refresh token) when rotate is True.
+        Raises:
+            ExpiredSignatureError: If the refresh token has expired.
+            InvalidTokenError: If the refresh token is invalid, revoked or tampered with.
+        """
+        if not rotate:
+            payload = JWTManager.validate_refresh_token(refresh_token)
+            return JWTManager.create_access_token(payload.get('user_id'))
+
+        # Revocation is atomic, so a refresh token can be rotated only once
+        payload = JWTManager.revoke_refresh_token(refresh_token)
         user_id = payload.get('user_id')
-        return JWTManager.create_access_token(user_id)
+        return JWTManager.create_access_token(user_id), JWTManager.create_refresh_token(user_id)
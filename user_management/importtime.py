@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Import-time report for worker boot.
+
+Runs a fresh interpreter with -X importtime, performs the imports a worker does
+before serving its first request (django.setup() and loading the URLconf), and
+prints a JSON report. It gives the total import time, the slowest modules by
+cumulative time and the time per top-level package. Optionally it also imports
+the view modules behind a list of routes, to show what the first request to
+them costs.
+
+    python importtime.py
+    python importtime.py --top 30 --output boot.json
+    python importtime.py --route /api/users/signin/ --route /api/users/search-username/
+    python importtime.py --baseline boot.json
+
+reports/importtime-before.json and reports/importtime-after.json hold the boot
+before and after the signal handlers' imports were deferred.
+
+Times vary between runs and machines; compare reports taken on the same host.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BOOT = '''
+import django
+django.setup()
+from django.urls import get_resolver, resolve
+get_resolver().url_patterns
+for route in {routes!r}:
+    view = resolve(route).func
+    getattr(view, 'view', view)
+'''
+
+
+def measure(settings_module, routes):
+    """
+    Returns [(module, self microseconds, cumulative microseconds)] in import order.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT.format(routes=routes)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        errors = '\n'.join(line for line in result.stderr.splitlines() if not line.startswith('import time:'))
+        sys.exit(f'Boot failed:\n{errors}')
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def report(imports, top):
+    packages = {}
+    for name, self_us, _ in imports:
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+    slowest = sorted(imports, key=lambda item: item[2], reverse=True)[:top]
+    return {
+        'total_ms': round(sum(self_us for _, self_us, _ in imports) / 1000, 1),
+        'modules': len(imports),
+        'slowest_ms': [
+            {'module': name, 'cumulative': round(cumulative / 1000, 1), 'self': round(self_us / 1000, 1)}
+            for name, self_us, cumulative in slowest
+        ],
+        'packages_ms': {
+            package: round(us / 1000, 1)
+            for package, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+        'imported': sorted(name for name, _, _ in imports),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--settings', default='user_management.settings', help='Settings module.')
+    parser.add_argument('--route', action='append', default=[], help='Also load the view behind this path.')
+    parser.add_argument('--top', type=int, default=20, help='Entries in the slowest module and package lists.')
+    parser.add_argument('--runs', type=int, default=3, help='Runs to take the fastest of.')
+    parser.add_argument('--output', help='Write the JSON report to this file as well as stdout.')
+    parser.add_argument('--baseline', help='A previous report to compare against.')
+    args = parser.parse_args()
+
+    runs = [report(measure(args.settings, args.route), args.top) for _ in range(max(args.runs, 1))]
+    result = min(runs, key=lambda run: run['total_ms'])
+    result['runs_ms'] = [run['total_ms'] for run in runs]
+    result['routes'] = args.route
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        result['baseline'] = {
+            'total_ms': baseline['total_ms'],
+            'change_ms': round(result['total_ms'] - baseline['total_ms'], 1),
+            'no_longer_imported': sorted(set(baseline['imported']) - set(result['imported'])),
+            'newly_imported': sorted(set(result['imported']) - set(baseline['imported'])),
+        }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
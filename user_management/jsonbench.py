@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+JSON serialization micro-benchmark for the users API.
+
+Times building the response for a representative payload of each endpoint
+and parsing its request body. It compares the stock path (django.http.JsonResponse
+or DRF's JSONRenderer, and json.loads(request.body.decode())) with
+user_management.fastjson, and prints one JSON report with microseconds per
+call and the speedup per endpoint.
+
+    python jsonbench.py
+    python jsonbench.py --repeat 7 --output json.json
+
+No database or server is needed. Without orjson installed fastjson falls back
+to the stdlib json module and the report says so.
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+import django
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(INSTALLED_APPS=['rest_framework'])
+django.setup()
+
+from django.http import JsonResponse as DjangoJsonResponse  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from user_management import fastjson  # noqa: E402
+
+NOW = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def profile(i):
+    return {
+        'id': i, 'username': f'player{i}', 'email': f'player{i}@example.com',
+        'first_name': 'Ada', 'last_name': 'Lovelace', 'date_joined': NOW - timedelta(days=i),
+        'last_login': NOW, 'is_active': True,
+    }
+
+
+# Endpoint -> (renderer used by the view, response payload, request body or None)
+PAYLOADS = {
+    'me': ('drf', profile(1), None),
+    'signin': ('django', {'jwt': 'e' * 40 + '.' + 'p' * 120 + '.' + 's' * 86}, {'email': 'player1@example.com', 'password': 'correct-horse-battery'}),
+    'signup': ('django', {'message': 'User created successfully, please verify your email'}, {
+        'username': 'player1', 'email': 'player1@example.com', 'password': 'correct-horse-battery',
+        'first_name': 'Ada', 'last_name': 'Lovelace',
+    }),
+    'search-username': ('django', {
+        'query': 'play', 'limit': 20, 'users': [{'username': f'player{i}'} for i in range(20)], 'next_cursor': 'cGxheWVyMTk',
+    }, {'username': 'play', 'limit': 20, 'cursor': 'cGxheWVyMTk'}),
+    'autocomplete-username': ('django', {
+        'prefix': 'pla', 'usernames': [f'player{i}' for i in range(10)], 'source': 'index',
+    }, None),
+    'availability': ('django', {
+        'usernames': {f'player{i}': {'taken': True, 'suggestions': [f'player{i}7', f'player{i}_42', f'player{i}311']} for i in range(10)},
+        'emails': {f'player{i}@example.com': {'taken': i % 2 == 0} for i in range(10)},
+    }, {'usernames': [f'player{i}' for i in range(10)], 'emails': [f'player{i}@example.com' for i in range(10)]}),
+    'search-username (100 users)': ('django', {
+        'query': 'play', 'limit': 100, 'users': [profile(i) for i in range(100)], 'next_cursor': None,
+    }, None),
+}
+
+
+def render_stock(kind, data):
+    if kind == 'drf':
+        return JSONRenderer().render(data)
+    return DjangoJsonResponse(data).content
+
+
+def render_fast(kind, data):
+    if kind == 'drf':
+        return fastjson.FastJSONRenderer().render(data)
+    return fastjson.JsonResponse(data).content
+
+
+def per_call_us(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return round(min(timer.repeat(repeat=repeat, number=number)) / number * 1e6, 2)
+
+
+def compare(stock, fast, repeat):
+    before, after = per_call_us(stock, repeat), per_call_us(fast, repeat)
+    return {'before_us': before, 'after_us': after, 'speedup': round(before / after, 2) if after else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs to take the fastest of.')
+    parser.add_argument('--endpoint', action='append', choices=sorted(PAYLOADS), help='Only these endpoints.')
+    parser.add_argument('--output', help='Write the JSON report to this file as well as stdout.')
+    args = parser.parse_args()
+
+    report = {'backend': 'orjson' if fastjson.orjson is not None else 'json', 'python': sys.version.split()[0], 'endpoints': {}}
+    for endpoint in args.endpoint or PAYLOADS:
+        kind, data, body = PAYLOADS[endpoint]
+        if json.loads(render_stock(kind, data)) != json.loads(render_fast(kind, data)):
+            sys.exit(f'{endpoint}: fast and stock renderings differ')
+        result = {'render': compare(lambda: render_stock(kind, data), lambda: render_fast(kind, data), args.repeat)}
+        if body is not None:
+            raw = json.dumps(body).encode('utf-8')
+            result['parse'] = compare(lambda: json.loads(raw.decode('utf-8')), lambda: fastjson.loads(raw), args.repeat)
+        report['endpoints'][endpoint] = result
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+"""
+Load test for the users API.
+
+Drives /api/users/signin/, /signup/, /search-username/ and /is-username-taken/
+with concurrent clients against a running server and prints one JSON report
+with latency percentiles, throughput and error rate per scenario.
+
+Typical run against a local server and database:
+
+    python manage.py migrate
+    python manage.py seed_users --count 10000
+    python manage.py runserver --noreload     # or gunicorn/uvicorn
+    python loadtest.py --duration 30 --concurrency 32 --output before.json
+    ... change code, restart the server ...
+    python loadtest.py --duration 30 --concurrency 32 --baseline before.json
+
+Only the standard library is used, so the script runs anywhere the server is
+reachable. Rate-limited responses (429) are counted as errors and listed under
+"statuses"; raise the limits in settings.RATE_LIMITS when measuring raw
+throughput of is-username-taken.
+"""
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+SCENARIOS = ('signin', 'signup', 'search-username', 'is-username-taken')
+
+
+class Client:
+    """
+    One simulated user: a seeded account plus its access token.
+    """
+
+    def __init__(self, base_url, timeout, email, password):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.email = email
+        self.password = password
+        self.token = None
+
+    def request(self, method, path, body=None, headers=None):
+        """
+        Sends one request.
+        Returns:
+            tuple: (HTTP status or 0 on connection failure, decoded JSON body or None).
+        """
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = Request(f'{self.base_url}{path}', data=data, method=method)
+        request.add_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            request.add_header(name, value)
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return response.status, decode(response.read())
+        except HTTPError as e:
+            return e.code, decode(e.read())
+        except (URLError, OSError):
+            return 0, None
+
+    def signin(self):
+        status, body = self.request('POST', '/api/users/signin/', {'email': self.email, 'password': self.password})
+        if status == 200 and body:
+            token = body.get('jwt')
+            if isinstance(token, dict):
+                token = token.get('access_token') or token.get('access')
+            self.token = token
+        return status
+
+    def signup(self):
+        name = f'lt{uuid.uuid4().hex[:12]}'
+        status, _ = self.request(
+            'POST', '/api/users/signup/',
+            {'username': name, 'email': f'{name}@example.com', 'password': self.password},
+        )
+        return status
+
+    def search_username(self, query):
+        headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+        status, _ = self.request('POST', '/api/users/search-username/', {'username': query}, headers)
+        return status
+
+    def is_username_taken(self, username):
+        status, _ = self.request('GET', f'/api/users/is-username-taken/?username={username}')
+        return status
+
+
+def decode(raw):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+class Recorder:
+    """
+    Collects per-scenario latencies and status codes from all client threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {scenario: [] for scenario in SCENARIOS}
+        self.statuses = {scenario: {} for scenario in SCENARIOS}
+
+    def record(self, scenario, seconds, status):
+        with self._lock:
+            self.latencies[scenario].append(seconds)
+            counts = self.statuses[scenario]
+            counts[status] = counts.get(status, 0) + 1
+
+    def report(self, elapsed):
+        return {scenario: summarize(self.latencies[scenario], self.statuses[scenario], elapsed) for scenario in SCENARIOS}
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, statuses, elapsed):
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if not 200 <= status < 300)
+    to_ms = lambda seconds: None if seconds is None else round(seconds * 1000, 2)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'error_rate': round(errors / len(ordered), 4) if ordered else 0.0,
+        'throughput_rps': round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': to_ms(statistics.fmean(ordered)) if ordered else None,
+            'p50': to_ms(percentile(ordered, 0.50)),
+            'p95': to_ms(percentile(ordered, 0.95)),
+            'p99': to_ms(percentile(ordered, 0.99)),
+            'max': to_ms(ordered[-1]) if ordered else None,
+        },
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def run_client(client, args, weights, deadline, recorder):
+    rng = random.Random()
+    scenarios = list(weights)
+    while time.monotonic() < deadline:
+        scenario = rng.choices(scenarios, weights=[weights[s] for s in scenarios])[0]
+        seeded = f'{args.prefix}{rng.randrange(args.users)}'
+        started = time.perf_counter()
+        if scenario == 'signin':
+            status = client.signin()
+        elif scenario == 'signup':
+            status = client.signup()
+        elif scenario == 'search-username':
+            status = client.search_username(seeded[:rng.randint(3, len(seeded))])
+        else:
+            status = client.is_username_taken(seeded if rng.random() < 0.5 else f'free{uuid.uuid4().hex[:10]}')
+        recorder.record(scenario, time.perf_counter() - started, status)
+
+
+def parse_mix(mix):
+    """
+    Parses 'signin=1,search-username=4' into {scenario: weight}.
+    """
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f'Unknown scenario {name!r}; choose from {", ".join(SCENARIOS)}')
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    """
+    Returns the relative change of p50/p95/p99 and throughput per scenario (0.1 = 10% higher).
+    """
+    changes = {}
+    for scenario, result in current.items():
+        before = baseline.get(scenario)
+        if not before or not result['requests'] or not before['requests']:
+            continue
+        delta = {}
+        for name in ('p50', 'p95', 'p99'):
+            old, new = before['latency_ms'][name], result['latency_ms'][name]
+            if old:
+                delta[f'{name}_ms'] = round((new - old) / old, 4)
+        if before['throughput_rps']:
+            delta['throughput_rps'] = round((result['throughput_rps'] - before['throughput_rps']) / before['throughput_rps'], 4)
+        delta['error_rate'] = round(result['error_rate'] - before['error_rate'], 4)
+        changes[scenario] = delta
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server under test.')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients.')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run.')
+    parser.add_argument('--warmup', type=float, default=3.0, help='Seconds to run before measuring.')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(','.join(SCENARIOS)),
+                        help='Scenario weights, e.g. "signin=1,search-username=4". Defaults to an even mix.')
+    parser.add_argument('--users', type=int, default=10000, help='Number of users created by seed_users.')
+    parser.add_argument('--prefix', default='loadtest', help='Username prefix passed to seed_users.')
+    parser.add_argument('--password', default='loadtest-password', help='Password passed to seed_users.')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout in seconds.')
+    parser.add_argument('--output', help='Write the JSON report to this file as well as stdout.')
+    parser.add_argument('--baseline', help='A previous report to compare against.')
+    args = parser.parse_args()
+
+    clients = []
+    for n in random.sample(range(args.users), min(args.concurrency, args.users)):
+        client = Client(args.base_url, args.timeout, f'{args.prefix}{n}@example.com', args.password)
+        if 'search-username' in args.mix and client.signin() != 200:
+            sys.exit(f'Could not sign in as {client.email}; is the server up and were users seeded with seed_users?')
+        clients.append(client)
+
+    if args.warmup:
+        deadline = time.monotonic() + args.warmup
+        with ThreadPoolExecutor(len(clients)) as pool:
+            for client in clients:
+                pool.submit(run_client, client, args, args.mix, deadline, Recorder())
+
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + args.duration
+    with ThreadPoolExecutor(len(clients)) as pool:
+        for future in [pool.submit(run_client, client, args, args.mix, deadline, recorder) for client in clients]:
+            future.result()
+    elapsed = time.monotonic() - started
+
+    results = {scenario: result for scenario, result in recorder.report(elapsed).items() if scenario in args.mix}
+    report = {
+        'revision': git_revision(),
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'config': {
+            'base_url': args.base_url,
+            'concurrency': len(clients),
+            'duration': args.duration,
+            'mix': args.mix,
+        },
+        'elapsed_seconds': round(elapsed, 3),
+        'results': results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report['baseline'] = {'revision': baseline.get('revision'), 'changes': compare(results, baseline['results'])}
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
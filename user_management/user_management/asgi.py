@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'user_management.settings')
 
 application = get_asgi_application()
+
+from users.autocomplete import username_index  # noqa: E402
+from users.availability import availability_filter  # noqa: E402
+
+availability_filter.warm_in_background()
+username_index.warm_in_background()
@@ -0,0 +1,15 @@
+"""
+Database helpers referenced from settings.
+
+Kept free of model imports so settings can import this module.
+"""
+
+
+def check_pooled_connection(connection):
+    """
+    Checks an idle pooled connection before it is handed out (the pool's 'check' callback).
+    psycopg_pool is imported here rather than in settings, so settings load
+    without it when DATABASE_POOLING isn't 'pool'.
+    """
+    from psycopg_pool import ConnectionPool
+    ConnectionPool.check_connection(connection)
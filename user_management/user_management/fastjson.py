@@ -0,0 +1,120 @@
+"""
+Fast JSON encoding and decoding for views and DRF.
+
+Uses orjson when it is installed. It serializes straight to bytes, which is
+what the response body needs anyway, and parses request.body without
+decoding it to a str first. Without orjson the same functions fall back to
+the stdlib json module, so nothing else has to know which one is in use.
+
+Values orjson can't serialize natively (Decimal, lazy translation strings,
+...) go through the encoder the stock code would use: DRF's for
+FastJSONRenderer, Django's DjangoJSONEncoder for JsonResponse. So do
+datetimes, dates and times, so they keep the stock format rather than
+orjson's: 'Z' for UTC, with microseconds from the renderer and milliseconds
+from JsonResponse. Invalid input raises ValueError from both loads()
+implementations.
+
+    from user_management.fastjson import JsonResponse, loads
+    data = loads(request.body)
+    return JsonResponse({'ok': True})
+"""
+import json
+from functools import lru_cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _default(encoder):
+    return encoder().default
+
+
+if orjson is not None:
+    # Datetimes are passed through to the encoder so their format doesn't change with orjson
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data, encoder=JSONEncoder):
+        """
+        Serializes data to UTF-8 encoded JSON bytes.
+        Args:
+            data: The object to serialize.
+            encoder (type): JSON encoder class whose default() handles the values orjson doesn't (optional, default=DRF's JSONEncoder).
+        """
+        return orjson.dumps(data, default=_default(encoder), option=OPTIONS)
+
+    def loads(data):
+        """
+        Parses JSON from bytes or str.
+        Raises:
+            ValueError: If data isn't valid JSON or UTF-8 (orjson.JSONDecodeError subclasses it).
+        """
+        return orjson.loads(data)
+else:
+    def dumps(data, encoder=JSONEncoder):
+        return json.dumps(data, cls=encoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(data):
+        # Raises json.JSONDecodeError, or UnicodeDecodeError for bytes that aren't UTF-8; both are ValueErrors
+        return json.loads(data)
+
+
+class JsonResponse(HttpResponse):
+    """
+    Drop-in replacement for django.http.JsonResponse that serializes with dumps()
+    and, like it, DjangoJSONEncoder. Passing encoder or json_dumps_params falls
+    back to the stdlib json module.
+    Args:
+        data: The object to serialize; must be a dict unless safe is False.
+        encoder (type): JSON encoder class for the stdlib fallback (optional, default=DjangoJSONEncoder).
+        safe (bool): Only allow dicts (optional, default=True).
+        json_dumps_params (dict): Keyword arguments for json.dumps (optional).
+    """
+
+    def __init__(self, data, encoder=None, safe=True, json_dumps_params=None, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                'In order to allow non-dict objects to be serialized set the safe parameter to False.'
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        if encoder is None and json_dumps_params is None:
+            content = dumps(data, DjangoJSONEncoder)
+        else:
+            content = json.dumps(data, cls=encoder or DjangoJSONEncoder, **(json_dumps_params or {}))
+        super().__init__(content=content, **kwargs)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer using dumps(). Requests for indented output (e.g. from the
+    browsable API) go through the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser parsing the raw request bytes with loads().
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,326 @@
+"""
+Per-request latency metrics exposed in the Prometheus text format.
+
+MetricsMiddleware times every request and, through span(), how much of it was
+spent in the database, password hashing, JWT signing/verification and email.
+Spans are only recorded while a request is being timed; elsewhere span() is a
+single ContextVar lookup. With METRICS_ENABLED = False the middleware removes
+itself from the stack and nothing is recorded.
+
+Spans can nest: the email span covers queueing the message, including its
+database insert, which is also counted under db.
+
+Metrics are kept per process. With several workers, scrape each one or run a
+single worker per metrics port.
+
+/metrics is only served to addresses in METRICS_ALLOWED_IPS, to requests
+carrying "Authorization: Bearer <METRICS_TOKEN>", and to staff users.
+"""
+import bisect
+import hmac
+import ipaddress
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+# Seconds; tuned for API requests from ~1ms to a few seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SPANS = ('db', 'hashing', 'jwt', 'email')
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds spent per span kind in the request being timed, or None outside a request
+_request_spans = ContextVar('request_spans', default=None)
+
+
+class Histogram:
+    """
+    A labelled histogram with fixed buckets.
+    """
+
+    def __init__(self, name, help_text, labels, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+
+    def observe(self, seconds, *label_values):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        for label_values, counts, total, count in sorted(series):
+            labels = format_labels(zip(self.labels, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                le = format_labels(zip(self.labels + ('le',), label_values + (str(bound),)))
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            lines.append(f'{self.name}_sum{labels} {total}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(pairs):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in pairs]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_sample(name, labels, value):
+    return f'{name}{format_labels(labels.items())} {value}'
+
+
+request_duration = Histogram(
+    'http_request_duration_seconds', 'Request latency by route.', ('route', 'method', 'status'),
+)
+request_span_duration = Histogram(
+    'http_request_span_seconds', 'Time spent per request in each hot-path span, by route.', ('route', 'span'),
+)
+
+# Callables returning a list of (name, type, help, [(labels dict, value), ...])
+_collectors = []
+
+
+def register_collector(collector):
+    """
+    Adds a callable whose samples are appended to every scrape.
+    """
+    _collectors.append(collector)
+    return collector
+
+
+@contextmanager
+def span(kind):
+    """
+    Adds the time spent in the block to the current request's span of this kind.
+    A no-op outside a timed request.
+    """
+    spans = _request_spans.get()
+    if spans is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans[kind] = spans.get(kind, 0.0) + time.perf_counter() - started
+
+
+def db_span_wrapper(execute, sql, params, many, context):
+    with span('db'):
+        return execute(sql, params, many, context)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    # Installed on every new connection, so ORM calls made from sync_to_async
+    # threads are timed too; the ContextVar follows the request into them
+    if db_span_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_span_wrapper)
+
+
+class MetricsMiddleware:
+    """
+    Records request latency per route and the per-request span breakdown.
+    Put it first in MIDDLEWARE so the whole stack is timed.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        connection_created.connect(instrument_connection, dispatch_uid='metrics_instrument_connection')
+        # Connections opened before the middleware loaded (e.g. by startup checks)
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(None, connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        spans = {}
+        token = _request_spans.set(spans)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_spans.reset(token)
+        self.record(request, response, time.perf_counter() - started, spans)
+        return response
+
+    async def __acall__(self, request):
+        spans = {}
+        token = _request_spans.set(spans)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_spans.reset(token)
+        self.record(request, response, time.perf_counter() - started, spans)
+        return response
+
+    @staticmethod
+    def record(request, response, elapsed, spans):
+        match = getattr(request, 'resolver_match', None)
+        # The route pattern, not the path, so ids in URLs don't create new series
+        route = match.route if match is not None else 'unmatched'
+        request_duration.observe(elapsed, route, request.method, str(response.status_code))
+        for kind in SPANS:
+            request_span_duration.observe(spans.get(kind, 0.0), route, kind)
+
+
+def collect_rate_limits():
+    from users.ratelimit import rate_limit_engine
+    samples = []
+    for route, counts in rate_limit_engine.metrics().items():
+        for outcome, value in counts.items():
+            samples.append(({'route': route, 'outcome': outcome}, value))
+    return [('rate_limit_requests_total', 'counter', 'Rate-limited route checks by outcome.', samples)]
+
+
+def collect_token_caches():
+    from JWTManager import JWTManager
+    from users.authentication import token_cache_stats
+    access_token_cache = JWTManager.get_verified_token_cache()
+    stats = {'drf_token': token_cache_stats()}
+    if access_token_cache is not None:
+        stats['access_token'] = access_token_cache.stats()
+    metrics = []
+    for field, kind in (('hits', 'counter'), ('misses', 'counter'), ('evictions', 'counter'), ('size', 'gauge')):
+        name = f'token_cache_{field}_total' if kind == 'counter' else f'token_cache_{field}'
+        samples = [({'cache': cache}, values[field]) for cache, values in stats.items()]
+        metrics.append((name, kind, f'Token cache {field}.', samples))
+    return metrics
+
+
+def collect_hashing():
+    from users.hashing import hashing_service
+    stats = hashing_service.stats()
+    return [
+        ('password_hashing_in_flight', 'gauge', 'Hashes queued or running on the pool.', [({}, stats['in_flight'])]),
+        ('password_hashing_completed_total', 'counter', 'Hashes completed.', [({}, stats['completed'])]),
+        ('password_hashing_rejected_total', 'counter', 'Hashes rejected because the queue was full.', [({}, stats['rejected'])]),
+        ('password_hashing_timeouts_total', 'counter', 'Hashes that did not finish in time.', [({}, stats['timeouts'])]),
+        ('password_hashing_seconds_total', 'counter', 'Time from submit to completion.', [({}, stats['total_seconds'])]),
+    ]
+
+
+def collect_db_pools():
+    from django.db import connections
+    # pool is None unless the alias has OPTIONS['pool'] (PostgreSQL only)
+    pools = {alias: getattr(connections[alias], 'pool', None) for alias in connections}
+    # Counters are missing from get_stats() until they are non-zero
+    stats = {alias: pool.get_stats() for alias, pool in pools.items() if pool is not None}
+    gauges = (
+        ('db_pool_connections_in_use', 'Connections checked out of the pool.',
+         lambda s: s.get('pool_size', 0) - s.get('pool_available', 0)),
+        ('db_pool_connections_idle', 'Connections idle in the pool.', lambda s: s.get('pool_available', 0)),
+        ('db_pool_connections_max', 'Configured maximum pool size.', lambda s: s.get('pool_max', 0)),
+        ('db_pool_requests_waiting', 'Requests currently waiting for a connection.', lambda s: s.get('requests_waiting', 0)),
+    )
+    counters = (
+        ('db_pool_requests_queued_total', 'Requests that had to wait for a connection.', lambda s: s.get('requests_queued', 0)),
+        ('db_pool_wait_seconds_total', 'Time spent waiting for a connection.', lambda s: s.get('requests_wait_ms', 0) / 1000),
+        ('db_pool_request_errors_total', 'Requests that timed out or failed waiting for a connection.',
+         lambda s: s.get('requests_errors', 0)),
+        ('db_pool_connections_lost_total', 'Connections found broken by the health check.', lambda s: s.get('connections_lost', 0)),
+    )
+    return [
+        (name, kind, help_text, [({'database': alias}, value(values)) for alias, values in stats.items()])
+        for kind, metrics in (('gauge', gauges), ('counter', counters))
+        for name, help_text, value in metrics
+    ]
+
+
+def collect_totp():
+    from users.totp import totp_service
+    samples = [({'outcome': outcome}, value) for outcome, value in totp_service.stats().items()]
+    return [('totp_checks_total', 'counter', '2FA code checks by outcome.', samples)]
+
+
+def collect_autocomplete():
+    from users.autocomplete import username_index
+    stats = username_index.stats()
+    return [
+        ('autocomplete_index_users', 'gauge', 'Usernames in the autocomplete index.', [({}, stats['users'])]),
+        ('autocomplete_index_bytes', 'gauge', 'Estimated memory used by the autocomplete index.', [({}, stats['bytes'])]),
+        ('autocomplete_lookups_total', 'counter', 'Autocomplete lookups by where they were served from.',
+         [({'source': 'index'}, stats['hits']), ({'source': 'database'}, stats['fallbacks'])]),
+    ]
+
+
+for _collector in (collect_rate_limits, collect_token_caches, collect_hashing, collect_db_pools, collect_autocomplete,
+                   collect_totp):
+    register_collector(_collector)
+
+
+def render():
+    """
+    Returns all metrics in the Prometheus text exposition format.
+    """
+    lines = request_duration.render() + request_span_duration.render()
+    for collector in _collectors:
+        for name, kind, help_text, samples in collector():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(format_sample(name, labels, value) for labels, value in samples)
+    return '\n'.join(lines) + '\n'
+
+
+def is_metrics_client(request):
+    """
+    Returns True if the request may read /metrics: it comes from an address in
+    METRICS_ALLOWED_IPS, carries METRICS_TOKEN as a bearer token, or is made by a staff user.
+    """
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        address = None
+    if address is not None and any(
+        address in ipaddress.ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_IPS
+    ):
+        return True
+
+    token = settings.METRICS_TOKEN
+    scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if token and scheme == 'Bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+        return True
+
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+def metrics_view(request):
+    """
+    Serves /metrics. Returns 404 when METRICS_ENABLED is False and 403 to
+    clients is_metrics_client() refuses.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    if not is_metrics_client(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,136 @@
+"""
+API-aware versions of Django's session, CSRF, authentication and message middleware.
+
+Requests under API_PATH_PREFIXES authenticate with a JWT access token in the
+Authorization header, so they have no use for a session, a CSRF check or
+message storage. For those requests the middleware below skips loading and
+saving the session (the per-request session query), the CSRF cookie and
+check, and message storage. request.user comes from the token instead, and
+is only loaded from the database when a view reads it. Every other path,
+including the admin, goes through the stock Django behaviour.
+
+Each class subclasses the Django middleware it replaces, so the admin system
+checks and anything else looking for them in MIDDLEWARE still find them.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.functional import SimpleLazyObject
+from jwt import InvalidTokenError
+
+
+def is_api_request(request):
+    return request.path_info.startswith(tuple(settings.API_PATH_PREFIXES))
+
+
+def get_bearer_token(request):
+    """
+    Returns the token from an 'Authorization: Bearer <token>' header, or None.
+    """
+    parts = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(parts) == 2 and parts[0] in settings.API_AUTH_HEADER_PREFIXES:
+        return parts[1]
+    return None
+
+
+def get_token_payload(request):
+    """
+    Validates the request's access token once and remembers the result.
+    Returns:
+        dict: The token payload, or None if the token is missing or invalid.
+    """
+    if not hasattr(request, '_jwt_payload'):
+        from JWTManager import JWTManager
+        token = get_bearer_token(request)
+        try:
+            request._jwt_payload = JWTManager.validate_access_token(token) if token else None
+        except InvalidTokenError:  # Includes ExpiredSignatureError
+            request._jwt_payload = None
+    return request._jwt_payload
+
+
+def get_jwt_user(request):
+    """
+    Returns the active user the access token belongs to, or an AnonymousUser.
+    """
+    if not hasattr(request, '_cached_user'):
+        from users.models import User
+        payload = get_token_payload(request)
+        user = None
+        if payload is not None:
+            user = User.objects.filter(pk=payload.get('user_id'), is_active=True).first()
+        request._cached_user = user or AnonymousUser()
+    return request._cached_user
+
+
+async def aget_jwt_user(request):
+    if not hasattr(request, '_acached_user'):
+        request._acached_user = await sync_to_async(get_jwt_user)(request)
+    return request._acached_user
+
+
+class ApiSessionMiddleware(SessionMiddleware):
+    """
+    SessionMiddleware that neither loads nor saves a session for API requests.
+    """
+
+    def process_request(self, request):
+        if not is_api_request(request):
+            super().process_request(request)
+
+    def process_response(self, request, response):
+        if not hasattr(request, 'session'):
+            return response
+        return super().process_response(request, response)
+
+
+class ApiCsrfViewMiddleware(CsrfViewMiddleware):
+    """
+    CsrfViewMiddleware that skips the CSRF cookie and check for API requests.
+    They carry their credentials in the Authorization header, which a
+    cross-site form can't set, so there is nothing for CSRF to forge.
+    """
+
+    def process_request(self, request):
+        if not is_api_request(request):
+            super().process_request(request)
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+    def process_response(self, request, response):
+        if is_api_request(request):
+            return response
+        return super().process_response(request, response)
+
+
+class ApiAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware that, for API requests, sets request.user from the
+    JWT access token instead of the session. The token is validated and the
+    user loaded on first access, so views that never read request.user pay
+    nothing. Views that only need the claims can call get_token_payload(request),
+    which doesn't query the database.
+    """
+
+    def process_request(self, request):
+        if not is_api_request(request):
+            return super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_jwt_user(request))
+        request.auser = lambda: aget_jwt_user(request)
+
+
+class ApiMessageMiddleware(MessageMiddleware):
+    """
+    MessageMiddleware that doesn't set up message storage for API requests.
+    """
+
+    def process_request(self, request):
+        if not is_api_request(request):
+            super().process_request(request)
@@ -49,15 +49,60 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'user_management.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'user_management.middleware.ApiSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'user_management.middleware.ApiCsrfViewMiddleware',
+    'user_management.middleware.ApiAuthenticationMiddleware',
+    'user_management.middleware.ApiMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Requests under these prefixes skip sessions, CSRF and messages and authenticate
+# with a JWT access token sent as "Authorization: Bearer <token>" (see user_management.middleware).
+# Only JWTManager access tokens are accepted there; views that take other tokens set their own authentication_classes.
+API_PATH_PREFIXES = ('/api/',)
+API_AUTH_HEADER_PREFIXES = ('Bearer',)
+
+REST_FRAMEWORK = {
+    # API requests carry no session; request.user comes from the access token (see ApiAuthenticationMiddleware)
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.authentication.MiddlewareJWTAuthentication',
+    ],
+    # orjson-backed when orjson is installed (see user_management.fastjson)
+    'DEFAULT_RENDERER_CLASSES': [
+        'user_management.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'user_management.fastjson.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Shared by all workers, so state kept in it (2FA replay and lockout counters)
+# holds across processes. Only 2FA checks use it, so a query per access is
+# acceptable; hot-path lookups use in-process caches (see CACHE_INVALIDATION_*).
+# The database cache table is created by migration 0011; switch to
+# django.core.cache.backends.redis.RedisCache where a Redis server is available.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'users_cache',
+    },
+}
+
+# Request latency histograms and DB/hashing/JWT/email span breakdown served on
+# /metrics. When False, MetricsMiddleware drops out of the stack and /metrics is a 404.
+METRICS_ENABLED = True
+# Who may read /metrics: clients in these networks (REMOTE_ADDR, so list the
+# proxy's address when the scraper goes through one), requests with
+# "Authorization: Bearer <METRICS_TOKEN>", and staff users.
+METRICS_ALLOWED_IPS = ('127.0.0.1/32', '::1/128')
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
 ROOT_URLCONF = 'user_management.urls'
 
 TEMPLATES = [
@@ -93,10 +138,49 @@ DATABASES = {
     }
 }
 
-
-# JWT keys
-ACCESS_PRIVATE_KEY = open('/path/to/private_access_jwt_key.pem').read()
-ACCESS_PUBLIC_KEY = open('/path/to/public_access_jwt_key.pem').read()
+# Connection reuse:
+# 'pool'      - a psycopg connection pool in each worker process (needs psycopg[pool]).
+#               Idle connections are checked before being handed out.
+# 'pgbouncer' - no pool in the worker; HOST/PORT point at pgbouncer in transaction
+#               mode. Server-side cursors and prepared statements are disabled,
+#               since consecutive transactions may run on different server connections.
+# None        - a new connection per request.
+# Overridden by the DATABASE_POOLING environment variable ('' for None).
+DATABASE_POOLING = os.environ.get('DATABASE_POOLING', 'pool') or None
+DATABASE_POOL_MIN_SIZE = 2
+DATABASE_POOL_MAX_SIZE = 10
+DATABASE_POOL_TIMEOUT = 10  # seconds a request waits for a free connection
+DATABASE_POOL_MAX_IDLE = 5 * 60  # seconds before surplus idle connections are closed
+PGBOUNCER_CONN_MAX_AGE = 60
+
+if DATABASE_POOLING == 'pool':
+    from user_management.db import check_pooled_connection
+
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': DATABASE_POOL_MIN_SIZE,
+            'max_size': DATABASE_POOL_MAX_SIZE,
+            'timeout': DATABASE_POOL_TIMEOUT,
+            'max_idle': DATABASE_POOL_MAX_IDLE,
+            'check': check_pooled_connection,
+        },
+    }
+elif DATABASE_POOLING == 'pgbouncer':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': PGBOUNCER_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': True,
+        'OPTIONS': {'prepare_threshold': None},
+    })
+
+
+# JWT keys, read by JWTManager on first use. ACCESS_PRIVATE_KEY/ACCESS_PUBLIC_KEY
+# may be set to the PEM text instead, which takes precedence over the paths.
+ACCESS_PRIVATE_KEY_PATH = '/path/to/private_access_jwt_key.pem'
+ACCESS_PUBLIC_KEY_PATH = '/path/to/public_access_jwt_key.pem'
+# One of 'RS256', 'ES256' (P-256 keys) or 'EdDSA' (Ed25519 keys). ES256 and
+# EdDSA sign much faster than RS256; the PEM files above must match.
+JWT_ALGORITHM = 'RS256'
 
 # 2FA
 TOTP_SECRET_MAX_LENGTH = 32
@@ -105,6 +189,35 @@ TOTP_SECRET_MAX_LENGTH = 32
 PASSWORD_MIN_LENGTH = 8
 PASSWORD_MAX_LENGTH = 100
 
+# Password checks run on the hashing pool below, through django.contrib.auth.authenticate
+AUTHENTICATION_BACKENDS = ['users.backends.HashingPoolModelBackend']
+
+# Process pool used for password hashing (0 workers hashes on the request thread).
+# Requests beyond PASSWORD_HASHING_MAX_QUEUE queued hashes get a 503.
+PASSWORD_HASHING_WORKERS = min(4, os.cpu_count() or 1)
+PASSWORD_HASHING_MAX_QUEUE = 64
+PASSWORD_HASHING_TIMEOUT = 5
+
+# Password reset codes (users.reset_codes). A code is locked after
+# FORGOT_PASSWORD_MAX_ATTEMPTS wrong guesses; expired codes are swept
+# at most every FORGOT_PASSWORD_SWEEP_SECONDS.
+FORGOT_PASSWORD_CODE_MAX_LENGTH = 6
+FORGOT_PASSWORD_CODE_EXPIRATION_MINUTES = 15
+FORGOT_PASSWORD_MAX_ATTEMPTS = 5
+FORGOT_PASSWORD_SWEEP_SECONDS = 10 * 60
+
+# 2FA codes (users.totp). Codes are accepted TOTP_VALID_WINDOW time steps either
+# side of now and only once each; TOTP_MAX_FAILURES wrong codes lock 2FA for
+# TOTP_LOCKOUT_SECONDS. Both are tracked in the default cache, which must be
+# shared for the limits to hold across workers; check users.E001 refuses a
+# per-process cache.
+TOTP_VALID_WINDOW = 0
+TOTP_MAX_FAILURES = 5
+TOTP_LOCKOUT_SECONDS = 15 * 60
+# Ask users with 2FA for a code at signin. Off until the frontend signin form
+# sends 2fa_code; until then 2FA users sign in with their password alone.
+SIGNIN_2FA_ENABLED = False
+
 # Email settings
 EMAIL_MAX_LENGTH = 60
 
@@ -112,6 +225,51 @@ EMAIL_MAX_LENGTH = 60
 REFRESH_EXPIRATION_MINUTES = 60 * 24 * 30
 ACCESS_EXPIRATION_MINUTES = 15
 
+# Maximum number of verified access tokens kept in memory per process so the
+# signature check is skipped for repeat requests. 0 disables the cache.
+ACCESS_TOKEN_CACHE_SIZE = 10000
+
+# Refresh token denylist: in-memory copy synced from the RevokedToken table.
+# RefreshJWT rotates tokens, which checks the table itself, so the sync interval
+# only delays other workers' JWTManager.validate_refresh_token calls.
+REVOCATION_SYNC_SECONDS = 60
+REVOCATION_PRUNE_SECONDS = 60 * 60
+
+# Per-process caches of CachedTokenAuthentication's DRF token -> user lookups
+# and of MeView's profiles. Hits cost no query. Deleting a token, deactivating
+# or saving a user invalidates the entries for every worker on the host through
+# the shared invalidation table below; workers on other hosts drop them when
+# they expire.
+TOKEN_AUTH_CACHE_SIZE = 10000
+TOKEN_AUTH_CACHE_SECONDS = 60
+PROFILE_CACHE_SIZE = 10000
+PROFILE_CACHE_SECONDS = 60
+# Shared-memory table of invalidation generations (users.caching.InvalidationTable).
+# Check users.E002 refuses to start when its directory is missing, since each
+# worker would then keep serving entries invalidated by the others.
+CACHE_INVALIDATION_SHARED_PATH = '/dev/shm/transcendence-cache-invalidation'
+CACHE_INVALIDATION_SLOTS = 1 << 20
+
+# Per-route rate limits enforced by users.ratelimit. key is 'ip' or 'user'.
+# Counters live in a shared-memory table so all workers on a host share them;
+# without /dev/shm each process keeps its own.
+RATE_LIMITS = {
+    'refresh_jwt': {'key': 'ip', 'rate': '5/m'},
+    'is_username_taken': {'key': 'ip', 'rate': '10/m'},
+    'is_email_taken': {'key': 'ip', 'rate': '10/m'},
+    'availability_batch': {'key': 'ip', 'rate': '10/m'},
+    'data_export': {'key': 'user', 'rate': '5/m'},
+    'delete_account': {'key': 'user', 'rate': '3/h'},
+}
+RATE_LIMIT_SHARED_PATH = '/dev/shm/transcendence-ratelimit'
+RATE_LIMIT_SLOTS = 65536
+
+# 'sync' saves User.last_activity on every call; 'buffered' coalesces the
+# timestamps in memory and writes them in one bulk UPDATE per interval
+LAST_ACTIVITY_MODE = 'buffered'
+LAST_ACTIVITY_FLUSH_SECONDS = 10
+LAST_ACTIVITY_FLUSH_BATCH_SIZE = 1000
+
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -120,8 +278,55 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = 'your-email@example.com'
 EMAIL_HOST_PASSWORD = 'your-email-password'
 
+# Outbox drained by "manage.py drain_outbox"
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BASE_SECONDS = 30
+OUTBOX_RETRY_MAX_SECONDS = 60 * 60
+# How long a claimed batch is hidden from other drainers; emails a crashed
+# drainer left unsent are retried once it expires
+OUTBOX_CLAIM_SECONDS = 5 * 60
+
 MAX_USERNAME_SEARCH_RESULTS = 20
 
+# Per-process prefix index of usernames serving autocomplete-username/; while it
+# is cold, stale or over its memory budget, lookups go to the database
+AUTOCOMPLETE_INDEX_ENABLED = True
+AUTOCOMPLETE_INDEX_MAX_BYTES = 64 * 1024 * 1024
+AUTOCOMPLETE_INDEX_SYNC_SECONDS = 5
+AUTOCOMPLETE_INDEX_MAX_STALENESS_SECONDS = 60
+AUTOCOMPLETE_INDEX_REBUILD_SECONDS = 60 * 10
+MAX_AUTOCOMPLETE_RESULTS = 10
+
+# Rows deleted per transaction by the chunked account purges
+PURGE_CHUNK_SIZE = 1000
+# DeleteInactiveUsersView removes users inactive for this many days, and
+# accounts whose email is still unverified this many days after signup
+MAX_INACTIVITY_DAYS_BEFORE_DELETION = 365
+MAX_DAYS_BEFORE_PENDING_ACCOUNTS_DELETION = 7
+
+# Account data export archives written by "manage.py run_export_jobs"
+DATA_EXPORT_ROOT = BASE_DIR / 'exports'
+DATA_EXPORT_CHUNK_SIZE = 2000
+# A running job not finished within the lease is assumed to belong to a dead
+# worker and claimed again, up to DATA_EXPORT_MAX_ATTEMPTS times
+DATA_EXPORT_LEASE_SECONDS = 30 * 60
+DATA_EXPORT_MAX_ATTEMPTS = 3
+# Finished archives are deleted after this many days
+DATA_EXPORT_RETENTION_DAYS = 7
+
+# Per-process Bloom filters answering "definitely not taken" for the
+# is-username-taken / is-email-taken endpoints without a database query
+AVAILABILITY_FILTER_ENABLED = True
+AVAILABILITY_FILTER_CAPACITY = 1_000_000
+AVAILABILITY_FILTER_ERROR_RATE = 0.01
+AVAILABILITY_FILTER_SYNC_SECONDS = 5
+AVAILABILITY_FILTER_REBUILD_SECONDS = 60 * 10
+# Most usernames plus emails accepted by one batch availability request
+AVAILABILITY_BATCH_MAX_ITEMS = 20
+# Free alternatives suggested per taken username
+AVAILABILITY_SUGGESTIONS = 3
+
 
 
 # Password validation
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'user_management.settings')
 
 application = get_wsgi_application()
+
+from users.autocomplete import username_index  # noqa: E402
+from users.availability import availability_filter  # noqa: E402
+
+availability_filter.warm_in_background()
+username_index.warm_in_background()
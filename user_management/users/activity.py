@@ -0,0 +1,101 @@
+import atexit
+import logging
+import os
+import threading
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityBuffer:
+    """
+    Write-behind buffer for User.last_activity.
+    Timestamps are coalesced in memory to the latest one per user and written
+    by a background thread every LAST_ACTIVITY_FLUSH_SECONDS as a single bulk
+    UPDATE. Pending timestamps are flushed when the worker exits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    def record(self, user_id, timestamp):
+        """
+        Buffers timestamp as the latest activity of user_id.
+        """
+        with self._lock:
+            current = self._pending.get(user_id)
+            if current is None or timestamp > current:
+                self._pending[user_id] = timestamp
+        self._ensure_started()
+
+    def _ensure_started(self):
+        # Forked workers inherit the buffer but not the flusher thread
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='activity-flusher', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while not self._wakeup.wait(settings.LAST_ACTIVITY_FLUSH_SECONDS):
+            self.flush()
+
+    def flush(self):
+        """
+        Writes all buffered timestamps in one bulk UPDATE.
+        Returns:
+            int: Number of users updated.
+        """
+        from django.db import close_old_connections
+        from .models import User
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            User.objects.bulk_update(
+                [User(pk=user_id, last_activity=timestamp) for user_id, timestamp in pending.items()],
+                ['last_activity'],
+                batch_size=settings.LAST_ACTIVITY_FLUSH_BATCH_SIZE,
+            )
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.error(f'Flushing last activity for {len(pending)} users failed: {e}')
+            # Put the timestamps back unless newer ones arrived in the meantime
+            with self._lock:
+                for user_id, timestamp in pending.items():
+                    current = self._pending.get(user_id)
+                    if current is None or timestamp > current:
+                        self._pending[user_id] = timestamp
+            return 0
+        finally:
+            if threading.current_thread() is self._thread:
+                close_old_connections()
+
+        self.flushed += len(pending)
+        return len(pending)
+
+    def stop(self):
+        """
+        Stops the flusher thread and flushes what is left.
+        """
+        self._wakeup.set()
+        self.flush()
+
+    def __len__(self):
+        return len(self._pending)
+
+
+activity_buffer = ActivityBuffer()
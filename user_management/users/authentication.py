@@ -0,0 +1,143 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+from django.conf import settings
+from user_management.fastjson import JsonResponse
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+from .caching import BoundedTTLCache, get_invalidation_table
+
+_token_cache = None
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_token_cache():
+    """
+    Returns the per-process token cache, creating it on first use.
+    """
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = BoundedTTLCache(settings.TOKEN_AUTH_CACHE_SIZE)
+    return _token_cache
+
+
+def token_cache_key(key):
+    return f'users:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def invalidate_token(key):
+    """
+    Drops the cached lookup of a token, in every worker on the host.
+    """
+    cache_key = token_cache_key(key)
+    get_token_cache().delete(cache_key)
+    get_invalidation_table().invalidate(cache_key)
+
+
+def invalidate_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+def token_cache_stats():
+    # Entries invalidated by another worker are found by the cache but count as misses here
+    stats = get_token_cache().stats()
+    with _stats_lock:
+        stats.update(_stats)
+    return stats
+
+
+def jwt_required(staff=False):
+    """
+    Decorator for plain Django views under /api/. Answers 401 unless
+    ApiAuthenticationMiddleware resolved request.user from a valid access
+    token, and 403 when staff is required and the user isn't staff.
+    Args:
+        staff (bool): Whether only staff users may call the view.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return JsonResponse({'errors': ['Authentication required']}, status=401)
+            if staff and not request.user.is_staff:
+                return JsonResponse({'errors': ['Permission denied']}, status=403)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class CachedTokenUser:
+    """
+    Minimal authenticated user built from a cached token lookup.
+    Carries only the id and username; views that need the full row must load it.
+    """
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, username):
+        self.id = self.pk = user_id
+        self.username = username
+
+    def get_username(self):
+        return self.username
+
+    def __str__(self):
+        return self.username
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that remembers token -> user id mappings in a
+    per-process cache for TOKEN_AUTH_CACHE_SECONDS instead of joining Token
+    and User on every request, so a hit costs no query.
+
+    Entries are keyed by a digest of the token and carry the token's
+    generation in the shared invalidation table. Deleting a token (e.g.
+    LogoutView, or the cascade when its user is deleted) or deactivating its
+    user changes the generation, and every worker on the host stops serving
+    the entry.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cache_key = token_cache_key(key)
+        # Read before the database so an invalidation racing the query is not missed
+        generation = get_invalidation_table().generation(cache_key)
+        entry = cache.get(cache_key)
+        hit = entry is not None and entry[2] == generation
+        with _stats_lock:
+            _stats['hits' if hit else 'misses'] += 1
+        if not hit:
+            # Raises AuthenticationFailed for unknown keys and inactive users
+            user, token = super().authenticate_credentials(key)
+            entry = (user.pk, user.get_username(), generation)
+            cache.set(cache_key, entry, time.time() + settings.TOKEN_AUTH_CACHE_SECONDS)
+
+        user_id, username, _ = entry
+        return CachedTokenUser(user_id, username), Token(key=key, user_id=user_id)
+
+
+class MiddlewareJWTAuthentication(BaseAuthentication):
+    """
+    Uses the user ApiAuthenticationMiddleware resolved from the access token.
+    Unlike SessionAuthentication it doesn't enforce CSRF, since API requests
+    carry no session. Returns None for anonymous requests so that other
+    authentication classes, or the view's permissions, decide.
+    """
+
+    def authenticate(self, request):
+        from user_management.middleware import get_token_payload, is_api_request
+        django_request = request._request
+        if not is_api_request(django_request):
+            return None
+        user = getattr(django_request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user, get_token_payload(django_request)
+
+    def authenticate_header(self, request):
+        return settings.API_AUTH_HEADER_PREFIXES[0]
@@ -0,0 +1,286 @@
+import bisect
+import logging
+import sys
+import threading
+import time
+from django.conf import settings
+from django.db import connections
+from django.db.models.functions import Upper
+from .casing import upper_key
+
+logger = logging.getLogger(__name__)
+
+# Rough per-user cost beyond the strings themselves: two list slots and a dict entry with its int key
+ENTRY_OVERHEAD_BYTES = 2 * 8 + 100
+
+
+class UsernamePrefixIndex:
+    """
+    Per-process sorted index of upper-cased usernames for type-ahead. Keys
+    are built with upper_key(), so the index matches the same usernames as the
+    database fallback's UPPER(username) LIKE 'PREFIX%'.
+
+    Usernames are kept in a sorted list of keys with a parallel list of the
+    original spellings. A prefix lookup is a bisect to the first key at or
+    after the prefix, followed by a scan while the keys still match, so it
+    costs O(log n + limit) and never touches the database.
+
+    Saves and deletes in this process update the index through the User
+    signals. Users created by other workers are picked up by an incremental
+    sync on ids greater than the last one seen, at most once every
+    AUTOCOMPLETE_INDEX_SYNC_SECONDS. A full rebuild runs every
+    AUTOCOMPLETE_INDEX_REBUILD_SECONDS and picks up renames and deletions made
+    in other workers.
+
+    Lookups return None, so the caller falls back to the database, while the
+    index is cold (not built yet, or larger than AUTOCOMPLETE_INDEX_MAX_BYTES)
+    or stale (not synced for AUTOCOMPLETE_INDEX_MAX_STALENESS_SECONDS).
+    Syncs run on a background thread, never on the request that finds them due.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._sync_thread = None
+        self._keys = None
+        self._names = None
+        self._by_pk = None
+        self._bytes = 0
+        self._max_id = 0
+        self._synced_at = 0.0
+        self._refreshed_at = 0.0
+        self._built_at = 0.0
+        self._over_budget = False
+        self.hits = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def normalize(value):
+        return upper_key(value.strip())
+
+    @staticmethod
+    def entry_bytes(key, name):
+        size = sys.getsizeof(name) + ENTRY_OVERHEAD_BYTES
+        return size if key is name else size + sys.getsizeof(key)
+
+    @property
+    def is_built(self):
+        return self._keys is not None
+
+    @property
+    def is_fresh(self):
+        return self.is_built and time.monotonic() - self._refreshed_at < settings.AUTOCOMPLETE_INDEX_MAX_STALENESS_SECONDS
+
+    def needs_sync(self):
+        if not settings.AUTOCOMPLETE_INDEX_ENABLED:
+            return False
+        return time.monotonic() - self._synced_at >= settings.AUTOCOMPLETE_INDEX_SYNC_SECONDS
+
+    def sync(self):
+        """
+        Brings the index up to date with the database.
+        """
+        from .models import User
+
+        self._synced_at = time.monotonic()
+        # An index over budget stays cold until the next scheduled rebuild rather than rescanning every sync
+        cold = self._keys is None and not self._over_budget
+        if cold or time.monotonic() - self._built_at >= settings.AUTOCOMPLETE_INDEX_REBUILD_SECONDS:
+            self._rebuild(User)
+        elif self._keys is not None:
+            rows = list(User.objects.filter(pk__gt=self._max_id).values_list('pk', 'username'))
+            with self._lock:
+                for pk, username in rows:
+                    self._put(pk, username)
+                    self._max_id = max(self._max_id, pk)
+                self._check_budget()
+        if self._keys is not None:
+            self._refreshed_at = time.monotonic()
+
+    def sync_if_due(self):
+        # Only one thread syncs at a time; the others keep answering from the current index
+        if not self.needs_sync() or not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.sync()
+        except Exception as e:
+            # Keep the previous index; it goes stale and lookups fall back to the database
+            logger.error(f'Autocomplete index sync failed: {e}')
+        finally:
+            self._sync_lock.release()
+
+    def schedule_sync(self):
+        """
+        Starts a sync on a daemon thread if one is due and none is running.
+        """
+        if not self.needs_sync():
+            return
+        with self._lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return
+            self._sync_thread = threading.Thread(target=self._sync_in_background, name='autocomplete-index-sync', daemon=True)
+            self._sync_thread.start()
+
+    def warm_in_background(self):
+        """
+        Builds the index on a daemon thread so worker start-up isn't blocked.
+        """
+        self.schedule_sync()
+
+    def _sync_in_background(self):
+        try:
+            self.sync_if_due()
+        finally:
+            # The thread's connection would otherwise stay open until the server closes it
+            connections.close_all()
+
+    def _rebuild(self, User):
+        started = time.monotonic()
+        budget = settings.AUTOCOMPLETE_INDEX_MAX_BYTES
+        entries = []
+        by_pk = {}
+        total = max_id = 0
+        for pk, username in User.objects.values_list('pk', 'username').iterator(chunk_size=5000):
+            key = self.normalize(username)
+            if key == username:
+                key = username
+            total += self.entry_bytes(key, username)
+            if total > budget:
+                self._drop(f'{budget} byte budget exceeded while building the index')
+                return
+            entries.append((key, username))
+            by_pk[pk] = username
+            max_id = max(max_id, pk)
+        entries.sort()
+
+        # Swap the finished index in so readers never see a partially built one
+        with self._lock:
+            self._keys = [key for key, _ in entries]
+            self._names = [name for _, name in entries]
+            self._by_pk = by_pk
+            self._bytes = total
+            self._max_id = max_id
+            self._over_budget = False
+            self._built_at = time.monotonic()
+        logger.info(
+            f'Autocomplete index built with {len(entries)} usernames ({total} bytes) in {time.monotonic() - started:.2f}s'
+        )
+
+    def _drop(self, reason):
+        with self._lock:
+            self._keys = self._names = self._by_pk = None
+            self._bytes = 0
+            self._over_budget = True
+            self._built_at = time.monotonic()
+        logger.warning(f'Autocomplete index disabled until the next rebuild: {reason}')
+
+    def _check_budget(self):
+        if self._bytes > settings.AUTOCOMPLETE_INDEX_MAX_BYTES:
+            self._keys = self._names = self._by_pk = None
+            self._bytes = 0
+            self._over_budget = True
+            logger.warning('Autocomplete index disabled until the next rebuild: byte budget exceeded')
+
+    def _position(self, key, name):
+        index = bisect.bisect_left(self._keys, key)
+        while index < len(self._keys) and self._keys[index] == key:
+            if self._names[index] == name:
+                return index
+            index += 1
+        return None
+
+    def _remove(self, pk):
+        name = self._by_pk.pop(pk, None)
+        if name is None:
+            return
+        key = self.normalize(name)
+        index = self._position(key, name)
+        if index is not None:
+            self._bytes -= self.entry_bytes(self._keys[index], name)
+            del self._keys[index]
+            del self._names[index]
+
+    def _put(self, pk, username):
+        if self._by_pk.get(pk) == username:
+            return
+        self._remove(pk)
+        key = self.normalize(username)
+        if key == username:
+            key = username
+        index = bisect.bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._names.insert(index, username)
+        self._by_pk[pk] = username
+        self._bytes += self.entry_bytes(key, username)
+
+    def user_saved(self, pk, username):
+        with self._lock:
+            if self._keys is not None and username:
+                self._put(pk, username)
+                self._check_budget()
+
+    def user_deleted(self, pk):
+        with self._lock:
+            if self._keys is not None:
+                self._remove(pk)
+
+    def lookup(self, prefix, limit):
+        """
+        Returns up to limit usernames starting with prefix, case-insensitively,
+        in upper_key() order.
+        Returns:
+            list: The usernames, or None if the index is cold or stale.
+        """
+        self.schedule_sync()
+        key = self.normalize(prefix)
+        with self._lock:
+            if not self.is_fresh:
+                self.fallbacks += 1
+                return None
+            keys, names = self._keys, self._names
+            index = bisect.bisect_left(keys, key)
+            end = min(index + limit, len(keys))
+            matches = []
+            while index < end and keys[index].startswith(key):
+                matches.append(names[index])
+                index += 1
+        self.hits += 1
+        return matches
+
+    def stats(self):
+        return {
+            'built': self.is_built,
+            'fresh': self.is_fresh,
+            'over_budget': self._over_budget,
+            'users': len(self._keys) if self._keys is not None else 0,
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'fallbacks': self.fallbacks,
+        }
+
+
+username_index = UsernamePrefixIndex()
+
+
+def autocomplete_usernames(prefix, limit):
+    """
+    Returns up to limit usernames starting with prefix, case-insensitively.
+    Served from username_index, or from the database while the index is cold or stale.
+    Args:
+        prefix (str): What has been typed so far.
+        limit (int): Maximum number of usernames to return.
+    Returns:
+        tuple: (list of usernames, 'index' or 'database').
+    """
+    usernames = username_index.lookup(prefix, limit) if settings.AUTOCOMPLETE_INDEX_ENABLED else None
+    if usernames is not None:
+        return usernames, 'index'
+
+    from .models import User
+    # Same key as the index; UPPER(username) LIKE 'PREFIX%' is served by the users_username_upper_trgm index
+    matching_users = (
+        User.objects.annotate(username_upper=Upper('username'))
+        .filter(username_upper__startswith=upper_key(prefix.strip()))
+        .order_by('username_upper', 'username')
+    )
+    return list(matching_users.values_list('username', flat=True)[:limit]), 'database'
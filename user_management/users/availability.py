@@ -0,0 +1,310 @@
+import hashlib
+import logging
+import math
+import secrets
+import threading
+import time
+from functools import reduce
+from operator import or_
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Q
+from .casing import upper_key
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter over strings.
+    Membership tests may return false positives but never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(int(capacity), 1)
+        self.size = max(int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # Kirsch-Mitzenmacher double hashing over one 128-bit digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class AvailabilityFilter:
+    """
+    Per-process Bloom filters of upper-cased usernames and emails, keyed with
+    upper_key() so they agree with the database's UPPER() lookups.
+
+    A negative answer means the value is definitely not taken, as of the last
+    sync, and the database query can be skipped. Positive answers, and every
+    answer given before the filters are built, must fall through to the
+    database.
+
+    Saves and deletes in this process update the filters through the User
+    signals. Users created by other workers are picked up by a cheap
+    incremental sync on ids greater than the last one seen, at most once
+    every AVAILABILITY_FILTER_SYNC_SECONDS. A full rebuild runs every
+    AVAILABILITY_FILTER_REBUILD_SECONDS. It also runs early once deletions or
+    growth have made the filters too stale or too full, and it picks up
+    renames made in other workers.
+
+    Syncs run on a background thread, never on the request that finds them
+    due; requests keep answering from the current filters until the new ones
+    are swapped in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._sync_thread = None
+        self._usernames = None
+        self._emails = None
+        self._max_id = 0
+        self._deletions = 0
+        self._synced_at = 0.0
+        self._built_at = 0.0
+        self.db_skips = 0
+        self.db_fallthroughs = 0
+
+    @staticmethod
+    def normalize(value):
+        return upper_key(value.strip())
+
+    @property
+    def is_built(self):
+        return self._usernames is not None
+
+    def needs_sync(self):
+        if not settings.AVAILABILITY_FILTER_ENABLED:
+            return False
+        return time.monotonic() - self._synced_at >= settings.AVAILABILITY_FILTER_SYNC_SECONDS
+
+    def _needs_rebuild(self):
+        if self._usernames is None:
+            return True
+        if time.monotonic() - self._built_at >= settings.AVAILABILITY_FILTER_REBUILD_SECONDS:
+            return True
+        # Deleted values can't be removed from a Bloom filter, and an overfull filter
+        # loses its error-rate guarantee; both are fixed by rebuilding.
+        return (
+            self._deletions > self._usernames.capacity // 10
+            or self._usernames.count > self._usernames.capacity
+        )
+
+    def sync(self):
+        """
+        Brings the filters up to date with the database.
+        """
+        from .models import User
+
+        if self._needs_rebuild():
+            self._rebuild(User)
+        else:
+            rows = User.objects.filter(pk__gt=self._max_id).values_list('pk', 'username', 'email')
+            with self._lock:
+                self._add_rows(self._usernames, self._emails, rows)
+        self._synced_at = time.monotonic()
+
+    def sync_if_due(self):
+        # Only one thread syncs at a time; the others keep answering from the current filters
+        if not self.needs_sync() or not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.sync()
+        except Exception as e:
+            # Keep the previous filters; unbuilt filters make every answer fall through to the database
+            logger.error(f'Availability filter sync failed: {e}')
+            self._synced_at = time.monotonic()
+        finally:
+            self._sync_lock.release()
+
+    def schedule_sync(self):
+        """
+        Starts a sync on a daemon thread if one is due and none is running.
+        """
+        if not self.needs_sync():
+            return
+        with self._lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return
+            self._sync_thread = threading.Thread(target=self._sync_in_background, name='availability-filter-sync', daemon=True)
+            self._sync_thread.start()
+
+    def _sync_in_background(self):
+        try:
+            self.sync_if_due()
+        finally:
+            # The thread's connection would otherwise stay open until the server closes it
+            connections.close_all()
+
+    def warm_in_background(self):
+        """
+        Builds the filters on a daemon thread so worker start-up isn't blocked.
+        """
+        self.schedule_sync()
+
+    def _rebuild(self, User):
+        started = time.monotonic()
+        capacity = max(settings.AVAILABILITY_FILTER_CAPACITY, User.objects.count() * 2)
+        error_rate = settings.AVAILABILITY_FILTER_ERROR_RATE
+        usernames = BloomFilter(capacity, error_rate)
+        emails = BloomFilter(capacity, error_rate)
+        self._max_id = 0
+        self._add_rows(usernames, emails, User.objects.values_list('pk', 'username', 'email').iterator(chunk_size=5000))
+
+        # Swap the finished filters in so readers never see a partially built one
+        with self._lock:
+            self._usernames = usernames
+            self._emails = emails
+            self._deletions = 0
+            self._built_at = time.monotonic()
+        logger.info(f'Availability filter built with {usernames.count} users in {time.monotonic() - started:.2f}s')
+
+    def _add_rows(self, usernames, emails, rows):
+        for pk, username, email in rows:
+            self._add(usernames, emails, username, email)
+            if pk > self._max_id:
+                self._max_id = pk
+
+    def _add(self, usernames, emails, username, email):
+        if username:
+            usernames.add(self.normalize(username))
+        if email:
+            emails.add(self.normalize(email))
+
+    def user_saved(self, user):
+        with self._lock:
+            if self._usernames is not None:
+                self._add(self._usernames, self._emails, user.username, user.email)
+
+    def user_deleted(self, user):
+        self._deletions += 1
+
+    def _might_contain(self, bloom, value):
+        if bloom is None or self.normalize(value) in bloom:
+            self.db_fallthroughs += 1
+            return True
+        self.db_skips += 1
+        return False
+
+    def might_contain_username(self, username):
+        """
+        Returns False only when the username is definitely not taken.
+        """
+        self.schedule_sync()
+        return self._might_contain(self._usernames, username)
+
+    def might_contain_email(self, email):
+        """
+        Returns False only when the email is definitely not registered.
+        """
+        self.schedule_sync()
+        return self._might_contain(self._emails, email)
+
+    async def amight_contain_username(self, username):
+        return self.might_contain_username(username)
+
+    async def amight_contain_email(self, email):
+        return self.might_contain_email(email)
+
+    def stats(self):
+        return {
+            'built': self.is_built,
+            'users': self._usernames.count if self._usernames is not None else 0,
+            'capacity': self._usernames.capacity if self._usernames is not None else 0,
+            'db_skips': self.db_skips,
+            'db_fallthroughs': self.db_fallthroughs,
+        }
+
+
+availability_filter = AvailabilityFilter()
+
+# SignupView accepts usernames of at most 20 characters
+SUGGESTION_MAX_LENGTH = 20
+# Candidates generated per username; more than are returned, since some may be taken
+SUGGESTION_CANDIDATES = 8
+
+
+def suggest_usernames(username, count=SUGGESTION_CANDIDATES):
+    """
+    Returns count distinct variations of username that fit SignupView's length limit.
+    """
+    candidates = []
+    while len(candidates) < count:
+        suffix = str(secrets.randbelow(10 ** (2 + len(candidates) % 3)))
+        separator = '_' if len(candidates) % 2 else ''
+        base = username[:SUGGESTION_MAX_LENGTH - len(separator) - len(suffix)]
+        candidate = f'{base}{separator}{suffix}'
+        if candidate != username and candidate not in candidates:
+            candidates.append(candidate)
+    return candidates
+
+
+async def aresolve_availability(usernames, emails, suggestions=3):
+    """
+    Answers availability for several usernames and emails, with suggested free
+    alternatives for taken usernames, in at most one query.
+
+    Values the Bloom filter rules out never reach the database. The rest,
+    including the candidate suggestions, are matched case-insensitively with
+    a single query whose WHERE clause (UPPER(column) = UPPER(%s) per value) is
+    served by the users_*_upper_idx indexes. The database upper-cases both
+    sides and counts the matches of each value, so the answer follows its
+    collation rather than Python's casing rules (the C collation, for one,
+    only upper-cases ASCII). The filter's upper_key() maps every character
+    UPPER() maps, so it never rules out a value the database would match.
+    Args:
+        usernames (list): Usernames to check.
+        emails (list): Emails to check.
+        suggestions (int): Free alternatives to return per taken username (optional, default=3).
+    Returns:
+        tuple: ({username: {'taken': bool, 'suggestions': [...]}}, {email: {'taken': bool}}).
+    """
+    from .models import User
+
+    candidates = {username: suggest_usernames(username) for username in usernames}
+    all_usernames = set(usernames).union(*candidates.values())
+
+    # Aggregate alias -> (field, value) for every value the filter can't rule out
+    lookups = {}
+    for name in all_usernames:
+        if await availability_filter.amight_contain_username(name):
+            lookups[f'username_{len(lookups)}'] = ('username', name)
+    for email in emails:
+        if await availability_filter.amight_contain_email(email):
+            lookups[f'email_{len(lookups)}'] = ('email', email)
+
+    taken_usernames, taken_emails = set(), set()
+    if lookups:
+        conditions = {alias: Q(**{f'{field}__iexact': value}) for alias, (field, value) in lookups.items()}
+        counts = await User.objects.filter(reduce(or_, conditions.values())).aaggregate(
+            **{alias: Count('pk', filter=condition) for alias, condition in conditions.items()}
+        )
+        for alias, (field, value) in lookups.items():
+            if counts[alias]:
+                (taken_usernames if field == 'username' else taken_emails).add(value)
+
+    username_results = {}
+    for username in usernames:
+        result = {'taken': username in taken_usernames}
+        if result['taken']:
+            free = [name for name in candidates[username] if name not in taken_usernames]
+            result['suggestions'] = free[:suggestions]
+        username_results[username] = result
+    email_results = {email: {'taken': email in taken_emails} for email in emails}
+    return username_results, email_results
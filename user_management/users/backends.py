@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import get_hasher, identify_hasher
+from .hashing import hashing_service
+
+
+def password_needs_upgrade(encoded):
+    """
+    Returns True if encoded was made with another hasher, or weaker parameters,
+    than the preferred one; the same test django.contrib.auth.hashers.check_password makes.
+    """
+    preferred = get_hasher('default')
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+class HashingPoolModelBackend(ModelBackend):
+    """
+    ModelBackend with the password check running on users.hashing's process pool.
+
+    Used through django.contrib.auth.authenticate, so user_login_failed is
+    still sent and stored hashes are still upgraded to the preferred hasher
+    after a successful login. HashingBusy propagates to the caller, which
+    should answer 503.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so response times don't reveal which usernames exist
+            hashing_service.make_password(password)
+            return None
+        if not hashing_service.check_password(password, user.password) or not self.user_can_authenticate(user):
+            return None
+        if password_needs_upgrade(user.password):
+            user.password = hashing_service.make_password(password)
+            user.save(update_fields=['password'])
+        return user
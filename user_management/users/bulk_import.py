@@ -0,0 +1,267 @@
+import csv
+import io
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from .hashing import _init_worker, pool_context
+
+logger = logging.getLogger(__name__)
+
+# Columns accepted in the input; anything else is ignored.
+# password is hashed here, password_hash is stored as-is (e.g. when migrating Django accounts)
+IMPORT_FIELDS = (
+    'username', 'email', 'password', 'password_hash', 'first_name', 'last_name', 'email_verified', 'is_active',
+)
+BOOLEAN_FIELDS = ('email_verified', 'is_active')
+TRUE_VALUES = ('1', 'true', 't', 'yes', 'y')
+MAX_LOGGED_REJECTS = 10
+
+
+def read_records(path, fmt=None):
+    """
+    Streams records from a CSV file (with a header row) or a JSON Lines file.
+    Args:
+        path (str): The input file.
+        fmt (str): 'csv' or 'jsonl' (optional, default=guessed from the extension).
+    Yields:
+        dict: One record per input row.
+    """
+    fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def hash_passwords(passwords):
+    """
+    Hashes a list of passwords; runs in a pool worker. None gives an unusable password.
+    """
+    from django.contrib.auth.hashers import make_password
+    return [make_password(password) for password in passwords]
+
+
+def clean_record(record, max_lengths):
+    """
+    Returns the record reduced to IMPORT_FIELDS, or None if it can't be imported.
+    """
+    cleaned = {field: record[field] for field in IMPORT_FIELDS if record.get(field) not in (None, '')}
+    for field in ('username', 'email'):
+        value = str(cleaned.get(field, '')).strip()
+        if not value or len(value) > max_lengths[field]:
+            return None
+        cleaned[field] = value
+    for field in BOOLEAN_FIELDS:
+        if field in cleaned and not isinstance(cleaned[field], bool):
+            cleaned[field] = str(cleaned[field]).strip().lower() in TRUE_VALUES
+    return cleaned
+
+
+def copy_value(value):
+    """
+    Formats a value for COPY ... FROM STDIN in text format.
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    return (
+        str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+    )
+
+
+class UserImporter:
+    """
+    Loads users in batches. On PostgreSQL each batch is COPY'd into a temporary
+    staging table and moved into the users table with INSERT ... ON CONFLICT DO
+    NOTHING. Other databases fall back to bulk_create(ignore_conflicts=True).
+    Either way, rows whose username or email already exists are skipped rather
+    than failing the batch, so a batch can safely be replayed after a crash.
+    """
+
+    def __init__(self):
+        self.model = get_user_model()
+        self.fields = [field for field in self.model._meta.concrete_fields if not field.primary_key]
+        self.max_lengths = {
+            field: self.model._meta.get_field(field).max_length for field in ('username', 'email')
+        }
+
+    def build(self, record, password):
+        user = self.model(**{field: value for field, value in record.items() if field not in ('password', 'password_hash')})
+        user.password = password
+        return user
+
+    def write(self, users):
+        """
+        Inserts a batch in one transaction.
+        Returns:
+            int: Number of rows inserted.
+        """
+        with transaction.atomic():
+            if connection.vendor != 'postgresql':
+                before = self.model.objects.count()
+                self.model.objects.bulk_create(users, ignore_conflicts=True)
+                return self.model.objects.count() - before
+            return self.copy(users)
+
+    def copy(self, users):
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        columns = ', '.join(quote(field.column) for field in self.fields)
+        data = ''.join(
+            '\t'.join(copy_value(field.get_db_prep_save(field.pre_save(user, True), connection)) for field in self.fields) + '\n'
+            for user in users
+        )
+        with connection.cursor() as cursor:
+            # Constraints aren't copied into the staging table, so COPY never fails on duplicates
+            cursor.execute(f'CREATE TEMP TABLE import_users_staging ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA')
+            copy_sql = f'COPY import_users_staging ({columns}) FROM STDIN'
+            if hasattr(cursor.cursor, 'copy'):
+                with cursor.cursor.copy(copy_sql) as copy:  # psycopg 3
+                    copy.write(data)
+            else:
+                cursor.cursor.copy_expert(copy_sql, io.StringIO(data))  # psycopg2
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) SELECT {columns} FROM import_users_staging ON CONFLICT DO NOTHING'
+            )
+            return cursor.rowcount
+
+
+class Checkpoint:
+    """
+    Records how many input records have been committed, in a JSON file next to the input.
+    Written atomically after each batch commits.
+    """
+
+    def __init__(self, path, input_path):
+        self.path = path
+        self.input = os.path.abspath(input_path)
+        self.size = os.path.getsize(input_path)
+        self.records = self.inserted = self.skipped = 0
+        self.last_batch = 0
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            state = json.load(f)
+        if state['input'] != self.input or state['size'] != self.size:
+            raise ValueError(f'{self.path} belongs to a different or modified input; delete it to start over')
+        self.records, self.inserted, self.skipped = state['records'], state['inserted'], state['skipped']
+        return True
+
+    def save(self):
+        partial_path = f'{self.path}.part'
+        with open(partial_path, 'w') as f:
+            json.dump({
+                'input': self.input, 'size': self.size,
+                'records': self.records, 'inserted': self.inserted, 'skipped': self.skipped,
+            }, f)
+        os.replace(partial_path, self.path)
+
+    def delete(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def import_users(path, fmt=None, batch_size=1000, workers=None, checkpoint_path=None, progress=None):
+    """
+    Imports users from a CSV or JSONL file.
+
+    Batches are hashed on a process pool while earlier batches are being
+    written, keeping up to two batches per worker in flight. Batches are
+    committed in input order, and the checkpoint file is advanced after each
+    commit. If the import is interrupted, rerunning it with the same input
+    resumes after the last committed batch. It is deleted when the import
+    completes.
+
+    Args:
+        path (str): The input file.
+        fmt (str): 'csv' or 'jsonl' (optional, default=guessed from the extension).
+        batch_size (int): Records per transaction (optional, default=1000).
+        workers (int): Hashing processes; 0 hashes inline (optional, default=os.cpu_count()).
+        checkpoint_path (str): Checkpoint file (optional, default=<path>.checkpoint.json).
+        progress (callable): Called with the checkpoint after every batch (optional).
+    Returns:
+        Checkpoint: Final counts of records read, inserted and skipped.
+    Raises:
+        ValueError: If the checkpoint belongs to another input.
+        Exception: Any database error; the checkpoint keeps the progress made so far.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    checkpoint = Checkpoint(checkpoint_path or f'{path}.checkpoint.json', path)
+    if checkpoint.load():
+        logger.info(f'Resuming import of {path} after record {checkpoint.records}')
+
+    importer = UserImporter()
+    records = islice(read_records(path, fmt), checkpoint.records, None)
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(), initializer=_init_worker) if workers else None
+    )
+    pending = deque()
+    read = checkpoint.records
+    rejected = 0
+
+    def submit(batch):
+        nonlocal read, rejected
+        cleaned = []
+        for record in batch:
+            read += 1
+            record = clean_record(record, importer.max_lengths)
+            if record is None:
+                rejected += 1
+                if rejected <= MAX_LOGGED_REJECTS:
+                    logger.warning(f'Skipping record {read}: missing or too long username or email')
+            else:
+                cleaned.append(record)
+        to_hash = [record.get('password') for record in cleaned if 'password_hash' not in record]
+        if pool is not None:
+            future = pool.submit(hash_passwords, to_hash)
+        else:
+            future = Future()
+            future.set_result(hash_passwords(to_hash))
+        pending.append((len(batch), cleaned, future))
+
+    def commit_oldest():
+        size, cleaned, future = pending.popleft()
+        hashes = iter(future.result())
+        users = [importer.build(record, record.get('password_hash') or next(hashes)) for record in cleaned]
+        started = time.perf_counter()
+        inserted = importer.write(users) if users else 0
+        checkpoint.records += size
+        checkpoint.last_batch = size
+        checkpoint.inserted += inserted
+        checkpoint.skipped += size - inserted
+        checkpoint.save()
+        logger.info(f'Imported batch of {size} ({inserted} new) in {time.perf_counter() - started:.3f}s')
+        if progress is not None:
+            progress(checkpoint)
+
+    try:
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            submit(batch)
+            if len(pending) >= max(workers, 1) * 2:
+                commit_oldest()
+        while pending:
+            commit_oldest()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    checkpoint.delete()
+    return checkpoint
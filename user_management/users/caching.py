@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+GENERATION = struct.Struct('<Q')
+
+_invalidation_table = None
+_invalidation_table_lock = threading.Lock()
+
+
+class BoundedTTLCache:
+    """
+    A thread-safe, in-process LRU cache whose entries expire at an absolute time.
+    The number of entries is capped at maxsize; the least recently used entry is
+    evicted when the cache is full.
+    """
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("maxsize must be greater than 0")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for key, or default if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at):
+        """
+        Stores value under key until the epoch timestamp expires_at.
+        """
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the cache counters as a dict.
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class InvalidationTable:
+    """
+    Generation numbers shared by every worker on the host, used to invalidate
+    entries of the workers' in-process caches.
+
+    An entry records the generation of its key from before it was read from
+    the database and is served only while the generation is unchanged.
+    invalidate() writes a new random generation, so every worker misses on its
+    next lookup of the key. Keys are hashed into a fixed number of slots; a
+    collision only costs an extra miss.
+
+    The table lives in a file mapped from /dev/shm when
+    CACHE_INVALIDATION_SHARED_PATH is set, so reading a generation is a memory
+    read rather than a query. Otherwise it lives in process memory and only
+    reaches this process.
+    """
+
+    def __init__(self, slots, shared_path=None):
+        self.slots = max(int(slots), 1)
+        size = self.slots * GENERATION.size
+        if shared_path:
+            fd = os.open(shared_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if os.fstat(fd).st_size != size:
+                    os.ftruncate(fd, size)
+                self._buf = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+        else:
+            self._buf = bytearray(size)
+
+    def _offset(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') % self.slots * GENERATION.size
+
+    def generation(self, key):
+        return GENERATION.unpack_from(self._buf, self._offset(key))[0]
+
+    def invalidate(self, key):
+        # A random value rather than an increment, so concurrent invalidations can't cancel out
+        GENERATION.pack_into(self._buf, self._offset(key), int.from_bytes(os.urandom(8), 'little'))
+
+
+def get_invalidation_table():
+    """
+    Returns this process's handle on the shared invalidation table, opening it on first use.
+    """
+    global _invalidation_table
+    if _invalidation_table is None:
+        with _invalidation_table_lock:
+            if _invalidation_table is None:
+                shared_path = settings.CACHE_INVALIDATION_SHARED_PATH
+                if shared_path and not os.path.isdir(os.path.dirname(shared_path)):
+                    logger.warning(f'{os.path.dirname(shared_path)} is missing; cache invalidations are per process')
+                    shared_path = None
+                _invalidation_table = InvalidationTable(settings.CACHE_INVALIDATION_SLOTS, shared_path)
+    return _invalidation_table
@@ -0,0 +1,22 @@
+"""
+The one case-insensitive key used for usernames and emails.
+
+Lookups in the database compare UPPER(column), which the users_*_upper
+indexes serve, so every in-process structure answering the same question (the
+availability Bloom filters, the autocomplete index) has to build its keys the
+same way. Python's str.upper() and str.casefold() don't: they expand
+characters such as 'ß' to 'SS' and 'ﬁ' to 'FI', while PostgreSQL's UPPER()
+maps one character at a time and leaves them as they are. A filter keyed with
+casefold() can then answer "not taken" for a value the database would match.
+"""
+
+
+def upper_key(value):
+    """
+    Upper-cases value one character at a time, like the database's UPPER().
+    Characters whose upper case is more than one character are kept as they are.
+    """
+    upper = value.upper()
+    if len(upper) == len(value):
+        return upper
+    return ''.join(char if len(mapped := char.upper()) != 1 else mapped for char in value)
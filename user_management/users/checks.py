@@ -0,0 +1,51 @@
+"""
+System checks for settings the users app relies on.
+"""
+import os
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends that keep their data in the process, or don't keep it at all
+PER_PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    The default cache holds 2FA replay and lockout state. With a per-process
+    backend each worker has its own copy: a 2FA code can be replayed on
+    another worker, and the lockout allows TOTP_MAX_FAILURES guesses per worker.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in PER_PROCESS_CACHE_BACKENDS:
+        return [
+            Error(
+                f'The default cache backend {backend} is not shared between worker processes.',
+                hint='Use a shared backend such as DatabaseCache or RedisCache (see CACHES in settings).',
+                id='users.E001',
+            )
+        ]
+    return []
+
+
+@register(Tags.caches)
+def check_invalidation_table(app_configs, **kwargs):
+    """
+    The token and profile caches are per process and rely on the shared
+    invalidation table to drop entries other workers have invalidated. Without
+    it a deleted token keeps authenticating on other workers until its entry
+    expires.
+    """
+    shared_path = settings.CACHE_INVALIDATION_SHARED_PATH
+    if not shared_path or not os.path.isdir(os.path.dirname(shared_path)):
+        return [
+            Error(
+                f'CACHE_INVALIDATION_SHARED_PATH ({shared_path!r}) is not in an existing directory.',
+                hint='Point it into a tmpfs directory such as /dev/shm that all workers can write.',
+                id='users.E002',
+            )
+        ]
+    return []
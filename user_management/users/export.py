@@ -0,0 +1,181 @@
+import csv
+import io
+import logging
+import os
+import uuid
+import zipfile
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+from .models import DataExportJob
+from .outbox import enqueue_email
+
+logger = logging.getLogger(__name__)
+
+
+def write_csv(archive, name, header, rows):
+    """
+    Streams rows into a CSV member of an open zip archive.
+    Rows are written as they are produced, so memory use doesn't depend on how many there are.
+    """
+    with archive.open(f'{name}.csv', 'w', force_zip64=True) as member:
+        with io.TextIOWrapper(member, encoding='utf-8', newline='') as text:
+            writer = csv.writer(text)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+
+
+def profile_rows(user):
+    yield [user.username, user.email, user.date_joined, user.last_login]
+
+
+def oauth_connection_rows(user):
+    oauth_connections = getattr(user, 'oauth_connections', None)
+    if oauth_connections is not None:
+        yield from oauth_connections.values_list('provider', 'created_at', 'last_used').iterator(
+            chunk_size=settings.DATA_EXPORT_CHUNK_SIZE
+        )
+
+
+def statistics_rows(user):
+    stats = getattr(user, 'statistics', {}).get('get_summary', lambda: {})()
+    for key, value in stats.items():
+        yield [key, value]
+
+
+def archive_path_for(job):
+    return os.path.join(settings.DATA_EXPORT_ROOT, f'user-{job.user_id}-export-{job.id}.zip')
+
+
+def write_export_archive(user, path):
+    """
+    Writes the profile, OAuth connection and statistics CSVs into a deflated zip at path.
+    The archive is written under a temporary name unique to this attempt and
+    moved into place once complete, so a reclaimed job never writes into a
+    file another worker is still writing.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial_path = f'{path}.{uuid.uuid4().hex}.part'
+    try:
+        with zipfile.ZipFile(partial_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            write_csv(archive, 'profile', ['Username', 'Email', 'Date Joined', 'Last Login'], profile_rows(user))
+            write_csv(archive, 'oauth_connections', ['Provider', 'Connected Date', 'Last Used'], oauth_connection_rows(user))
+            write_csv(archive, 'statistics', ['Metric', 'Value'], statistics_rows(user))
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def finish_export_job(job, **fields):
+    """
+    Saves the outcome of a job, unless its lease has expired and another worker
+    has claimed it since.
+    Returns:
+        bool: Whether this worker still held the job.
+    """
+    fields['finished_at'] = now()
+    finished = DataExportJob.objects.filter(
+        pk=job.pk, status=DataExportJob.STATUS_RUNNING, started_at=job.started_at
+    ).update(**fields)
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return bool(finished)
+
+
+def run_export_job(job):
+    """
+    Builds the archive for a claimed job and notifies the user by email.
+    """
+    path = archive_path_for(job)
+    try:
+        write_export_archive(job.user, path)
+    except Exception as e:
+        logger.error(f'Data export {job.id} failed: {e}')
+        finish_export_job(job, status=DataExportJob.STATUS_FAILED, error=str(e))
+        return False
+
+    if not finish_export_job(job, status=DataExportJob.STATUS_DONE, archive_path=path):
+        logger.warning(f'Data export {job.id} was claimed by another worker before it finished here')
+        return False
+
+    enqueue_email(
+        subject='Your Account Data Export',
+        body=(
+            f'Hi {job.user.username},\n\n'
+            f'Your account data export is ready. You can download it from the app '
+            f'(export #{job.id}).'
+        ),
+        to=[job.user.email],
+    )
+    logger.info(f'Data export {job.id} written to {path}')
+    return True
+
+
+def claim_export_jobs(limit):
+    """
+    Marks up to limit pending jobs, and running jobs whose lease has expired,
+    as running and returns them. Expired jobs that have used up
+    DATA_EXPORT_MAX_ATTEMPTS are marked failed instead.
+    """
+    lease_cutoff = now() - timedelta(seconds=settings.DATA_EXPORT_LEASE_SECONDS)
+    abandoned = Q(status=DataExportJob.STATUS_RUNNING, started_at__lt=lease_cutoff)
+    with transaction.atomic():
+        gave_up = DataExportJob.objects.filter(abandoned, attempts__gte=settings.DATA_EXPORT_MAX_ATTEMPTS).update(
+            status=DataExportJob.STATUS_FAILED, error='Export did not finish', finished_at=now()
+        )
+        if gave_up:
+            logger.error(f'Gave up on {gave_up} data exports after {settings.DATA_EXPORT_MAX_ATTEMPTS} attempts')
+        jobs = list(
+            DataExportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=DataExportJob.STATUS_PENDING) | abandoned)
+            .select_related('user')
+            .order_by('created_at')[:limit]
+        )
+        for job in jobs:
+            if job.status == DataExportJob.STATUS_RUNNING:
+                logger.warning(f'Reclaiming data export {job.id} started at {job.started_at}')
+            job.status = DataExportJob.STATUS_RUNNING
+            job.started_at = now()
+            job.attempts += 1
+        DataExportJob.objects.bulk_update(jobs, ['status', 'started_at', 'attempts'])
+    return jobs
+
+
+def process_export_jobs(limit=10):
+    """
+    Runs up to limit pending export jobs.
+    Returns:
+        int: Number of jobs processed.
+    """
+    jobs = claim_export_jobs(limit)
+    for job in jobs:
+        run_export_job(job)
+    return len(jobs)
+
+
+def delete_expired_exports():
+    """
+    Deletes archives finished more than DATA_EXPORT_RETENTION_DAYS ago and marks their jobs expired.
+    Returns:
+        int: Number of jobs expired.
+    """
+    cutoff = now() - timedelta(days=settings.DATA_EXPORT_RETENTION_DAYS)
+    expired = 0
+    for job in DataExportJob.objects.filter(status=DataExportJob.STATUS_DONE, finished_at__lt=cutoff).iterator():
+        try:
+            os.remove(job.archive_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f'Deleting data export archive {job.archive_path} failed: {e}')
+            continue
+        expired += DataExportJob.objects.filter(pk=job.pk, status=DataExportJob.STATUS_DONE).update(
+            status=DataExportJob.STATUS_EXPIRED, archive_path=''
+        )
+    if expired:
+        logger.info(f'Deleted {expired} expired data export archives')
+    return expired
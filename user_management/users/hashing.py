@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from user_management.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+class HashingBusy(Exception):
+    """
+    Raised when the hashing queue is full or a hash didn't finish in time.
+    """
+
+
+def _init_worker():
+    # Workers are spawned, so they start without Django set up
+    import django
+    django.setup()
+
+
+def pool_context():
+    """
+    Multiprocessing context for hashing workers. Forking a server process that
+    runs threads (DB pool, background syncs) can deadlock the child on a lock
+    held by one of them, so workers are spawned instead.
+    """
+    return multiprocessing.get_context('spawn')
+
+
+def _make_password(password):
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
+
+
+def _check_password(password, encoded):
+    from django.contrib.auth.hashers import check_password
+    return check_password(password, encoded)
+
+
+class HashingService:
+    """
+    Runs password hashing on a bounded process pool so PBKDF2 doesn't block request threads.
+    At most PASSWORD_HASHING_MAX_QUEUE hashes may be queued or running at once;
+    beyond that HashingBusy is raised immediately so a login burst can't pile up
+    behind the pool. With PASSWORD_HASHING_WORKERS = 0 hashing runs inline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self):
+        # A forked worker can't use the pool of its parent
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=settings.PASSWORD_HASHING_WORKERS,
+                        mp_context=pool_context(),
+                        initializer=_init_worker,
+                    )
+                    self._slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_MAX_QUEUE)
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _reset_executor(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                logger.error('Password hashing pool broke; starting a new one')
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pid = None
+
+    def submit(self, fn, *args):
+        """
+        Schedules fn(*args) on the pool.
+        Returns:
+            Future: Resolves to the result of fn.
+        Raises:
+            HashingBusy: If the queue is full.
+        """
+        if not settings.PASSWORD_HASHING_WORKERS:
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+
+        executor = self._get_executor()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusy('Password hashing queue is full')
+
+        started = time.perf_counter()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self._reset_executor(executor)
+            return self.submit(fn, *args)
+
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+
+        def done(_):
+            slots.release()
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.total_seconds += time.perf_counter() - started
+
+        future.add_done_callback(done)
+        return future
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=settings.PASSWORD_HASHING_TIMEOUT)
+        except TimeoutError:
+            self.timeouts += 1
+            raise HashingBusy('Password hashing timed out')
+
+    def make_password(self, password):
+        with span('hashing'):
+            return self._result(self.submit(_make_password, password))
+
+    def check_password(self, password, encoded):
+        with span('hashing'):
+            return self._result(self.submit(_check_password, password, encoded))
+
+    async def _aresult(self, fn, *args):
+        if not settings.PASSWORD_HASHING_WORKERS:
+            # Inline hashing would block the event loop; use a worker thread instead
+            return await sync_to_async(fn, thread_sensitive=False)(*args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(self.submit(fn, *args)), settings.PASSWORD_HASHING_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise HashingBusy('Password hashing timed out')
+
+    async def amake_password(self, password):
+        with span('hashing'):
+            return await self._aresult(_make_password, password)
+
+    async def acheck_password(self, password, encoded):
+        with span('hashing'):
+            return await self._aresult(_check_password, password, encoded)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': settings.PASSWORD_HASHING_WORKERS,
+                'max_queue': settings.PASSWORD_HASHING_MAX_QUEUE,
+                'in_flight': self.in_flight,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'total_seconds': self.total_seconds,
+            }
+
+
+hashing_service = HashingService()
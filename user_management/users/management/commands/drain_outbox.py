@@ -0,0 +1,43 @@
+import logging
+import time
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from users.outbox import close_quietly, drain_outbox
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Sends queued emails from the outbox, reusing one SMTP connection across batches. '
+        'For local testing point EMAIL_HOST/EMAIL_PORT at a stand-in such as '
+        '"python -m aiosmtpd -n -l localhost:1025".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Send one batch and exit.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails per batch.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when the outbox is empty.')
+
+    def handle(self, *args, **options):
+        connection = get_connection(fail_silently=False)
+        try:
+            while True:
+                try:
+                    sent, failed = drain_outbox(connection=connection, batch_size=options['batch_size'])
+                except Exception as e:
+                    # e.g. the database is unreachable; claimed emails are retried once their claim expires
+                    logger.error(f'Draining the outbox failed: {e}')
+                    sent = failed = 0
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent}, failed {failed}')
+                if options['once']:
+                    break
+                if not sent and not failed:
+                    # Don't hold an idle SMTP session open; it is reopened on the next batch
+                    close_quietly(connection)
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close_quietly(connection)
@@ -0,0 +1,50 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from users.bulk_import import import_users
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports users from a CSV file with a header row or a JSON Lines file. Recognised columns: username, '
+        'email, password (hashed during import), password_hash (stored as-is), first_name, last_name, '
+        'email_verified, is_active. Existing usernames and emails are skipped. Rerun the same command to '
+        'resume an interrupted import.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input file.')
+        parser.add_argument('--format', choices=('csv', 'jsonl'), help='Input format (default: from the extension).')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Records per transaction.')
+        parser.add_argument('--workers', type=int, default=None, help='Password hashing processes (default: CPU count, 0 = inline).')
+        parser.add_argument('--checkpoint', help='Checkpoint file (default: <path>.checkpoint.json).')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        first_record = None
+
+        def progress(checkpoint):
+            nonlocal first_record
+            if first_record is None:
+                # Resumed runs start counting from the checkpoint
+                first_record = checkpoint.records - checkpoint.last_batch
+            rate = (checkpoint.records - first_record) / (time.monotonic() - started)
+            self.stdout.write(
+                f'{checkpoint.records} records read, {checkpoint.inserted} inserted, '
+                f'{checkpoint.skipped} skipped ({rate:.0f} records/s)'
+            )
+
+        try:
+            result = import_users(
+                options['path'],
+                fmt=options['format'],
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                checkpoint_path=options['checkpoint'],
+                progress=progress,
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {result.records} records read, {result.inserted} inserted, {result.skipped} skipped.'
+        ))
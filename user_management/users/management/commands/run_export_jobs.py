@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand
+from users.export import delete_expired_exports, process_export_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Builds pending account data export archives and notifies their owners. '
+        'Also deletes archives older than DATA_EXPORT_RETENTION_DAYS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process one batch and exit.')
+        parser.add_argument('--batch-size', type=int, default=10, help='Jobs claimed per batch.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when no job is pending.')
+        parser.add_argument(
+            '--cleanup-interval', type=float, default=60 * 60, help='Seconds between deletions of expired archives.'
+        )
+
+    def handle(self, *args, **options):
+        cleaned_at = None
+        try:
+            while True:
+                if cleaned_at is None or time.monotonic() - cleaned_at >= options['cleanup_interval']:
+                    expired = delete_expired_exports()
+                    cleaned_at = time.monotonic()
+                    if expired:
+                        self.stdout.write(f'Deleted {expired} expired export archives')
+                processed = process_export_jobs(options['batch_size'])
+                if processed:
+                    self.stdout.write(f'Processed {processed} export jobs')
+                if options['once']:
+                    break
+                if not processed:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def drop_duplicate_codes(apps, schema_editor):
+    # Keeps the newest code of each address; older ones were superseded anyway
+    PasswordResetCode = apps.get_model('users', 'PasswordResetCode')
+    newest = {}
+    for pk, digest in PasswordResetCode.objects.order_by('email_digest', '-expires_at').values_list('pk', 'email_digest'):
+        newest.setdefault(digest, pk)
+    PasswordResetCode.objects.exclude(pk__in=newest.values()).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_create_cache_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_codes, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='passwordresetcode',
+            name='users_reset_digest_exp_idx',
+        ),
+        migrations.AlterField(
+            model_name='passwordresetcode',
+            name='email_digest',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
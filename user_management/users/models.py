@@ -2,7 +2,7 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.timezone import now
 from django.core.exceptions import ValidationError
-from django.contrib.auth.hashers import make_password
+from django.contrib.auth.hashers import identify_hasher, is_password_usable
 import pyotp
 
 class User(AbstractUser):
@@ -14,8 +14,11 @@ from django.core.validators import MaxLengthValidator, MinLengthValidator
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.timezone import now
 import pyotp
 
@@ -25,9 +28,29 @@ class User(AbstractUser):
     has_2fa = models.BooleanField(default=False)
     totp_secret = models.CharField(max_length=32, blank=True, null=True)
     last_activity = models.DateTimeField(null=True, blank=True)
+    # Bumped by save() whenever a field served by MeView may have changed; used for its ETag/Last-Modified
+    profile_version = models.PositiveIntegerField(default=1)
+    profile_updated_at = models.DateTimeField(default=now)
+
+    # Fields returned by MeView
+    PROFILE_FIELDS = ('username', 'email', 'first_name', 'last_name', 'date_joined', 'last_login', 'is_active')
+
+    class Meta:
+        indexes = [
+            # Serves username__icontains, which Django renders as UPPER(username) LIKE UPPER(%s)
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='users_username_upper_trgm'),
+            # Serve the UPPER(...) = UPPER(...) lookups of the batch availability check
+            models.Index(Upper('username'), name='users_username_upper_idx'),
+            models.Index(Upper('email'), name='users_email_upper_idx'),
+        ]
 
     def update_last_activity(self):
         self.last_activity = now()
+        if settings.LAST_ACTIVITY_MODE == 'buffered':
+            # Written later in one bulk UPDATE by users.activity.activity_buffer
+            from .activity import activity_buffer
+            activity_buffer.record(self.pk, self.last_activity)
+            return
         self.save(update_fields=['last_activity'])
 
     def enable_2fa(self):
@@ -37,18 +60,36 @@ class User(AbstractUser):
             self.save(update_fields=['totp_secret', 'has_2fa'])
 
     def verify_2fa(self, code):
-        if not self.has_2fa or not self.totp_secret:
-            return False
-        totp = pyotp.TOTP(self.totp_secret)
-        return totp.verify(code)
+        """
+        Returns True if code is a valid, unused 2FA code; see users.totp.TOTPService.
+        """
+        from .totp import totp_service
+        return totp_service.verify(self, code)
 
 
+    @staticmethod
+    def is_password_hashed(value):
+        try:
+            identify_hasher(value)
+        except ValueError:
+            return False
+        return True
+
     def save(self, *args, **kwargs):
         """
         Override the save method to ensure password hashing and any other custom behavior.
         """
-        if self.password and not self.password.startswith('pbkdf2_'):
-            self.password = make_password(self.password)
+        if self.password and is_password_usable(self.password) and not self.is_password_hashed(self.password):
+            from .hashing import hashing_service
+            self.password = hashing_service.make_password(self.password)
+
+        # Saves limited to fields outside the profile (e.g. last_activity) keep the version
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.PROFILE_FIELDS):
+            self.profile_version += 1
+            self.profile_updated_at = now()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'profile_version', 'profile_updated_at'}
         super(User, self).save(*args, **kwargs)
 
 
@@ -72,3 +113,124 @@ class User(AbstractUser):
         """
         if self.username == self.email:
             raise ValidationError("Username and email cannot be the same.")
+
+
+class OutboundEmail(models.Model):
+    """
+    An email waiting in the outbox. Rows are sent by the drain_outbox
+    management command, which retries failures with exponential backoff.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.JSONField()
+    # List of [filename, content, mimetype] triples with text content
+    attachments = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='users_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {", ".join(self.to)}'
+
+
+class PurgeCheckpoint(models.Model):
+    """
+    Progress of an interrupted chunked purge (see users.purge), so the next
+    run resumes after last_id with the same cutoff instead of starting over.
+    """
+    name = models.CharField(max_length=64, unique=True)
+    cutoff = models.DateTimeField()
+    last_id = models.BigIntegerField(default=0)
+    deleted = models.BigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.name} (after id {self.last_id})'
+
+
+class DataExportJob(models.Model):
+    """
+    A background export of a user's account data into a compressed archive,
+    processed by the run_export_jobs management command. A running job whose
+    worker died is claimed again once started_at is older than
+    DATA_EXPORT_LEASE_SECONDS; archives are deleted after
+    DATA_EXPORT_RETENTION_DAYS and the job marked expired.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_EXPIRED = 'expired'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_EXPIRED, 'Expired'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='export_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    archive_path = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='users_export_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'Export {self.id} for user {self.user_id} ({self.status})'
+
+
+class RevokedToken(models.Model):
+    """
+    A revoked refresh token, identified by its jti claim.
+    Rows are pruned once the token would have expired anyway.
+    """
+    jti = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+
+class PasswordResetCode(models.Model):
+    """
+    An outstanding password reset code, kept apart from User so reset traffic
+    doesn't write to the users table. Neither the email nor the code is
+    stored in clear (see users.reset_codes). Expired rows are swept periodically.
+    """
+    # One outstanding code per address; issuing a new one replaces it in place
+    email_digest = models.CharField(max_length=64, unique=True)
+    code_hash = models.CharField(max_length=64)
+    expires_at = models.DateTimeField()
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Reset code {self.id} (expires {self.expires_at})'
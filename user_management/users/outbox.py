@@ -0,0 +1,157 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils.timezone import now
+from user_management.metrics import span
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, body, to, from_email=None, attachments=()):
+    """
+    Stores an email in the outbox; it is sent later by drain_outbox.
+    Args:
+        subject (str): The email subject.
+        body (str): The plain text body.
+        to (list): Recipient addresses.
+        from_email (str): Sender address (optional, default=settings.DEFAULT_FROM_EMAIL).
+        attachments (iterable): (filename, content, mimetype) triples with text content.
+    Returns:
+        OutboundEmail: The queued email.
+    """
+    with span('email'):
+        return OutboundEmail.objects.create(**email_fields(subject, body, to, from_email, attachments))
+
+
+async def aenqueue_email(subject, body, to, from_email=None, attachments=()):
+    """
+    Async version of enqueue_email.
+    """
+    with span('email'):
+        return await OutboundEmail.objects.acreate(**email_fields(subject, body, to, from_email, attachments))
+
+
+def email_fields(subject, body, to, from_email, attachments):
+    return {
+        'subject': subject,
+        'body': body,
+        'from_email': from_email or '',
+        'to': list(to),
+        'attachments': [list(attachment) for attachment in attachments],
+    }
+
+
+def retry_delay(attempts):
+    """
+    Returns the exponential backoff before the next attempt.
+    """
+    seconds = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+def build_message(email, connection):
+    message = EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or None,
+        to=email.to,
+        connection=connection,
+    )
+    for filename, content, mimetype in email.attachments:
+        message.attach(filename, content, mimetype)
+    return message
+
+
+def claim_batch(batch_size):
+    """
+    Claims up to batch_size due emails for this worker and commits the claim.
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED only while their
+    attempt is counted and next_attempt_at is pushed OUTBOX_CLAIM_SECONDS
+    ahead, so other workers skip them without the transaction staying open
+    during SMTP I/O. Emails left unsent by a crashed worker become due again
+    once the claim expires.
+    Returns:
+        list: The claimed OutboundEmail rows.
+    """
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now())
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        claimed_until = now() + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS)
+        for email in batch:
+            email.attempts += 1
+            email.next_attempt_at = claimed_until
+        OutboundEmail.objects.bulk_update(batch, ['attempts', 'next_attempt_at'])
+    return batch
+
+
+def mark_sent(email):
+    OutboundEmail.objects.filter(pk=email.pk).update(
+        status=OutboundEmail.STATUS_SENT, sent_at=now(), last_error=''
+    )
+
+
+def mark_failed(email, error):
+    if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        logger.error(f'Giving up on email {email.id} after {email.attempts} attempts: {error}')
+        OutboundEmail.objects.filter(pk=email.pk).update(status=OutboundEmail.STATUS_FAILED, last_error=str(error))
+    else:
+        logger.warning(f'Email {email.id} failed (attempt {email.attempts}): {error}')
+        OutboundEmail.objects.filter(pk=email.pk).update(
+            next_attempt_at=now() + retry_delay(email.attempts), last_error=str(error)
+        )
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception as e:
+        logger.warning(f'Closing the SMTP connection failed: {e}')
+
+
+def drain_outbox(connection=None, batch_size=None):
+    """
+    Sends one batch of due emails over a single SMTP connection.
+    The batch is claimed and committed first (see claim_batch), then each
+    email is sent and marked sent or failed on its own, so a failure to
+    connect or send is recorded against that email and doesn't undo the rest.
+    Args:
+        connection: An email backend to reuse (optional). When omitted a
+            connection is opened for this batch and closed afterwards.
+        batch_size (int): Maximum emails to send (optional, default=settings.OUTBOX_BATCH_SIZE).
+    Returns:
+        tuple: (number sent, number failed).
+    """
+    batch = claim_batch(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+
+    owns_connection = connection is None
+    if owns_connection:
+        connection = get_connection(fail_silently=False)
+    sent = failed = 0
+    try:
+        for email in batch:
+            try:
+                # No-op while the connection is open; reconnects after a failure closed it
+                connection.open()
+                connection.send_messages([build_message(email, connection)])
+            except Exception as e:
+                failed += 1
+                mark_failed(email, e)
+                # The SMTP session may be broken; the next message starts a fresh one
+                close_quietly(connection)
+            else:
+                sent += 1
+                mark_sent(email)
+    finally:
+        if owns_connection:
+            close_quietly(connection)
+
+    logger.info(f'Outbox batch done: {sent} sent, {failed} failed')
+    return sent, failed
@@ -0,0 +1,82 @@
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from user_management.fastjson import dumps
+from .caching import BoundedTTLCache, get_invalidation_table
+
+_profile_cache = None
+
+
+def get_profile_cache():
+    """
+    Returns the per-process profile cache, creating it on first use.
+    """
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = BoundedTTLCache(settings.PROFILE_CACHE_SIZE)
+    return _profile_cache
+
+
+def profile_cache_key(user_id):
+    return f'users:profile:{user_id}'
+
+
+def profile_data(user):
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'date_joined': user.date_joined,
+        'last_login': user.last_login,
+        'is_active': user.is_active,
+    }
+
+
+def build_profile(user, generation):
+    """
+    Serializes the profile served by MeView and caches it for PROFILE_CACHE_SECONDS.
+    Args:
+        user (User): The user.
+        generation (int): The entry's generation in the invalidation table, read before the user was loaded.
+    Returns:
+        dict: The rendered JSON body plus its validators ('etag', 'last_modified') and 'is_active'.
+    """
+    entry = {
+        'body': dumps(profile_data(user)),
+        'etag': f'"{user.pk}-{user.profile_version}"',
+        'last_modified': user.profile_updated_at.timestamp(),
+        'is_active': user.is_active,
+        'generation': generation,
+    }
+    get_profile_cache().set(profile_cache_key(user.pk), entry, time.time() + settings.PROFILE_CACHE_SECONDS)
+    return entry
+
+
+def get_profile(user_id):
+    """
+    Returns the profile entry for a user from this process's cache, building it
+    from the database on a miss. A hit costs no query. Entries invalidated by
+    any worker on the host (see invalidate_profile) are rebuilt.
+    Returns:
+        dict: See build_profile, or None if the user doesn't exist.
+    """
+    cache_key = profile_cache_key(user_id)
+    generation = get_invalidation_table().generation(cache_key)
+    entry = get_profile_cache().get(cache_key)
+    if entry is None or entry['generation'] != generation:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        entry = build_profile(user, generation)
+    return entry
+
+
+def invalidate_profile(user_id):
+    """
+    Drops a user's cached profile, in every worker on the host.
+    """
+    cache_key = profile_cache_key(user_id)
+    get_profile_cache().delete(cache_key)
+    get_invalidation_table().invalidate(cache_key)
@@ -0,0 +1,70 @@
+import logging
+import time
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from .models import PurgeCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+def purge_in_chunks(name, candidates, cutoff, chunk_size=None):
+    """
+    Deletes the rows selected by candidates(cutoff) in primary key order, one
+    chunk per transaction.
+
+    Candidate ids are streamed through a server-side cursor. Each chunk is
+    deleted with a single queryset delete, so there is one DELETE per table
+    per chunk rather than per row. The delete goes through the candidates
+    queryset again, so rows that stopped matching since their ids were read
+    (e.g. a user who became active) are kept. The checkpoint is advanced in the same
+    transaction as the delete. If the run is interrupted, the next call with
+    the same name resumes after the last deleted chunk and reuses the
+    original cutoff.
+
+    Args:
+        name (str): Identifies the purge and its checkpoint.
+        candidates (callable): Returns the queryset of rows to delete for a cutoff.
+        cutoff (datetime): Cutoff for a fresh run; ignored when resuming.
+        chunk_size (int): Rows per chunk (optional, default=settings.PURGE_CHUNK_SIZE).
+    Returns:
+        list: One report per chunk with the number of candidate rows deleted
+        ('rows'), the rows deleted including cascades ('deleted'), the last id
+        and the time taken.
+    Raises:
+        Exception: Any database error; the checkpoint keeps the progress made so far.
+    """
+    chunk_size = chunk_size or settings.PURGE_CHUNK_SIZE
+    checkpoint, created = PurgeCheckpoint.objects.get_or_create(name=name, defaults={'cutoff': cutoff})
+    if not created:
+        logger.info(f'Resuming purge {name} after id {checkpoint.last_id} (cutoff {checkpoint.cutoff})')
+
+    queryset = candidates(checkpoint.cutoff)
+    label = queryset.model._meta.label
+    ids = queryset.filter(pk__gt=checkpoint.last_id).order_by('pk').values_list('pk', flat=True).iterator(
+        chunk_size=chunk_size
+    )
+
+    reports = []
+    while True:
+        chunk = list(islice(ids, chunk_size))
+        if not chunk:
+            break
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            deleted, per_model = queryset.filter(pk__in=chunk).delete()
+            rows = per_model.get(label, 0)
+            checkpoint.last_id = chunk[-1]
+            checkpoint.deleted += rows
+            checkpoint.save(update_fields=['last_id', 'deleted', 'updated_at'])
+        elapsed = time.perf_counter() - started
+
+        reports.append({'rows': rows, 'deleted': deleted, 'last_id': chunk[-1], 'seconds': round(elapsed, 4)})
+        logger.info(
+            f'Purge {name}: deleted {rows} of {len(chunk)} candidates ending at id {chunk[-1]} in {elapsed:.3f}s'
+        )
+
+    logger.info(f'Purge {name} finished: {checkpoint.deleted} rows deleted')
+    checkpoint.delete()
+    return reports
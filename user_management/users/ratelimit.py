@@ -0,0 +1,203 @@
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from functools import wraps
+from inspect import iscoroutinefunction
+from django.conf import settings
+from user_management.fastjson import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+# hash, window index, count in window, count in previous window, expiry (epoch seconds)
+SLOT = struct.Struct('<QIIII')
+BUCKET_SLOTS = 8
+LOCK_STRIPES = 64
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """
+    Parses a rate such as '10/m' into (limit, period in seconds).
+    """
+    count, unit = rate.split('/')
+    return int(count), PERIODS[unit]
+
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window-counter rate limiter over a fixed-size hash table.
+
+    Each (route, key) pair occupies one slot holding the counts of the current
+    and the previous window. The count in the last period is estimated as
+    previous * (unelapsed fraction of the current window) + current. That is
+    two integers per key, and a check is a single read-modify-write of one
+    slot.
+
+    The table lives in a file mapped from /dev/shm when RATE_LIMIT_SHARED_PATH
+    is set, so every worker on the host shares the counters. Otherwise it lives
+    in process memory. Slots are grouped in buckets of BUCKET_SLOTS. A check
+    locks only its bucket: a byte-range fcntl lock for other processes plus a
+    striped thread lock for this one. When a bucket is full, its oldest slot
+    is recycled. In the worst case a key is forgotten early, never over-counted.
+    """
+
+    def __init__(self, slots, shared_path=None):
+        self.buckets = max(slots // BUCKET_SLOTS, 1)
+        size = self.buckets * BUCKET_SLOTS * SLOT.size
+        self._fd = None
+        if shared_path:
+            self._fd = os.open(shared_path, os.O_RDWR | os.O_CREAT, 0o600)
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, size)
+            self._buf = mmap.mmap(self._fd, size)
+        else:
+            self._buf = bytearray(size)
+        self._thread_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def hit(self, name, limit, period, now=None):
+        """
+        Counts one request for name unless it is over the limit.
+        Returns:
+            bool: True if the request is allowed.
+        """
+        now = time.time() if now is None else now
+        digest = hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest()
+        key_hash = int.from_bytes(digest, 'little') | 1
+        bucket = key_hash % self.buckets
+        window = int(now // period)
+        start = bucket * BUCKET_SLOTS * SLOT.size
+
+        with self._thread_locks[bucket % LOCK_STRIPES]:
+            if self._fd is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, BUCKET_SLOTS * SLOT.size, start)
+            try:
+                return self._hit_bucket(start, key_hash, window, limit, period, now)
+            finally:
+                if self._fd is not None:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, BUCKET_SLOTS * SLOT.size, start)
+
+    def _hit_bucket(self, start, key_hash, window, limit, period, now):
+        buf = self._buf
+        target = None
+        oldest = None
+        for i in range(BUCKET_SLOTS):
+            offset = start + i * SLOT.size
+            slot_hash, slot_window, current, previous, expires = SLOT.unpack_from(buf, offset)
+            if slot_hash == key_hash:
+                target = offset
+                break
+            if target is None and (slot_hash == 0 or expires <= now):
+                target = offset
+            elif oldest is None or expires < oldest[1]:
+                oldest = (offset, expires)
+        else:
+            slot_window = current = previous = 0
+            if target is None:
+                target = oldest[0]
+
+        # Roll the counts forward to the current window
+        if slot_window != window:
+            previous = current if slot_window == window - 1 else 0
+            current = 0
+
+        elapsed = (now % period) / period
+        if previous * (1 - elapsed) + current >= limit:
+            SLOT.pack_into(buf, target, key_hash, window, current, previous, (window + 2) * period)
+            return False
+
+        SLOT.pack_into(buf, target, key_hash, window, current + 1, previous, (window + 2) * period)
+        return True
+
+
+class RateLimitEngine:
+    """
+    Applies the per-route limits declared in settings.RATE_LIMITS and counts
+    allowed and blocked requests per route.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiter = None
+        self._routes = None
+        self.allowed = {}
+        self.blocked = {}
+
+    def _setup(self):
+        with self._lock:
+            if self._limiter is not None:
+                return
+            self._routes = {
+                route: (config['key'],) + parse_rate(config['rate'])
+                for route, config in settings.RATE_LIMITS.items()
+            }
+            shared_path = settings.RATE_LIMIT_SHARED_PATH
+            if shared_path and not os.path.isdir(os.path.dirname(shared_path)):
+                logger.warning(f'{os.path.dirname(shared_path)} is missing; rate limits are per process')
+                shared_path = None
+            self._limiter = SlidingWindowLimiter(settings.RATE_LIMIT_SLOTS, shared_path)
+
+    @staticmethod
+    def client_key(request, key):
+        if key == 'user':
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                return f'user:{user.pk}'
+        return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+    def is_allowed(self, route, request):
+        if self._limiter is None:
+            self._setup()
+        key, limit, period = self._routes[route]
+        allowed = self._limiter.hit(f'{route}:{self.client_key(request, key)}', limit, period)
+        counters = self.allowed if allowed else self.blocked
+        counters[route] = counters.get(route, 0) + 1
+        return allowed
+
+    def metrics(self):
+        """
+        Returns {route: {'allowed': n, 'blocked': n}} for this process.
+        """
+        routes = set(self.allowed) | set(self.blocked)
+        return {
+            route: {'allowed': self.allowed.get(route, 0), 'blocked': self.blocked.get(route, 0)}
+            for route in sorted(routes)
+        }
+
+
+rate_limit_engine = RateLimitEngine()
+
+
+def too_many_requests():
+    return JsonResponse({'error': 'Too many requests'}, status=429)
+
+
+def rate_limited(route):
+    """
+    Decorates a view function or method with the limit declared for route in settings.RATE_LIMITS.
+    Limited requests get a 429 response. Works on sync and async views.
+    """
+    def decorator(view):
+        def get_request(args):
+            # Plain views and method_decorator pass the request first; view methods pass self first
+            return args[0] if hasattr(args[0], 'META') else args[1]
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(*args, **kwargs):
+                if not rate_limit_engine.is_allowed(route, get_request(args)):
+                    return too_many_requests()
+                return await view(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not rate_limit_engine.is_allowed(route, get_request(args)):
+                return too_many_requests()
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import logging
+import secrets
+import string
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils.timezone import now
+from .models import PasswordResetCode
+
+logger = logging.getLogger(__name__)
+
+CODE_VALID = 'valid'
+CODE_INVALID = 'invalid'
+CODE_EXPIRED = 'expired'
+CODE_LOCKED = 'locked'
+
+_swept_at = 0.0
+
+
+def _hmac(message):
+    return hmac.new(settings.SECRET_KEY.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def email_digest(email):
+    """
+    Keyed digest of a normalized email, so the table never holds addresses.
+    """
+    return _hmac(f'reset-email:{email.strip().lower()}')
+
+
+def code_hash(digest, code):
+    return _hmac(f'reset-code:{digest}:{code}')
+
+
+def issue_reset_code(email):
+    """
+    Creates a new reset code for email, replacing any outstanding one.
+    email_digest is unique, so the replacement is a single row update and
+    concurrent requests for one address leave exactly one code behind.
+    Returns:
+        str: The code to send to the user.
+    """
+    sweep_if_due()
+    digest = email_digest(email)
+    code = ''.join(secrets.choice(string.digits) for _ in range(settings.FORGOT_PASSWORD_CODE_MAX_LENGTH))
+    PasswordResetCode.objects.update_or_create(
+        email_digest=digest,
+        defaults={
+            'code_hash': code_hash(digest, code),
+            'expires_at': now() + timedelta(minutes=settings.FORGOT_PASSWORD_CODE_EXPIRATION_MINUTES),
+            'attempts': 0,
+            'created_at': now(),
+        },
+    )
+    return code
+
+
+def check_reset_code(email, code, consume=False):
+    """
+    Checks a reset code. The comparison is constant-time, and every guess
+    counts towards FORGOT_PASSWORD_MAX_ATTEMPTS.
+
+    The attempt is counted with a conditional UPDATE before the code is
+    compared, so concurrent guesses can't all pass the attempts check before
+    any of them is recorded. A correct code gives its attempt back, so the
+    check and change-password steps of one reset don't use up the budget.
+    Args:
+        email (str): The address the code was sent to.
+        code (str): The code provided by the user.
+        consume (bool): Delete the code if it is valid, so it can be used once (optional, default=False).
+    Returns:
+        str: CODE_VALID, CODE_INVALID, CODE_EXPIRED or CODE_LOCKED.
+    """
+    digest = email_digest(email)
+    reset_code = PasswordResetCode.objects.filter(email_digest=digest).first()
+    if reset_code is None:
+        return CODE_INVALID
+    if reset_code.expires_at <= now():
+        reset_code.delete()
+        return CODE_EXPIRED
+
+    counted = PasswordResetCode.objects.filter(
+        pk=reset_code.pk, attempts__lt=settings.FORGOT_PASSWORD_MAX_ATTEMPTS
+    ).update(attempts=F('attempts') + 1)
+    if not counted:
+        # Out of attempts, or consumed by a concurrent request
+        return CODE_LOCKED
+
+    if not hmac.compare_digest(reset_code.code_hash, code_hash(digest, str(code))):
+        return CODE_INVALID
+
+    if consume:
+        # Only one of several concurrent requests with the right code gets to delete it
+        deleted, _ = PasswordResetCode.objects.filter(pk=reset_code.pk).delete()
+        if not deleted:
+            return CODE_INVALID
+    else:
+        PasswordResetCode.objects.filter(pk=reset_code.pk).update(attempts=F('attempts') - 1)
+    return CODE_VALID
+
+
+def sweep_if_due():
+    global _swept_at
+    if time.monotonic() - _swept_at < settings.FORGOT_PASSWORD_SWEEP_SECONDS:
+        return
+    _swept_at = time.monotonic()
+    try:
+        sweep_expired_reset_codes()
+    except Exception as e:
+        logger.error(f'Password reset code sweep failed: {e}')
+
+
+def sweep_expired_reset_codes():
+    """
+    Deletes expired reset codes.
+    Returns:
+        int: Number of codes deleted.
+    """
+    deleted, _ = PasswordResetCode.objects.filter(expires_at__lte=now()).delete()
+    if deleted:
+        logger.info(f'Swept {deleted} expired password reset codes')
+    return deleted
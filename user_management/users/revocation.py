@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from django.conf import settings
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    """
+    Denylist of refresh token jtis.
+
+    Lookups are served from an in-memory dict of jti -> expiry and never touch
+    the database. The RevokedToken table is the source of truth across workers.
+    Revocations made by other workers are pulled into memory at most every
+    REVOCATION_SYNC_SECONDS. Entries past their expiry are dropped from memory
+    and from the table every REVOCATION_PRUNE_SECONDS.
+    """
+
+    # Overlap between incremental syncs so rows committed slightly out of order aren't missed
+    SYNC_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._revoked = {}
+        self._loaded = False
+        self._high_water = None
+        self._synced_at = 0.0
+        self._pruned_at = 0.0
+
+    def revoke(self, jti, exp):
+        """
+        Revokes a token until its expiry.
+        Args:
+            jti (str): The token's jti claim.
+            exp (int): The token's exp claim (epoch seconds).
+        Returns:
+            bool: False if the token had already been revoked.
+        """
+        _, created = RevokedToken.objects.get_or_create(
+            jti=jti, defaults={'expires_at': datetime.fromtimestamp(exp, tz=timezone.utc)}
+        )
+        with self._lock:
+            self._revoked[jti] = exp
+        return created
+
+    def is_revoked(self, jti):
+        if not jti:
+            return False
+        self._sync_if_due()
+        exp = self._revoked.get(jti)
+        return exp is not None and exp > time.time()
+
+    def _sync_if_due(self):
+        now = time.monotonic()
+        if self._loaded and now - self._synced_at < settings.REVOCATION_SYNC_SECONDS:
+            return
+        # The first load blocks so no request is answered from an empty denylist
+        if not self._sync_lock.acquire(blocking=not self._loaded):
+            return
+        try:
+            self.sync()
+            if now - self._pruned_at >= settings.REVOCATION_PRUNE_SECONDS:
+                self.prune()
+        except Exception as e:
+            logger.error(f'Refresh token denylist sync failed: {e}')
+            self._synced_at = time.monotonic()
+        finally:
+            self._sync_lock.release()
+
+    def sync(self):
+        """
+        Loads revocations made since the last sync (all live ones on first use).
+        """
+        rows = RevokedToken.objects.filter(expires_at__gt=datetime.now(timezone.utc))
+        if self._high_water is not None:
+            rows = rows.filter(revoked_at__gte=self._high_water - self.SYNC_OVERLAP)
+
+        loaded = {}
+        high_water = self._high_water
+        for jti, expires_at, revoked_at in rows.values_list('jti', 'expires_at', 'revoked_at').iterator():
+            loaded[jti] = int(expires_at.timestamp())
+            if high_water is None or revoked_at > high_water:
+                high_water = revoked_at
+
+        with self._lock:
+            self._revoked.update(loaded)
+        self._high_water = high_water
+        self._loaded = True
+        self._synced_at = time.monotonic()
+
+    def prune(self):
+        """
+        Drops expired revocations from memory and from the table.
+        """
+        now = time.time()
+        with self._lock:
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        deleted, _ = RevokedToken.objects.filter(expires_at__lte=datetime.now(timezone.utc)).delete()
+        self._pruned_at = time.monotonic()
+        if deleted:
+            logger.info(f'Pruned {deleted} expired refresh token revocations')
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+revocation_store = RevocationStore()
@@ -0,0 +1,65 @@
+import base64
+import binascii
+import json
+from django.db import connection
+from .models import User
+
+
+def encode_cursor(username):
+    """
+    Encodes the last username of a page into an opaque cursor.
+    """
+    return base64.urlsafe_b64encode(username.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by encode_cursor.
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def search_usernames(query, limit, cursor=None):
+    """
+    Returns one page of usernames containing query, ordered by username.
+    The substring match is served by the users_username_upper_trgm GIN index and
+    pages are keyset-paginated on the unique username, so every page costs the
+    same regardless of how deep it is.
+    Args:
+        query (str): The search term.
+        limit (int): Maximum number of usernames to return.
+        cursor (str): Cursor returned with the previous page (optional).
+    Returns:
+        tuple: (list of usernames, cursor for the next page or None).
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    matching_users = User.objects.filter(username__icontains=query)
+    if cursor:
+        matching_users = matching_users.filter(username__gt=decode_cursor(cursor))
+
+    # Fetch one extra row to know whether another page exists
+    usernames = list(matching_users.order_by('username').values_list('username', flat=True)[:limit + 1])
+    next_cursor = encode_cursor(usernames[limit - 1]) if len(usernames) > limit else None
+    return usernames[:limit], next_cursor
+
+
+def estimate_total(query):
+    """
+    Returns the planner's row estimate for a search instead of an exact count.
+    Falls back to an exact count on databases other than PostgreSQL.
+    """
+    matching_users = User.objects.filter(username__icontains=query)
+    if connection.vendor != 'postgresql':
+        return matching_users.count()
+
+    plan = json.loads(matching_users.explain(format='json'))
+    if isinstance(plan, list):
+        plan = plan[0]
+    return int(plan['Plan']['Plan Rows'])
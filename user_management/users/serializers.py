@@ -10,9 +10,15 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {'password': {'write_only': True}}
 
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password']
+        """
+        Raises:
+            HashingBusy: If the password hashing pool is saturated.
+        """
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data['email']),
         )
+        # Hashed on the hashing pool by User.save rather than on the request thread
+        user.password = validated_data['password']
+        user.save()
         return user
@@ -0,0 +1,49 @@
+"""
+Keeps the per-process indexes and the shared caches in step with User and Token changes.
+
+Connected from UsersConfig.ready(), so this module is imported at boot. The
+modules the handlers use (DRF authentication, fastjson and its DRF renderers,
+the indexes) are imported on the first save or delete instead.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def track_saved_user(sender, instance, update_fields=None, **kwargs):
+    from .authentication import invalidate_user_tokens
+    from .autocomplete import username_index
+    from .availability import availability_filter
+    from .profile import invalidate_profile
+
+    availability_filter.user_saved(instance)
+    pk, username = instance.pk, instance.username
+    # Invalidations run after commit, so a concurrent request can't re-cache the old row
+    if not instance.is_active and (update_fields is None or 'is_active' in update_fields):
+        transaction.on_commit(lambda: invalidate_user_tokens(pk))
+    transaction.on_commit(lambda: invalidate_profile(pk))
+    transaction.on_commit(lambda: username_index.user_saved(pk, username))
+
+
+@receiver(post_delete, sender=User)
+def track_deleted_user(sender, instance, **kwargs):
+    from .autocomplete import username_index
+    from .availability import availability_filter
+    from .profile import invalidate_profile
+
+    availability_filter.user_deleted(instance)
+    # The user's token is deleted by the cascade, which evicts it through evict_deleted_token
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_profile(pk))
+    transaction.on_commit(lambda: username_index.user_deleted(pk))
+
+
+# Referenced by label so the Token model isn't imported here
+@receiver(post_delete, sender='authtoken.Token')
+def evict_deleted_token(sender, instance, **kwargs):
+    from .authentication import invalidate_token
+
+    key = instance.key
+    transaction.on_commit(lambda: invalidate_token(key))
@@ -0,0 +1,49 @@
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from users.activity import ActivityBuffer
+from users.models import User
+
+
+class ActivityBufferTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username='alice', email='alice@example.com')
+        self.bob = User.objects.create(username='bob', email='bob@example.com')
+        self.buffer = ActivityBuffer()
+        patcher = mock.patch.object(ActivityBuffer, '_ensure_started')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def last_activity(self, user):
+        user.refresh_from_db(fields=['last_activity'])
+        return user.last_activity
+
+    def test_keeps_the_latest_timestamp_per_user(self):
+        earlier, later = now() - timedelta(minutes=1), now()
+        self.buffer.record(self.alice.pk, later)
+        self.buffer.record(self.alice.pk, earlier)
+        self.buffer.record(self.bob.pk, earlier)
+        self.assertEqual(len(self.buffer), 2)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.last_activity(self.alice), later)
+        self.assertEqual(self.last_activity(self.bob), earlier)
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_failed_flush_keeps_the_timestamps(self):
+        timestamp = now()
+        self.buffer.record(self.alice.pk, timestamp)
+        with mock.patch('users.models.User.objects.bulk_update', side_effect=OSError('db down')), \
+                self.assertLogs('users.activity', 'ERROR'):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.failed_flushes, 1)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.last_activity(self.alice), timestamp)
+
+    @override_settings(LAST_ACTIVITY_MODE='buffered')
+    def test_update_last_activity_is_buffered(self):
+        with mock.patch('users.activity.activity_buffer', self.buffer), self.assertNumQueries(0):
+            self.alice.update_last_activity()
+        self.assertEqual(len(self.buffer), 1)
@@ -0,0 +1,79 @@
+from unittest import mock
+from django.contrib.auth.hashers import PBKDF2SHA1PasswordHasher
+from django.contrib.auth.signals import user_login_failed
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from users.hashing import HashingBusy, HashingService
+from users.models import User
+from users.views.auth import LoginView, RegisterView
+
+
+@override_settings(AUTHENTICATION_BACKENDS=['users.backends.HashingPoolModelBackend'])
+class LoginViewTests(TestCase):
+    def setUp(self):
+        self.user = User(username='alice', email='alice@example.com')
+        self.user.set_password('correct-horse')
+        self.user.save()
+
+    def login(self, password):
+        request = APIRequestFactory().post('/api/users/login/', {'username': 'alice', 'password': password}, format='json')
+        return LoginView.as_view()(request)
+
+    def test_valid_credentials_return_token(self):
+        response = self.login('correct-horse')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('token', response.data)
+
+    def test_wrong_password_sends_user_login_failed(self):
+        failures = []
+        handler = lambda sender, credentials, **kwargs: failures.append(credentials['username'])  # noqa: E731
+        user_login_failed.connect(handler)
+        self.addCleanup(user_login_failed.disconnect, handler)
+        self.assertEqual(self.login('wrong').status_code, 400)
+        self.assertEqual(failures, ['alice'])
+
+    def test_inactive_user_is_rejected(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.login('correct-horse').status_code, 400)
+
+    # Hash in-process: worker processes don't see the overridden PASSWORD_HASHERS
+    @override_settings(PASSWORD_HASHING_WORKERS=0, PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ])
+    def test_outdated_hash_is_upgraded(self):
+        encoded = PBKDF2SHA1PasswordHasher().encode('correct-horse', 'salt', iterations=1)
+        User.objects.filter(pk=self.user.pk).update(password=encoded)
+        self.assertEqual(self.login('correct-horse').status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('md5$'))
+        self.assertTrue(self.user.check_password('correct-horse'))
+
+    def test_busy_pool_returns_503(self):
+        with mock.patch('users.backends.hashing_service.check_password', side_effect=HashingBusy):
+            self.assertEqual(self.login('correct-horse').status_code, 503)
+
+
+class RegisterViewTests(TestCase):
+    def register(self):
+        data = {'username': 'bob', 'email': 'bob@example.com', 'password': 'correct-horse'}
+        return RegisterView.as_view()(APIRequestFactory().post('/api/users/register/', data, format='json'))
+
+    def test_password_is_hashed_once(self):
+        self.assertEqual(self.register().status_code, 201)
+        self.assertTrue(User.objects.get(username='bob').check_password('correct-horse'))
+
+    def test_busy_pool_returns_503(self):
+        with mock.patch('users.hashing.hashing_service.make_password', side_effect=HashingBusy):
+            self.assertEqual(self.register().status_code, 503)
+        self.assertFalse(User.objects.filter(username='bob').exists())
+
+
+@override_settings(PASSWORD_HASHING_WORKERS=1)
+class HashingServiceTests(TestCase):
+    def test_hashes_on_spawned_workers(self):
+        service = HashingService()
+        self.addCleanup(lambda: service._executor.shutdown(wait=True))
+        encoded = service.make_password('correct-horse')
+        self.assertEqual(service._executor._mp_context.get_start_method(), 'spawn')
+        self.assertTrue(service.check_password('correct-horse', encoded))
@@ -0,0 +1,102 @@
+import os
+import tempfile
+from unittest import mock
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from users.authentication import CachedTokenAuthentication, invalidate_token, token_cache_key, token_cache_stats
+from users.caching import BoundedTTLCache, InvalidationTable
+from users.models import User
+
+
+class SharedInvalidationTestCase(TestCase):
+    """
+    Gives each test fresh per-process caches and an invalidation table in a
+    temporary file. other_worker() maps the same file, standing in for another
+    worker on the host.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.table_path = os.path.join(directory.name, 'invalidation')
+        for target, value in (
+            ('users.caching._invalidation_table', InvalidationTable(1024, self.table_path)),
+            ('users.authentication._token_cache', BoundedTTLCache(100)),
+            ('users.profile._profile_cache', BoundedTTLCache(100)),
+        ):
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def other_worker(self):
+        return InvalidationTable(1024, self.table_path)
+
+
+@override_settings(TOKEN_AUTH_CACHE_SECONDS=60)
+class CachedTokenAuthenticationTests(SharedInvalidationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='alice', email='alice@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.authentication = CachedTokenAuthentication()
+
+    def test_repeat_lookups_cost_no_query(self):
+        user, _ = self.authentication.authenticate_credentials(self.token.key)
+        self.assertEqual(user.pk, self.user.pk)
+        hits = token_cache_stats()['hits']
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+        self.assertEqual((user.pk, user.username, token.user_id), (self.user.pk, 'alice', self.user.pk))
+        self.assertEqual(token_cache_stats()['hits'], hits + 1)
+        self.assertEqual(token_cache_stats()['size'], 1)
+
+    def test_invalidation_by_another_worker_is_seen(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        self.other_worker().invalidate(token_cache_key(self.token.key))
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_deactivating_user_evicts_token(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save(update_fields=['is_active'])
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_unrelated_saves_of_inactive_user_leave_the_cache_alone(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(1):
+            self.user.save(update_fields=['last_login'])
+
+    def test_deleting_token_evicts_it(self):
+        key = self.token.key
+        self.authentication.authenticate_credentials(key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(key)
+
+    def test_deleting_user_evicts_token(self):
+        key = self.token.key
+        self.authentication.authenticate_credentials(key)
+        generation = self.other_worker().generation(token_cache_key(key))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertNotEqual(self.other_worker().generation(token_cache_key(key)), generation)
+
+    def test_invalidation_racing_the_lookup_is_not_missed(self):
+        # The token is deleted after this worker read the generation but before it cached the row
+        real_select_related = Token.objects.select_related
+
+        def select_related(*args, **kwargs):
+            invalidate_token(self.token.key)
+            return real_select_related(*args, **kwargs)
+
+        with mock.patch.object(Token.objects, 'select_related', select_related):
+            self.authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
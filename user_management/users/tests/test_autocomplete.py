@@ -0,0 +1,65 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from users.autocomplete import UsernamePrefixIndex, autocomplete_usernames
+from user_management.fastjson import loads
+from users.models import User
+from users.tests.test_middleware import JWTClientTestCase
+
+
+@override_settings(AUTOCOMPLETE_INDEX_ENABLED=True)
+class UsernamePrefixIndexTests(TestCase):
+    def setUp(self):
+        User.objects.create(username='Alice', email='alice@example.com')
+        self.index = UsernamePrefixIndex()
+
+    def test_background_sync_closes_its_connection(self):
+        with mock.patch('users.autocomplete.connections') as connections:
+            self.index._sync_in_background()
+        connections.close_all.assert_called_once_with()
+        self.assertTrue(self.index.is_built)
+
+    def test_lookup_schedules_sync_instead_of_running_it(self):
+        with mock.patch.object(UsernamePrefixIndex, 'schedule_sync') as schedule_sync, self.assertNumQueries(0):
+            self.assertIsNone(self.index.lookup('al', 10))
+        schedule_sync.assert_called_once_with()
+
+    def test_schedule_sync_starts_one_thread(self):
+        with mock.patch('users.autocomplete.threading.Thread') as thread:
+            thread.return_value.is_alive.return_value = True
+            self.index.schedule_sync()
+            self.index.schedule_sync()
+        thread.return_value.start.assert_called_once_with()
+
+    def test_index_and_database_match_the_same_usernames(self):
+        User.objects.create(username='straße', email='strasse@example.com')
+        User.objects.create(username='Strasse', email='strasse2@example.com')
+        User.objects.create(username='alfred', email='alfred@example.com')
+        self.index.sync()
+        for prefix in ('al', 'AL', 'STRA', 'straß', 'strass'):
+            with self.subTest(prefix=prefix):
+                with mock.patch.object(UsernamePrefixIndex, 'schedule_sync'):
+                    from_index = self.index.lookup(prefix, 10)
+                with override_settings(AUTOCOMPLETE_INDEX_ENABLED=False):
+                    from_database, source = autocomplete_usernames(prefix, 10)
+                self.assertEqual(source, 'database')
+                self.assertEqual(sorted(from_index), sorted(from_database))
+
+
+@override_settings(AUTOCOMPLETE_INDEX_ENABLED=False)
+class AutocompleteUsernameViewTests(JWTClientTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='Alice', email='alice@example.com')
+        User.objects.create(username='alfred', email='alfred@example.com')
+        User.objects.create(username='bob', email='bob@example.com')
+
+    def autocomplete(self, params, **headers):
+        response = self.client.get('/api/users/autocomplete-username/', params, **headers)
+        return response.status_code, loads(response.content)
+
+    def test_requires_an_access_token(self):
+        self.assertEqual(self.autocomplete({'prefix': 'al'})[0], 401)
+
+    def test_returns_matching_usernames(self):
+        status, body = self.autocomplete({'prefix': 'AL', 'limit': 5}, **self.bearer(self.user))
+        self.assertEqual((status, body['usernames'], body['source']), (200, ['alfred', 'Alice'], 'database'))
+        self.assertEqual(self.autocomplete({'prefix': ''}, **self.bearer(self.user))[0], 400)
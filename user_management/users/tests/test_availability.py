@@ -0,0 +1,77 @@
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from users.availability import AvailabilityFilter, aresolve_availability
+from users.casing import upper_key
+from users.models import User
+
+
+@override_settings(AVAILABILITY_FILTER_ENABLED=True, AVAILABILITY_FILTER_CAPACITY=1000)
+class AvailabilityFilterTests(TestCase):
+    def setUp(self):
+        User.objects.create(username='Alice', email='alice@example.com')
+        self.filter = AvailabilityFilter()
+
+    def test_lookup_schedules_sync_instead_of_running_it(self):
+        with mock.patch.object(AvailabilityFilter, 'schedule_sync') as schedule_sync, self.assertNumQueries(0):
+            self.assertTrue(self.filter.might_contain_username('bob'))
+        schedule_sync.assert_called_once_with()
+
+    def test_old_filters_answer_while_sync_is_due(self):
+        self.filter.sync()
+        User.objects.create(username='Bob', email='bob@example.com')
+        with override_settings(AVAILABILITY_FILTER_SYNC_SECONDS=0), \
+                mock.patch.object(AvailabilityFilter, 'schedule_sync'), self.assertNumQueries(0):
+            self.assertTrue(self.filter.might_contain_username('alice'))
+            self.assertFalse(self.filter.might_contain_username('bob'))
+
+    def test_schedule_sync_starts_one_thread(self):
+        with mock.patch('users.availability.threading.Thread') as thread:
+            thread.return_value.is_alive.return_value = True
+            self.filter.schedule_sync()
+            self.filter.schedule_sync()
+        thread.return_value.start.assert_called_once_with()
+
+    def test_schedule_sync_does_nothing_when_not_due(self):
+        self.filter.sync()
+        with mock.patch('users.availability.threading.Thread') as thread:
+            self.filter.schedule_sync()
+        thread.assert_not_called()
+
+
+class UpperKeyTests(TestCase):
+    def test_matches_per_character_upper(self):
+        self.assertEqual(upper_key('Alice'), 'ALICE')
+        # str.upper() would give 'STRASSE'; UPPER() leaves 'ß' alone
+        self.assertEqual(upper_key('straße'), 'STRAßE')
+        self.assertEqual(upper_key('ﬁx'), 'ﬁX')
+
+    @override_settings(AVAILABILITY_FILTER_ENABLED=True, AVAILABILITY_FILTER_CAPACITY=1000)
+    def test_filter_is_keyed_like_the_database(self):
+        User.objects.create(username='straße', email='strasse@example.com')
+        availability_filter = AvailabilityFilter()
+        availability_filter.sync()
+        with mock.patch.object(AvailabilityFilter, 'schedule_sync'):
+            self.assertTrue(availability_filter.might_contain_username('STRAßE'))
+            # Taken by casefold() ('strasse'), but UPPER() doesn't match it either
+            self.assertFalse(availability_filter.might_contain_username('STRASSE'))
+
+
+class ResolveAvailabilityTests(TestCase):
+    def test_taken_values_match_case_insensitively(self):
+        User.objects.create(username='Alice', email='Alice@Example.com')
+        with mock.patch('users.availability.suggest_usernames', return_value=['alice1']), \
+                mock.patch.object(AvailabilityFilter, 'schedule_sync'):
+            usernames, emails = async_to_sync(aresolve_availability)(['alice', 'bob'], ['alice@example.com'])
+        self.assertEqual(usernames, {'alice': {'taken': True, 'suggestions': ['alice1']}, 'bob': {'taken': False}})
+        self.assertEqual(emails, {'alice@example.com': {'taken': True}})
+
+    def test_database_casing_decides(self):
+        # SQLite's UPPER(), like PostgreSQL's under the C collation, only maps ASCII,
+        # so comparing it against upper_key() would call 'élan' free
+        User.objects.create(username='élan', email='élan@example.com')
+        with mock.patch('users.availability.suggest_usernames', return_value=[]), \
+                mock.patch.object(AvailabilityFilter, 'schedule_sync'):
+            usernames, emails = async_to_sync(aresolve_availability)(['élan', 'ÉLAN'], ['élan@EXAMPLE.com'])
+        self.assertEqual(usernames, {'élan': {'taken': True, 'suggestions': []}, 'ÉLAN': {'taken': False}})
+        self.assertEqual(emails, {'élan@EXAMPLE.com': {'taken': True}})
@@ -0,0 +1,50 @@
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from user_management.fastjson import loads
+from users.availability import AvailabilityFilter
+from users.models import User
+from users.views.availability import AvailabilityView, IsEmailTakenView, IsUsernameTakenView
+
+
+@override_settings(AVAILABILITY_FILTER_ENABLED=False)
+class AvailabilityViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(mock.patch('users.ratelimit.rate_limit_engine.is_allowed', return_value=True))
+        cls.enterClassContext(mock.patch.object(AvailabilityFilter, 'schedule_sync'))
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        User.objects.create(username='Alice', email='alice@example.com')
+
+    def call(self, view, request):
+        response = async_to_sync(view.as_view())(request)
+        return response.status_code, loads(response.content)
+
+    def test_username_taken_is_case_insensitive(self):
+        self.assertEqual(self.call(IsUsernameTakenView, self.factory.get('/', {'username': 'ALICE'})), (200, {'taken': True}))
+        self.assertEqual(self.call(IsUsernameTakenView, self.factory.get('/', {'username': 'bob'})), (200, {'taken': False}))
+        self.assertEqual(self.call(IsUsernameTakenView, self.factory.get('/', {'username': 'al'}))[0], 400)
+
+    def test_email_taken(self):
+        self.assertEqual(self.call(IsEmailTakenView, self.factory.get('/', {'email': 'Alice@example.com'})), (200, {'taken': True}))
+        self.assertEqual(self.call(IsEmailTakenView, self.factory.get('/', {'email': 'not-an-email'}))[0], 400)
+
+    def test_batch_answers_every_value(self):
+        request = self.factory.post(
+            '/', {'usernames': ['alice', 'x'], 'emails': ['bob@example.com']}, content_type='application/json',
+        )
+        status, body = self.call(AvailabilityView, request)
+        self.assertEqual(status, 200)
+        self.assertTrue(body['usernames']['alice']['taken'])
+        self.assertEqual(len(body['usernames']['alice']['suggestions']), 3)
+        self.assertEqual(body['usernames']['x'], {'error': 'Username too short'})
+        self.assertEqual(body['emails'], {'bob@example.com': {'taken': False}})
+
+    def test_batch_rejects_bodies_that_are_not_json(self):
+        for body in (b'{', b'\xff'):
+            with self.subTest(body=body):
+                request = self.factory.post('/', body, content_type='application/json')
+                self.assertEqual(self.call(AvailabilityView, request)[0], 400)
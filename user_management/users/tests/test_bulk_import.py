@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+from unittest import mock
+from django.test import TestCase
+from users.bulk_import import Checkpoint, copy_value, import_users
+from users.models import User
+
+
+class ImportUsersTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'users.jsonl')
+
+    def write(self, *records):
+        with open(self.path, 'w') as f:
+            f.writelines(json.dumps(record) + '\n' for record in records)
+
+    def test_imports_new_users_and_skips_duplicates_and_invalid_records(self):
+        User.objects.create(username='taken', email='taken@example.com')
+        self.write(
+            {'username': 'alice', 'email': 'alice@example.com', 'password': 'correct-horse', 'email_verified': 'yes'},
+            {'username': 'taken', 'email': 'other@example.com', 'password': 'correct-horse'},
+            {'username': '', 'email': 'nobody@example.com'},
+            {'username': 'bob', 'email': 'bob@example.com', 'password_hash': 'md5$salt$hash'},
+        )
+        with self.assertLogs('users.bulk_import', 'INFO'):
+            checkpoint = import_users(self.path, batch_size=2, workers=0)
+
+        self.assertEqual((checkpoint.records, checkpoint.inserted, checkpoint.skipped), (4, 2, 2))
+        alice = User.objects.get(username='alice')
+        self.assertTrue(alice.check_password('correct-horse'))
+        self.assertTrue(alice.email_verified)
+        self.assertEqual(User.objects.get(username='bob').password, 'md5$salt$hash')
+        self.assertFalse(os.path.exists(f'{self.path}.checkpoint.json'))
+
+    def test_resumes_after_the_last_committed_batch(self):
+        self.write(*({'username': f'user{i}', 'email': f'user{i}@example.com'} for i in range(4)))
+        checkpoint = Checkpoint(f'{self.path}.checkpoint.json', self.path)
+        checkpoint.records = 2
+        checkpoint.save()
+
+        with self.assertLogs('users.bulk_import', 'INFO'):
+            checkpoint = import_users(self.path, batch_size=2, workers=0)
+        self.assertEqual(checkpoint.records, 4)
+        self.assertEqual(sorted(User.objects.values_list('username', flat=True)), ['user2', 'user3'])
+
+    def test_failed_batch_keeps_the_checkpoint(self):
+        self.write(*({'username': f'user{i}', 'email': f'user{i}@example.com'} for i in range(4)))
+        writes = []
+
+        def write(importer, users):
+            if writes:
+                raise OSError('db down')
+            writes.append(users)
+            return len(users)
+
+        with mock.patch('users.bulk_import.UserImporter.write', write), \
+                self.assertLogs('users.bulk_import', 'INFO'), self.assertRaises(OSError):
+            import_users(self.path, batch_size=2, workers=0)
+        checkpoint = Checkpoint(f'{self.path}.checkpoint.json', self.path)
+        self.assertTrue(checkpoint.load())
+        self.assertEqual(checkpoint.records, 2)
+
+    def test_copy_value_escapes_text_format(self):
+        self.assertEqual(copy_value(None), '\\N')
+        self.assertEqual(copy_value(True), 't')
+        self.assertEqual(copy_value('a\tb\nc\\'), 'a\\tb\\nc\\\\')
@@ -0,0 +1,23 @@
+from django.test import SimpleTestCase, override_settings
+from users.checks import check_invalidation_table, check_shared_cache
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_per_process_cache_is_an_error(self):
+        for backend in ('django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache'):
+            with self.subTest(backend=backend), override_settings(CACHES={'default': {'BACKEND': backend}}):
+                self.assertEqual([error.id for error in check_shared_cache(None)], ['users.E001'])
+
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+
+class InvalidationTableCheckTests(SimpleTestCase):
+    def test_missing_directory_is_an_error(self):
+        for path in ('', '/nonexistent-directory/table'):
+            with self.subTest(path=path), override_settings(CACHE_INVALIDATION_SHARED_PATH=path):
+                self.assertEqual([error.id for error in check_invalidation_table(None)], ['users.E002'])
+
+    def test_existing_directory_passes(self):
+        with override_settings(CACHE_INVALIDATION_SHARED_PATH='/tmp/table'):
+            self.assertEqual(check_invalidation_table(None), [])
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from rest_framework.test import APIRequestFactory
+from users.export import claim_export_jobs, delete_expired_exports, process_export_jobs, run_export_job
+from users.models import DataExportJob, User
+from users.views.export import DataExportDownloadView, DataExportStatusView, UserDataExportView
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(
+            DATA_EXPORT_ROOT=self.root, DATA_EXPORT_LEASE_SECONDS=60, DATA_EXPORT_MAX_ATTEMPTS=2
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create(username='alice', email='alice@example.com')
+
+
+class ExportJobTests(ExportTestCase):
+    def test_processes_pending_job(self):
+        job = DataExportJob.objects.create(user=self.user)
+        self.assertEqual(process_export_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, DataExportJob.STATUS_DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertTrue(os.path.exists(job.archive_path))
+        self.assertEqual(os.listdir(self.root), [os.path.basename(job.archive_path)])
+
+    def test_running_job_is_not_reclaimed_within_lease(self):
+        DataExportJob.objects.create(user=self.user)
+        self.assertEqual(len(claim_export_jobs(10)), 1)
+        self.assertEqual(claim_export_jobs(10), [])
+
+    def test_abandoned_job_is_reclaimed_after_lease(self):
+        job = DataExportJob.objects.create(
+            user=self.user, status=DataExportJob.STATUS_RUNNING, attempts=1, started_at=now() - timedelta(seconds=61)
+        )
+        with self.assertLogs('users.export', 'WARNING'):
+            [claimed] = claim_export_jobs(10)
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.attempts, 2)
+        self.assertGreater(claimed.started_at, job.started_at)
+
+    def test_abandoned_job_fails_after_max_attempts(self):
+        job = DataExportJob.objects.create(
+            user=self.user, status=DataExportJob.STATUS_RUNNING, attempts=2, started_at=now() - timedelta(seconds=61)
+        )
+        with self.assertLogs('users.export', 'ERROR'):
+            self.assertEqual(claim_export_jobs(10), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, DataExportJob.STATUS_FAILED)
+
+    def test_worker_that_lost_its_lease_does_not_finish_the_job(self):
+        DataExportJob.objects.create(user=self.user)
+        [job] = claim_export_jobs(10)
+        # Another worker reclaims the job while this one is still writing
+        DataExportJob.objects.filter(pk=job.pk).update(started_at=now() + timedelta(seconds=1))
+        with self.assertLogs('users.export', 'WARNING'):
+            self.assertFalse(run_export_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, DataExportJob.STATUS_RUNNING)
+
+    def test_expired_archives_are_deleted(self):
+        DataExportJob.objects.create(user=self.user)
+        process_export_jobs()
+        job = DataExportJob.objects.get()
+        with override_settings(DATA_EXPORT_RETENTION_DAYS=1):
+            self.assertEqual(delete_expired_exports(), 0)
+            DataExportJob.objects.filter(pk=job.pk).update(finished_at=now() - timedelta(days=2))
+            self.assertEqual(delete_expired_exports(), 1)
+        self.assertFalse(os.path.exists(job.archive_path))
+        job.refresh_from_db()
+        self.assertEqual(job.status, DataExportJob.STATUS_EXPIRED)
+
+
+class ExportViewTests(ExportTestCase):
+    def test_anonymous_requests_are_rejected(self):
+        job = DataExportJob.objects.create(user=self.user)
+        factory = APIRequestFactory()
+        for view, kwargs in (
+            (UserDataExportView, {}),
+            (DataExportStatusView, {'job_id': job.id}),
+            (DataExportDownloadView, {'job_id': job.id}),
+        ):
+            response = view.as_view()(factory.get('/api/export/'), **kwargs)
+            self.assertEqual(response.status_code, 401, view.__name__)
@@ -0,0 +1,44 @@
+import importlib
+import sys
+from datetime import date, datetime, timezone
+from unittest import mock
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from user_management import fastjson
+
+PAYLOAD = {
+    'utc': datetime(2024, 5, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+    'naive': datetime(2024, 5, 1, 12, 30, 5, 123456),
+    'date': date(2024, 5, 1),
+}
+
+
+def without_orjson():
+    """
+    Imports a separate copy of fastjson as it is without orjson installed.
+    """
+    with mock.patch.dict(sys.modules, {'orjson': None}):
+        spec = importlib.util.find_spec('user_management.fastjson')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+class FastJSONTests(SimpleTestCase):
+    def test_datetimes_render_like_drf(self):
+        for module in (fastjson, without_orjson()):
+            with self.subTest(orjson=module.orjson is not None):
+                self.assertEqual(fastjson.loads(module.dumps(PAYLOAD)), fastjson.loads(JSONRenderer().render(PAYLOAD)))
+                self.assertEqual(
+                    fastjson.loads(module.JsonResponse(PAYLOAD).content),
+                    fastjson.loads(DjangoJSONEncoder().encode(PAYLOAD)),
+                )
+        self.assertEqual(fastjson.loads(fastjson.FastJSONRenderer().render(PAYLOAD))['utc'], '2024-05-01T12:30:05.123456Z')
+        self.assertEqual(fastjson.loads(fastjson.JsonResponse(PAYLOAD).content)['utc'], '2024-05-01T12:30:05.123Z')
+
+    def test_invalid_input_raises_value_error(self):
+        for module in (fastjson, without_orjson()):
+            for data in (b'{"a": ', b'{"a": "\xff"}'):
+                with self.subTest(orjson=module.orjson is not None, data=data), self.assertRaises(ValueError):
+                    module.loads(data)
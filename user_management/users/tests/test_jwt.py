@@ -0,0 +1,92 @@
+from unittest import mock
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from jwt import ExpiredSignatureError, InvalidTokenError
+from JWTManager import JWTManager
+from users.tests.test_refresh import es256_keys
+
+
+def ed25519_keys():
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+class JWTKeyTests(SimpleTestCase):
+    def keys(self, algorithm, keys):
+        private_pem, public_pem = keys
+        return override_settings(JWT_ALGORITHM=algorithm, ACCESS_PRIVATE_KEY=private_pem, ACCESS_PUBLIC_KEY=public_pem)
+
+    def test_tokens_round_trip_with_each_supported_algorithm(self):
+        for algorithm, keys in (('ES256', es256_keys()), ('EdDSA', ed25519_keys())):
+            with self.subTest(algorithm=algorithm), self.keys(algorithm, keys):
+                token = JWTManager.create_access_token(7)
+                self.assertEqual(JWTManager.decode_token(token)['user_id'], 7)
+
+    def test_keys_are_parsed_once(self):
+        with self.keys('ES256', es256_keys()):
+            self.assertIs(JWTManager.get_signing_key(), JWTManager.get_signing_key())
+            self.assertIs(JWTManager.get_verifying_key(), JWTManager.get_verifying_key())
+
+    def test_unsupported_algorithm_is_refused(self):
+        with self.keys('HS256', es256_keys()), self.assertRaises(ImproperlyConfigured):
+            JWTManager.create_access_token(7)
+
+    def test_token_signed_with_another_key_is_invalid(self):
+        with self.keys('ES256', es256_keys()):
+            token = JWTManager.create_access_token(7)
+        with self.keys('ES256', es256_keys()), self.assertRaises(InvalidTokenError):
+            JWTManager.decode_token(token)
+
+
+class VerifiedTokenCacheTests(SimpleTestCase):
+    def setUp(self):
+        private_pem, public_pem = es256_keys()
+        settings_override = override_settings(
+            JWT_ALGORITHM='ES256', ACCESS_PRIVATE_KEY=private_pem, ACCESS_PUBLIC_KEY=public_pem, ACCESS_TOKEN_CACHE_SIZE=10,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache_patcher = mock.patch('JWTManager._verified_token_cache', None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def test_verified_token_is_not_decoded_again(self):
+        token = JWTManager.create_access_token(7)
+        payload = JWTManager.validate_access_token(token)
+        with mock.patch.object(JWTManager, 'decode_token') as decode_token:
+            self.assertEqual(JWTManager.validate_access_token(token), payload)
+        decode_token.assert_not_called()
+
+    def test_cached_payload_copies_are_independent(self):
+        token = JWTManager.create_access_token(7)
+        JWTManager.validate_access_token(token)['user_id'] = 8
+        self.assertEqual(JWTManager.validate_access_token(token)['user_id'], 7)
+
+    def test_refresh_token_is_not_an_access_token(self):
+        token = JWTManager.create_refresh_token(7)
+        with self.assertRaises(InvalidTokenError):
+            JWTManager.validate_access_token(token)
+        self.assertEqual(len(JWTManager.get_verified_token_cache()), 0)
+
+    def test_expired_token_is_not_served_from_the_cache(self):
+        token = JWTManager.create_access_token(7)
+        expires_at = JWTManager.validate_access_token(token)['exp']
+        with mock.patch('users.caching.time.time', return_value=expires_at + 1), \
+                mock.patch.object(JWTManager, 'decode_token', side_effect=ExpiredSignatureError) as decode_token, \
+                self.assertRaises(ExpiredSignatureError):
+            JWTManager.validate_access_token(token)
+        decode_token.assert_called_once_with(token)
+
+    @override_settings(ACCESS_TOKEN_CACHE_SIZE=0)
+    def test_cache_can_be_disabled(self):
+        self.assertIsNone(JWTManager.get_verified_token_cache())
+        token = JWTManager.create_access_token(7)
+        self.assertEqual(JWTManager.validate_access_token(token)['user_id'], 7)
@@ -0,0 +1,32 @@
+import argparse
+from django.test import SimpleTestCase
+from loadtest import compare, parse_mix, percentile, summarize
+
+
+class LoadTestReportTests(SimpleTestCase):
+    def test_percentiles_use_nearest_rank(self):
+        ordered = [i / 1000 for i in range(1, 101)]
+        self.assertEqual(percentile(ordered, 0.50), 0.05)
+        self.assertEqual(percentile(ordered, 0.99), 0.099)
+        self.assertEqual(percentile([0.2], 0.95), 0.2)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_summary_counts_non_2xx_as_errors(self):
+        summary = summarize([0.01, 0.03, 0.02, 0.04], {200: 3, 503: 1}, elapsed=2)
+        self.assertEqual(summary['requests'], 4)
+        self.assertEqual(summary['error_rate'], 0.25)
+        self.assertEqual(summary['throughput_rps'], 2.0)
+        self.assertEqual(summary['latency_ms']['p50'], 20.0)
+        self.assertEqual(summary['latency_ms']['max'], 40.0)
+
+    def test_compare_reports_relative_change(self):
+        before = {'signin': summarize([0.01, 0.02], {200: 2}, elapsed=1)}
+        after = {'signin': summarize([0.02, 0.04], {200: 2}, elapsed=2)}
+        changes = compare(after, before)['signin']
+        self.assertEqual(changes['p50_ms'], 1.0)
+        self.assertEqual(changes['throughput_rps'], -0.5)
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('signin=1,search-username'), {'signin': 1.0, 'search-username': 1.0})
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_mix('nope=1')
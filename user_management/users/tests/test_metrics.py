@@ -0,0 +1,35 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from user_management.metrics import metrics_view
+
+
+class StaffUser:
+    is_authenticated = True
+    is_staff = True
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_ALLOWED_IPS=('10.0.0.0/8',), METRICS_TOKEN='scrape-secret')
+class MetricsViewTests(SimpleTestCase):
+    def get(self, remote_addr='203.0.113.7', user=None, **headers):
+        request = RequestFactory().get('/metrics', REMOTE_ADDR=remote_addr, **headers)
+        request.user = user or AnonymousUser()
+        return metrics_view(request)
+
+    def test_public_clients_are_refused(self):
+        self.assertEqual(self.get().status_code, 403)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+
+    def test_allowed_network(self):
+        response = self.get(remote_addr='10.1.2.3')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'# TYPE', response.content)
+
+    def test_bearer_token(self):
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer scrape-secret').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_empty_token_never_matches(self):
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer ').status_code, 403)
+
+    def test_staff_user(self):
+        self.assertEqual(self.get(user=StaffUser()).status_code, 200)
@@ -0,0 +1,67 @@
+from unittest import mock
+from django.conf import settings
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.settings import api_settings
+from JWTManager import JWTManager
+from user_management.middleware import get_bearer_token
+from users.authentication import MiddlewareJWTAuthentication
+from users.tests.test_refresh import es256_keys
+
+
+class JWTClientTestCase(TestCase):
+    """
+    Base for request-level tests of /api/ views authenticated by
+    ApiAuthenticationMiddleware. Rate limits are lifted.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        private_pem, public_pem = es256_keys()
+        cls.enterClassContext(override_settings(
+            JWT_ALGORITHM='ES256', ACCESS_PRIVATE_KEY=private_pem, ACCESS_PUBLIC_KEY=public_pem,
+        ))
+        cls.enterClassContext(mock.patch('users.ratelimit.rate_limit_engine.is_allowed', return_value=True))
+
+    @staticmethod
+    def bearer(user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {JWTManager.create_access_token(user.pk)}'}
+
+
+class ApiAuthenticationTests(SimpleTestCase):
+    def bearer_token(self, header):
+        return get_bearer_token(RequestFactory().get('/api/users/protected/', HTTP_AUTHORIZATION=header))
+
+    def test_only_bearer_tokens_are_read(self):
+        self.assertEqual(self.bearer_token('Bearer abc'), 'abc')
+        self.assertIsNone(self.bearer_token('JWT abc'))
+        self.assertIsNone(self.bearer_token('Token abc'))
+        self.assertIsNone(self.bearer_token('Bearer'))
+
+    def test_drf_authenticates_with_the_access_token_only(self):
+        self.assertEqual(api_settings.DEFAULT_AUTHENTICATION_CLASSES, [MiddlewareJWTAuthentication])
+
+
+class MiddlewareStackTests(TestCase):
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+
+    def test_api_requests_skip_session_csrf_and_messages(self):
+        # SigninView isn't csrf_exempt; without the API path it would be refused with a 403
+        response = self.client.post('/api/users/signin/', '{}', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        request = response.wsgi_request
+        self.assertFalse(hasattr(request, 'session'))
+        self.assertFalse(hasattr(request, '_messages'))
+        self.assertFalse(request.user.is_authenticated)
+        self.assertEqual(response.cookies, {})
+
+    def test_admin_keeps_the_full_stack(self):
+        response = self.client.get('/admin/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(hasattr(response.wsgi_request, 'session'))
+        self.assertTrue(hasattr(response.wsgi_request, '_messages'))
+        self.assertIn(settings.CSRF_COOKIE_NAME, response.cookies)
+
+        response = self.client.post('/admin/login/', {'username': 'admin', 'password': 'secret'})
+        self.assertEqual(response.status_code, 403)
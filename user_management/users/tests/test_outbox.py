@@ -0,0 +1,159 @@
+import socket
+import socketserver
+import threading
+from datetime import timedelta
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+from users.models import OutboundEmail
+from users.outbox import claim_batch, drain_outbox, enqueue_email
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP for smtplib: accepts every message except those to
+    addresses in server.rejected, and records the accepted ones.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.reply('220 localhost stand-in')
+        recipients = []
+        while line := self.rfile.readline().decode().strip():
+            command = line.split(' ', 1)[0].upper()
+            if command in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif command == 'MAIL':
+                recipients = []
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                address = line.split(':', 1)[1].strip(' <>')
+                if address in self.server.rejected:
+                    self.reply('550 No such user')
+                else:
+                    recipients.append(address)
+                    self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.received.extend(recipients)
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.rejected = set()
+        self.received = []
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_USE_TLS=False,
+    EMAIL_HOST_USER='',
+    EMAIL_HOST_PASSWORD='',
+    EMAIL_TIMEOUT=5,
+    OUTBOX_MAX_ATTEMPTS=3,
+)
+class DrainOutboxTests(TestCase):
+    def setUp(self):
+        self.server = SMTPStandIn()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        settings_override = override_settings(EMAIL_PORT=self.server.server_address[1])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def enqueue(self, *recipients):
+        return [enqueue_email('Subject', 'Body', [recipient]) for recipient in recipients]
+
+    def test_sends_and_marks_sent(self):
+        self.enqueue('a@example.com', 'b@example.com')
+        self.assertEqual(drain_outbox(), (2, 0))
+        self.assertEqual(sorted(self.server.received), ['a@example.com', 'b@example.com'])
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.STATUS_SENT).exists())
+
+    def test_rejected_message_is_retried_later_and_the_rest_are_sent(self):
+        self.server.rejected.add('bad@example.com')
+        bad, good = self.enqueue('bad@example.com', 'good@example.com')
+        with self.assertLogs('users.outbox', 'WARNING'):
+            self.assertEqual(drain_outbox(), (1, 1))
+
+        bad.refresh_from_db()
+        self.assertEqual(bad.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(bad.attempts, 1)
+        self.assertGreater(bad.next_attempt_at, now())
+        self.assertIn('bad@example.com', bad.last_error)
+        good.refresh_from_db()
+        self.assertEqual(good.status, OutboundEmail.STATUS_SENT)
+
+    def test_connection_error_is_recorded_per_message(self):
+        emails = self.enqueue('a@example.com', 'b@example.com')
+        with override_settings(EMAIL_PORT=unused_port()), self.assertLogs('users.outbox', 'WARNING'):
+            self.assertEqual(drain_outbox(), (0, 2))
+        for email in emails:
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.next_attempt_at, now())
+            self.assertTrue(email.last_error)
+
+    def test_gives_up_after_max_attempts(self):
+        self.server.rejected.add('bad@example.com')
+        [email] = self.enqueue('bad@example.com')
+        OutboundEmail.objects.filter(pk=email.pk).update(attempts=2)
+        with self.assertLogs('users.outbox', 'ERROR'):
+            drain_outbox()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_FAILED)
+        self.assertEqual(email.attempts, 3)
+
+    def test_claimed_emails_are_not_claimed_again_while_sending(self):
+        self.enqueue('a@example.com')
+        claimed_during_send = []
+
+        class Connection:
+            def open(self):
+                pass
+
+            def close(self):
+                pass
+
+            def send_messages(self, messages):
+                claimed_during_send.extend(claim_batch(10))
+                return len(messages)
+
+        self.assertEqual(drain_outbox(connection=Connection()), (1, 0))
+        self.assertEqual(claimed_during_send, [])
+
+    def test_claim_expires_for_emails_left_unsent(self):
+        [email] = self.enqueue('a@example.com')
+        claim_batch(10)
+        self.assertEqual(claim_batch(10), [])
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=now() - timedelta(seconds=1))
+        self.assertEqual([e.pk for e in claim_batch(10)], [email.pk])
+
+    def test_command_survives_a_failed_batch(self):
+        with mock.patch('users.management.commands.drain_outbox.drain_outbox', side_effect=OSError('db down')), \
+                self.assertLogs('users.management.commands.drain_outbox', 'ERROR'):
+            call_command('drain_outbox', '--once')
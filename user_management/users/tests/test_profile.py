@@ -0,0 +1,31 @@
+from user_management.fastjson import loads
+from users.models import User
+from users.profile import get_profile, profile_cache_key
+from users.tests.test_authentication import SharedInvalidationTestCase
+
+
+class ProfileCacheTests(SharedInvalidationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='alice', email='alice@example.com')
+
+    def test_cache_hit_costs_no_query(self):
+        get_profile(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(loads(get_profile(self.user.pk)['body'])['username'], 'alice')
+
+    def test_save_invalidates_the_entry_for_other_workers(self):
+        get_profile(self.user.pk)
+        generation = self.other_worker().generation(profile_cache_key(self.user.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'Ada'
+            self.user.save()
+        self.assertNotEqual(self.other_worker().generation(profile_cache_key(self.user.pk)), generation)
+        self.assertEqual(loads(get_profile(self.user.pk)['body'])['first_name'], 'Ada')
+
+    def test_invalidation_by_another_worker_is_seen(self):
+        get_profile(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(first_name='Ada')
+        self.other_worker().invalidate(profile_cache_key(self.user.pk))
+        with self.assertNumQueries(1):
+            self.assertEqual(loads(get_profile(self.user.pk)['body'])['first_name'], 'Ada')
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from itertools import islice
+from unittest import mock
+from django.test import TestCase
+from django.utils.timezone import now
+from users.models import PurgeCheckpoint, User
+from users.purge import purge_in_chunks
+from users.tests.test_middleware import JWTClientTestCase
+
+
+def inactive_users(cutoff):
+    return User.objects.filter(last_login__lt=cutoff, is_active=True)
+
+
+class PurgeInChunksTests(TestCase):
+    def setUp(self):
+        self.cutoff = now()
+        old = self.cutoff - timedelta(days=1)
+        self.users = [
+            User.objects.create(username=f'user{i}', email=f'user{i}@example.com', last_login=old) for i in range(5)
+        ]
+
+    def test_deletes_candidates_in_chunks(self):
+        reports = purge_in_chunks('test', inactive_users, self.cutoff, chunk_size=2)
+        self.assertEqual([r['rows'] for r in reports], [2, 2, 1])
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(PurgeCheckpoint.objects.exists())
+
+    def test_rows_that_stopped_matching_are_kept_and_not_counted(self):
+        revived = self.users[1]
+
+        def islice_then_revive(ids, count):
+            chunk = list(islice(ids, count))
+            # The user comes back after the candidate ids were read
+            User.objects.filter(pk=revived.pk).update(is_active=False)
+            return iter(chunk)
+
+        with mock.patch('users.purge.islice', islice_then_revive), self.assertLogs('users.purge') as logs:
+            reports = purge_in_chunks('test', inactive_users, self.cutoff, chunk_size=5)
+
+        self.assertEqual(reports[0]['rows'], 4)
+        self.assertIn('Purge test finished: 4 rows deleted', logs.output[-1])
+        self.assertEqual(list(User.objects.values_list('pk', flat=True)), [revived.pk])
+
+    def test_resumes_after_checkpoint(self):
+        PurgeCheckpoint.objects.create(name='test', cutoff=self.cutoff, last_id=self.users[2].pk, deleted=3)
+        reports = purge_in_chunks('test', inactive_users, self.cutoff + timedelta(days=365), chunk_size=10)
+        self.assertEqual(reports[0]['rows'], 2)
+        self.assertEqual(User.objects.count(), 3)
+
+
+class DeleteInactiveUsersViewTests(JWTClientTestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username='admin', email='admin@example.com', is_staff=True, email_verified=True)
+        long_ago = now() - timedelta(days=400)
+        User.objects.create(username='idle', email='idle@example.com', email_verified=True, last_activity=long_ago)
+        User.objects.create(username='pending', email='pending@example.com', date_joined=long_ago)
+        User.objects.create(username='active', email='active@example.com', email_verified=True, last_activity=now())
+
+    def purge(self, **headers):
+        return self.client.delete('/api/users/delete-inactive-users/', **headers)
+
+    def test_requires_a_staff_access_token(self):
+        self.assertEqual(self.purge().status_code, 401)
+        user = User.objects.get(username='active')
+        self.assertEqual(self.purge(**self.bearer(user)).status_code, 403)
+        self.assertEqual(User.objects.count(), 4)
+
+    def test_purges_inactive_and_pending_accounts(self):
+        response = self.purge(**self.bearer(self.admin))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(User.objects.values_list('username', flat=True)), ['active', 'admin'])
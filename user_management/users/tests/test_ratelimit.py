@@ -0,0 +1,53 @@
+import os
+import tempfile
+from unittest import mock
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from user_management.fastjson import JsonResponse
+from users.ratelimit import RateLimitEngine, SlidingWindowLimiter, parse_rate, rate_limited
+
+
+class SlidingWindowLimiterTests(SimpleTestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/m'), (10, 60))
+        self.assertEqual(parse_rate('3/h'), (3, 3600))
+
+    def test_limit_within_a_window(self):
+        limiter = SlidingWindowLimiter(64)
+        self.assertEqual([limiter.hit('a', 3, 60, now=600) for _ in range(4)], [True, True, True, False])
+        self.assertTrue(limiter.hit('b', 3, 60, now=600))
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        limiter = SlidingWindowLimiter(64)
+        for _ in range(4):
+            limiter.hit('a', 4, 60, now=600)
+        # Halfway through the next window half of the previous count still applies
+        self.assertEqual([limiter.hit('a', 4, 60, now=690) for _ in range(3)], [True, True, False])
+        # Two windows later the old counts are gone
+        self.assertTrue(limiter.hit('a', 4, 60, now=780))
+
+    def test_shared_table_is_seen_by_another_limiter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ratelimit')
+            first, second = SlidingWindowLimiter(64, path), SlidingWindowLimiter(64, path)
+            self.assertTrue(first.hit('a', 1, 60, now=600))
+            self.assertFalse(second.hit('a', 1, 60, now=600))
+
+    def test_full_bucket_recycles_a_slot_instead_of_failing(self):
+        limiter = SlidingWindowLimiter(8)
+        self.assertTrue(all(limiter.hit(f'key{i}', 1, 60, now=600) for i in range(20)))
+
+
+@override_settings(RATE_LIMITS={'test': {'key': 'ip', 'rate': '2/m'}}, RATE_LIMIT_SHARED_PATH=None)
+class RateLimitedTests(SimpleTestCase):
+    def test_view_gets_429_over_the_limit(self):
+        engine = RateLimitEngine()
+
+        @rate_limited('test')
+        def view(request):
+            return JsonResponse({'ok': True})
+
+        request = RequestFactory().get('/api/users/', REMOTE_ADDR='10.0.0.1')
+        with mock.patch('users.ratelimit.rate_limit_engine', engine):
+            statuses = [view(request).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+        self.assertEqual(engine.metrics(), {'test': {'allowed': 2, 'blocked': 1}})
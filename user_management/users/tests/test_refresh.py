@@ -0,0 +1,104 @@
+from unittest import mock
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+from JWTManager import JWTManager
+from users.models import User
+from users.views.auth import LogoutView
+from users.views.refresh import RefreshJWT
+
+
+def es256_keys():
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+class RefreshTokenTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        private_pem, public_pem = es256_keys()
+        cls.enterClassContext(override_settings(
+            JWT_ALGORITHM='ES256', ACCESS_PRIVATE_KEY=private_pem, ACCESS_PUBLIC_KEY=public_pem,
+        ))
+        cls.enterClassContext(mock.patch('users.ratelimit.rate_limit_engine.is_allowed', return_value=True))
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create(username='alice', email='alice@example.com')
+
+    def refresh(self, refresh_token):
+        request = self.factory.post('/api/users/refresh/', {'refresh_token': refresh_token}, format='json')
+        return RefreshJWT.as_view()(request)
+
+    def logout(self, refresh_token):
+        token, _ = Token.objects.get_or_create(user=self.user)
+        request = self.factory.post(
+            '/api/users/logout/', {'refresh_token': refresh_token}, format='json',
+            HTTP_AUTHORIZATION=f'Token {token.key}',
+        )
+        return LogoutView.as_view()(request)
+
+
+class RefreshJWTTests(RefreshTokenTestCase):
+    def test_refresh_rotates_the_token(self):
+        refresh_token = JWTManager.create_refresh_token(self.user.pk)
+        response = self.refresh(refresh_token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(JWTManager.validate_access_token(response.data['access_token'])['user_id'], self.user.pk)
+        self.assertEqual(JWTManager.validate_refresh_token(response.data['refresh_token'])['user_id'], self.user.pk)
+
+        # The old refresh token was revoked by the rotation
+        self.assertEqual(self.refresh(refresh_token).status_code, 401)
+        self.assertEqual(self.refresh(response.data['refresh_token']).status_code, 200)
+
+    def test_rotation_refuses_token_revoked_by_another_worker(self):
+        refresh_token = JWTManager.create_refresh_token(self.user.pk)
+        # Another worker's revocation is in the table but not yet in this worker's denylist
+        with mock.patch('users.revocation.revocation_store.is_revoked', return_value=False):
+            JWTManager.revoke_refresh_token(refresh_token)
+            self.assertEqual(self.refresh(refresh_token).status_code, 401)
+
+    def test_invalid_tokens_are_rejected(self):
+        access_token = JWTManager.create_access_token(self.user.pk)
+        for token in ('not-a-jwt', access_token):
+            self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(self.refresh('').status_code, 400)
+
+    def test_inactive_user_is_rejected(self):
+        refresh_token = JWTManager.create_refresh_token(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.refresh(refresh_token).status_code, 401)
+
+
+class LogoutViewTests(RefreshTokenTestCase):
+    def test_logout_revokes_the_refresh_token(self):
+        refresh_token = JWTManager.create_refresh_token(self.user.pk)
+        self.assertEqual(self.logout(refresh_token).status_code, 204)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        self.assertEqual(self.refresh(refresh_token).status_code, 401)
+
+    def test_invalid_refresh_token_is_a_bad_request(self):
+        response = self.logout('not-a-jwt')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Token.objects.filter(user=self.user).exists())
+
+    def test_already_revoked_refresh_token_is_a_bad_request(self):
+        refresh_token = JWTManager.create_refresh_token(self.user.pk)
+        JWTManager.revoke_refresh_token(refresh_token)
+        self.assertEqual(self.logout(refresh_token).status_code, 400)
+
+    def test_refresh_token_of_another_user_is_forbidden(self):
+        other = User.objects.create(username='bob', email='bob@example.com')
+        refresh_token = JWTManager.create_refresh_token(other.pk)
+        self.assertEqual(self.logout(refresh_token).status_code, 403)
+        self.assertTrue(Token.objects.filter(user=self.user).exists())
+        self.assertEqual(JWTManager.validate_refresh_token(refresh_token)['user_id'], other.pk)
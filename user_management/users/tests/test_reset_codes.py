@@ -0,0 +1,84 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from user_management.fastjson import dumps, loads
+from users.models import OutboundEmail, PasswordResetCode, User
+from users.reset_codes import (
+    CODE_INVALID, CODE_LOCKED, CODE_VALID, check_reset_code, issue_reset_code,
+)
+
+EMAIL = 'alice@example.com'
+
+
+@override_settings(FORGOT_PASSWORD_MAX_ATTEMPTS=3)
+class CheckResetCodeTests(TestCase):
+    def setUp(self):
+        self.code = issue_reset_code(EMAIL)
+        self.wrong = '0' * len(self.code) if self.code != '0' * len(self.code) else '1' * len(self.code)
+
+    def attempts(self):
+        return PasswordResetCode.objects.get().attempts
+
+    def test_locks_after_max_wrong_guesses(self):
+        for _ in range(3):
+            self.assertEqual(check_reset_code(EMAIL, self.wrong), CODE_INVALID)
+        self.assertEqual(check_reset_code(EMAIL, self.code), CODE_LOCKED)
+
+    def test_attempt_is_counted_before_the_comparison(self):
+        seen = []
+
+        def compare_digest(a, b):
+            seen.append(self.attempts())
+            return False
+
+        with mock.patch('users.reset_codes.hmac.compare_digest', compare_digest):
+            check_reset_code(EMAIL, self.wrong)
+        self.assertEqual(seen, [1])
+
+    def test_concurrent_guesses_past_the_limit_are_locked(self):
+        # Requests that read the row before the others recorded their attempts
+        PasswordResetCode.objects.update(attempts=3)
+        with mock.patch('users.reset_codes.hmac.compare_digest') as compare_digest:
+            self.assertEqual(check_reset_code(EMAIL, self.code), CODE_LOCKED)
+        compare_digest.assert_not_called()
+        self.assertEqual(self.attempts(), 3)
+
+    def test_correct_code_gives_its_attempt_back(self):
+        check_reset_code(EMAIL, self.wrong)
+        for _ in range(5):
+            self.assertEqual(check_reset_code(EMAIL, self.code), CODE_VALID)
+        self.assertEqual(self.attempts(), 1)
+
+    def test_reissuing_replaces_the_code(self):
+        check_reset_code(EMAIL, self.wrong)
+        code = issue_reset_code(EMAIL)
+        self.assertEqual(PasswordResetCode.objects.get().attempts, 0)
+        self.assertEqual(check_reset_code(EMAIL, code), CODE_VALID)
+        if code != self.code:
+            self.assertEqual(check_reset_code(EMAIL, self.code), CODE_INVALID)
+
+    def test_consumed_code_can_be_used_once(self):
+        self.assertEqual(check_reset_code(EMAIL, self.code, consume=True), CODE_VALID)
+        self.assertEqual(check_reset_code(EMAIL, self.code, consume=True), CODE_INVALID)
+
+
+class ForgotPasswordViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='alice', email=EMAIL)
+
+    def post(self, step, data):
+        response = self.client.post(f'/api/users/forgot-password/{step}/', dumps(data), content_type='application/json')
+        return response.status_code, loads(response.content)
+
+    def test_reset_flow(self):
+        self.assertEqual(self.post('send-code', {'email': EMAIL})[0], 200)
+        code = OutboundEmail.objects.get(to=[EMAIL]).body.rsplit(' ', 1)[-1]
+        self.assertEqual(self.post('check-code', {'email': EMAIL, 'code': code})[0], 200)
+        status, _ = self.post('change-password', {'email': EMAIL, 'code': code, 'new_password': 'new-correct-horse'})
+        self.assertEqual(status, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('new-correct-horse'))
+        self.assertEqual(self.post('check-code', {'email': EMAIL, 'code': code})[0], 400)
+
+    def test_unknown_email_and_wrong_code(self):
+        self.assertEqual(self.post('send-code', {'email': 'bob@example.com'})[0], 404)
+        self.assertEqual(self.post('check-code', {'email': EMAIL, 'code': '123456'}), (400, {'errors': ['Invalid reset code']}))
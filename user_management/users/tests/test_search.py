@@ -0,0 +1,55 @@
+from django.test import TestCase
+from user_management.fastjson import dumps, loads
+from users.models import User
+from users.search import decode_cursor, encode_cursor, estimate_total, search_usernames
+from users.tests.test_middleware import JWTClientTestCase
+
+
+class SearchUsernamesTests(TestCase):
+    def setUp(self):
+        for name in ('player3', 'Player1', 'player2', 'other', 'PLAYER4'):
+            User.objects.create(username=name, email=f'{name}@example.com')
+
+    def pages(self, query, limit):
+        pages, cursor = [], None
+        while True:
+            usernames, cursor = search_usernames(query, limit, cursor)
+            pages.append(usernames)
+            if cursor is None:
+                return pages
+
+    def test_pages_cover_every_match_once_in_order(self):
+        self.assertEqual(self.pages('lay', 2), [['PLAYER4', 'Player1'], ['player2', 'player3']])
+
+    def test_last_full_page_has_no_cursor(self):
+        usernames, cursor = search_usernames('lay', 4)
+        self.assertEqual(len(usernames), 4)
+        self.assertIsNone(cursor)
+
+    def test_cursor_round_trips_and_rejects_garbage(self):
+        self.assertEqual(decode_cursor(encode_cursor('ünïcode')), 'ünïcode')
+        with self.assertRaises(ValueError):
+            search_usernames('lay', 2, cursor='_w')  # Not UTF-8
+
+    def test_estimate_total_counts_matches(self):
+        self.assertEqual(estimate_total('lay'), 4)
+
+
+class SearchUsernameViewTests(JWTClientTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='player1', email='player1@example.com')
+        User.objects.create(username='player2', email='player2@example.com')
+
+    def search(self, data, **headers):
+        response = self.client.post('/api/users/search-username/', dumps(data), content_type='application/json', **headers)
+        return response.status_code, loads(response.content)
+
+    def test_requires_an_access_token(self):
+        self.assertEqual(self.search({'username': 'lay'})[0], 401)
+        self.assertEqual(self.search({'username': 'lay'}, HTTP_AUTHORIZATION='Bearer not-a-jwt')[0], 401)
+
+    def test_pages_through_matches(self):
+        status, body = self.search({'username': 'lay', 'limit': 1}, **self.bearer(self.user))
+        self.assertEqual((status, body['users']), (200, [{'username': 'player1'}]))
+        status, body = self.search({'username': 'lay', 'cursor': body['next_cursor']}, **self.bearer(self.user))
+        self.assertEqual((status, body['users'], body['next_cursor']), (200, [{'username': 'player2'}], None))
@@ -0,0 +1,87 @@
+import re
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from JWTManager import JWTManager
+from user_management.fastjson import dumps, loads
+from users.availability import AvailabilityFilter
+from users.models import OutboundEmail, User
+from users.tests.test_refresh import es256_keys
+
+
+class SignupFlowTests(TestCase):
+    """
+    Drives the async signup, verify-email and signin views through the ASGI test client.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        private_pem, public_pem = es256_keys()
+        cls.enterClassContext(override_settings(
+            JWT_ALGORITHM='ES256', ACCESS_PRIVATE_KEY=private_pem, ACCESS_PUBLIC_KEY=public_pem,
+        ))
+        cls.enterClassContext(mock.patch('users.ratelimit.rate_limit_engine.is_allowed', return_value=True))
+        cls.enterClassContext(mock.patch.object(AvailabilityFilter, 'schedule_sync'))
+
+    def post(self, path, data):
+        response = async_to_sync(self.async_client.post)(path, dumps(data), content_type='application/json')
+        return response.status_code, loads(response.content)
+
+    def get(self, path, data):
+        response = async_to_sync(self.async_client.get)(path, data)
+        return response.status_code, loads(response.content)
+
+    def signup(self):
+        return self.post('/api/users/signup/', {
+            'username': 'alice', 'email': 'alice@example.com', 'password': 'correct-horse',
+        })
+
+    def verification_params(self):
+        email = OutboundEmail.objects.get(to=['alice@example.com'])
+        return dict(re.search(r'\?uid=(?P<uid>\d+)&token=(?P<token>\S+)', email.body).groupdict())
+
+    def signin(self, password='correct-horse'):
+        return self.post('/api/users/signin/', {'email': 'alice@example.com', 'password': password})
+
+    def test_signup_verify_and_signin(self):
+        self.assertEqual(self.signup()[0], 201)
+        self.assertEqual(self.signin(), (403, {'message': 'Email not verified'}))
+
+        params = self.verification_params()
+        self.assertEqual(self.get('/api/users/verify-email/', params)[0], 200)
+        self.assertTrue(User.objects.get(username='alice').email_verified)
+        self.assertEqual(self.get('/api/users/verify-email/', params)[0], 400)
+
+        status, body = self.signin()
+        self.assertEqual(status, 200)
+        user_id = User.objects.get(username='alice').pk
+        self.assertEqual(body['user_id'], user_id)
+        self.assertEqual(JWTManager.validate_access_token(body['access_token'])['user_id'], user_id)
+        self.assertEqual(JWTManager.validate_refresh_token(body['refresh_token'])['user_id'], user_id)
+
+    def test_verify_account_returns_a_refresh_token(self):
+        self.signup()
+        params = self.verification_params()
+        path = f"/api/users/verify-account/{params['uid']}/{params['token']}/"
+        status, body = self.post(path, {})
+        self.assertEqual(status, 200)
+        self.assertEqual(JWTManager.validate_refresh_token(body['refresh_token'])['user_id'], int(params['uid']))
+        self.assertEqual(self.post(path, {}), (400, {'errors': ['User already verified']}))
+
+    def test_signup_refuses_duplicates(self):
+        self.assertEqual(self.signup()[0], 201)
+        self.assertEqual(self.signup(), (400, {'message': 'Username is already taken'}))
+
+    def test_verify_rejects_bad_tokens(self):
+        self.signup()
+        params = self.verification_params()
+        for bad in ({'uid': params['uid'], 'token': 'bad-token'}, {'uid': 'x', 'token': params['token']}, {}):
+            with self.subTest(params=bad):
+                self.assertEqual(self.get('/api/users/verify-email/', bad)[0], 400)
+        self.assertFalse(User.objects.get(username='alice').email_verified)
+
+    def test_signin_rejects_wrong_password(self):
+        self.signup()
+        self.assertEqual(self.signin('wrong-horse'), (401, {'message': 'Invalid password'}))
+        self.assertEqual(self.post('/api/users/signin/', {'email': 'bob@example.com', 'password': 'correct-horse'})[0], 404)
@@ -0,0 +1,99 @@
+from unittest import mock
+from urllib.parse import urlencode
+import pyotp
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from users.models import User
+from users.tests.test_middleware import JWTClientTestCase
+from users.totp import TOTP_INVALID, TOTP_LOCKED, TOTP_REPLAYED, TOTP_VALID, TOTPService
+
+
+@override_settings(TOTP_MAX_FAILURES=3, TOTP_VALID_WINDOW=0)
+class TOTPServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create(
+            username='alice', email='alice@example.com', has_2fa=True, totp_secret=pyotp.random_base32(),
+        )
+        self.service = TOTPService()
+
+    def code(self):
+        return pyotp.TOTP(self.user.totp_secret).now()
+
+    def wrong_code(self):
+        return f'{(int(self.code()) + 1) % 1000000:06d}'
+
+    def test_code_is_accepted_once(self):
+        code = self.code()
+        self.assertEqual(self.service.check(self.user, code), TOTP_VALID)
+        with self.assertLogs('users.totp', 'WARNING'):
+            self.assertEqual(self.service.check(self.user, code), TOTP_REPLAYED)
+
+    def test_replay_is_refused_by_another_service_sharing_the_cache(self):
+        code = self.code()
+        self.assertEqual(self.service.check(self.user, code), TOTP_VALID)
+        with self.assertLogs('users.totp', 'WARNING'):
+            self.assertEqual(TOTPService().check(self.user, code), TOTP_REPLAYED)
+
+    def test_locks_after_max_failures(self):
+        for _ in range(3):
+            self.assertEqual(self.service.check(self.user, self.wrong_code()), TOTP_INVALID)
+        with self.assertLogs('users.totp', 'WARNING'):
+            self.assertEqual(self.service.check(self.user, self.code()), TOTP_LOCKED)
+
+    def test_lockout_is_shared_between_services(self):
+        for _ in range(3):
+            TOTPService().check(self.user, self.wrong_code())
+        with self.assertLogs('users.totp', 'WARNING'):
+            self.assertEqual(self.service.check(self.user, self.code()), TOTP_LOCKED)
+
+    def test_attempt_is_claimed_before_the_comparison(self):
+        # Concurrent guesses that all read the slots before any was claimed still need a slot each
+        real_add = cache.add
+        claims = []
+
+        def add(key, *args, **kwargs):
+            added = real_add(key, *args, **kwargs)
+            claims.append(added)
+            return added
+
+        with mock.patch('users.totp.cache.get_many', return_value={}), mock.patch('users.totp.cache.add', add):
+            for _ in range(3):
+                self.service.check(self.user, self.wrong_code())
+            with self.assertLogs('users.totp', 'WARNING'):
+                self.assertEqual(self.service.check(self.user, self.code()), TOTP_LOCKED)
+        self.assertEqual(claims.count(True), 3)
+
+    def test_valid_code_frees_the_attempts(self):
+        for _ in range(2):
+            self.service.check(self.user, self.wrong_code())
+        self.assertEqual(self.service.check(self.user, self.code()), TOTP_VALID)
+        for _ in range(3):
+            self.assertEqual(self.service.check(self.user, self.wrong_code()), TOTP_INVALID)
+
+
+class DeleteAccountViewTests(JWTClientTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='alice', email='alice@example.com')
+        self.user.set_password('correct-horse')
+        self.user.save()
+
+    def delete_account(self, headers=None, **params):
+        query = urlencode(params)
+        return self.client.delete(f'/api/users/delete-account/?{query}', **(headers or {}))
+
+    def test_requires_an_access_token(self):
+        self.assertEqual(self.delete_account(password='correct-horse').status_code, 401)
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+    def test_checks_password_and_2fa_code(self):
+        self.user.enable_2fa()
+        headers = self.bearer(self.user)
+        with self.assertLogs('users.views.delete_account', 'WARNING'):
+            self.assertEqual(self.delete_account(headers, password='wrong-horse').status_code, 401)
+            self.assertEqual(self.delete_account(headers, password='correct-horse').status_code, 401)
+        code = pyotp.TOTP(self.user.totp_secret).now()
+        self.assertEqual(self.delete_account(headers, password='correct-horse', **{'2fa_code': code}).status_code, 200)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
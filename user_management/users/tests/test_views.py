@@ -0,0 +1,44 @@
+from importlib import import_module
+from unittest import mock
+from asgiref.sync import iscoroutinefunction
+from django.test import SimpleTestCase
+from django.urls import get_resolver, resolve, reverse
+from users.views import VIEW_MODULES, LazyView
+
+
+class LazyViewTests(SimpleTestCase):
+    def test_resolver_introspection_does_not_load_views(self):
+        patterns = get_resolver('users.urls').url_patterns
+        # Views loaded by request tests earlier in the run are unloaded for this test
+        for pattern in patterns:
+            patcher = mock.patch.object(pattern.callback, '_view', None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Reversing populates the resolver, which reads every callback's lookup_str
+        reverse('login')
+        for pattern in patterns:
+            self.assertIsInstance(pattern.callback, LazyView)
+            self.assertIsNone(pattern.callback._view, pattern.name)
+            self.assertEqual(pattern.lookup_str, f'{pattern.callback.__module__}.{pattern.callback.name}')
+
+    def test_every_routed_view_imports(self):
+        # Lazy loading defers import errors to the first request; surface them here
+        for pattern in get_resolver('users.urls').url_patterns:
+            with self.subTest(pattern.name):
+                view_class = getattr(import_module(pattern.callback.__module__), pattern.callback.name)
+                view = view_class.as_view(**pattern.callback.initkwargs)
+                self.assertEqual(iscoroutinefunction(view), pattern.callback.asynchronous)
+
+    def test_every_listed_view_imports(self):
+        for name, module in VIEW_MODULES.items():
+            with self.subTest(name):
+                self.assertTrue(hasattr(import_module(f'users.views.{module}'), name))
+
+    def test_request_attributes_load_the_view(self):
+        view = LazyView('ProtectedView')
+        self.assertFalse(hasattr(view, 'view_class'))
+        self.assertTrue(view.csrf_exempt)
+        self.assertEqual(view.view_class.__name__, 'ProtectedView')
+
+    def test_resolve_reports_the_view_path(self):
+        self.assertEqual(resolve('/api/users/protected/')._func_path, 'users.views.auth.ProtectedView')
@@ -0,0 +1,133 @@
+import hmac
+import logging
+import threading
+import time
+from functools import lru_cache
+import pyotp
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+TOTP_VALID = 'valid'
+TOTP_INVALID = 'invalid'
+TOTP_REPLAYED = 'replayed'
+TOTP_LOCKED = 'locked'
+
+# Verifier objects kept per process, keyed by secret
+VERIFIER_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=VERIFIER_CACHE_SIZE)
+def get_verifier(secret):
+    return pyotp.TOTP(secret)
+
+
+def failure_slot_key(user_id, slot):
+    return f'users:totp:failures:{user_id}:{slot}'
+
+
+def used_step_key(user_id, step):
+    return f'users:totp:used:{user_id}:{step}'
+
+
+class TOTPService:
+    """
+    Verifies 2FA codes.
+
+    Each code is compared against the time steps within TOTP_VALID_WINDOW of
+    now with a constant-time comparison. A (user, time step) pair can only be
+    used once, so a code seen by an attacker can't be replayed while it is
+    still valid. After TOTP_MAX_FAILURES wrong codes within
+    TOTP_LOCKOUT_SECONDS the user is locked out of 2FA until the window
+    expires.
+
+    Every check claims one of TOTP_MAX_FAILURES attempt slots with
+    cache.add() before the code is compared, and a check that finds no free
+    slot is locked. add() is atomic, unlike a get() followed by incr(), so
+    concurrent guesses can't get past the limit. A valid code frees the slots.
+
+    Used steps and attempt slots live in the default cache, which has to be
+    shared between workers (see users.checks).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outcomes = {TOTP_VALID: 0, TOTP_INVALID: 0, TOTP_REPLAYED: 0, TOTP_LOCKED: 0}
+
+    def _matching_step(self, secret, code):
+        verifier = get_verifier(secret)
+        code = str(code).strip()
+        if len(code) != verifier.digits or not code.isdigit():
+            return None
+        now = int(time.time()) // verifier.interval
+        window = settings.TOTP_VALID_WINDOW
+        for step in range(now - window, now + window + 1):
+            if hmac.compare_digest(code, verifier.generate_otp(step)):
+                return step
+        return None
+
+    def _claim_attempt(self, user_id):
+        """
+        Claims a free attempt slot for user_id.
+        Returns:
+            bool: False if all TOTP_MAX_FAILURES slots are taken.
+        """
+        keys = [failure_slot_key(user_id, slot) for slot in range(settings.TOTP_MAX_FAILURES)]
+        taken = cache.get_many(keys)
+        for key in keys:
+            # Another request may take a slot between get_many() and add(); add() then fails and the next one is tried
+            if key not in taken and cache.add(key, True, settings.TOTP_LOCKOUT_SECONDS):
+                return True
+        return False
+
+    def _release_attempts(self, user_id):
+        cache.delete_many([failure_slot_key(user_id, slot) for slot in range(settings.TOTP_MAX_FAILURES)])
+
+    def check(self, user, code):
+        """
+        Checks a 2FA code for a user.
+        Args:
+            user (User): The user, with has_2fa and totp_secret loaded.
+            code (str): The code provided by the user.
+        Returns:
+            str: TOTP_VALID, TOTP_INVALID, TOTP_REPLAYED or TOTP_LOCKED.
+        """
+        outcome = self._check(user, code)
+        with self._lock:
+            self._outcomes[outcome] += 1
+        if outcome in (TOTP_REPLAYED, TOTP_LOCKED):
+            logger.warning(f'2FA code {outcome} for user {user.pk}')
+        return outcome
+
+    def _check(self, user, code):
+        if not user.has_2fa or not user.totp_secret or not code:
+            return TOTP_INVALID
+        if not self._claim_attempt(user.pk):
+            return TOTP_LOCKED
+
+        # The claimed slot stays taken unless the code turns out valid
+        step = self._matching_step(user.totp_secret, code)
+        if step is None:
+            return TOTP_INVALID
+
+        # Kept until the step has left the window on every worker's clock
+        interval = get_verifier(user.totp_secret).interval
+        if not cache.add(used_step_key(user.pk, step), True, interval * (2 * settings.TOTP_VALID_WINDOW + 2)):
+            return TOTP_REPLAYED
+        self._release_attempts(user.pk)
+        return TOTP_VALID
+
+    async def acheck(self, user, code):
+        return await sync_to_async(self.check)(user, code)
+
+    def verify(self, user, code):
+        return self.check(user, code) == TOTP_VALID
+
+    def stats(self):
+        with self._lock:
+            return dict(self._outcomes)
+
+
+totp_service = TOTPService()
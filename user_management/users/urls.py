@@ -1,17 +1,27 @@
 from django.urls import path
-from .views import RegisterView, LoginView, LogoutView, ProtectedView, DefaultUsersView, SigninView, SignupView,
-from .views import VerifyEmailView, SearchUsernameView, IsUsernameTakenView
-urlpatterns = [
-    path('', DefaultUsersView.as_view(), name='default_users'),
-    path('register/', RegisterView.as_view(), name='register'),
-    path('login/', LoginView.as_view(), name='login'),
-    path('logout/', LogoutView.as_view(), name='logout'),
-    path('signin/', SigninView.as_view(), name='signin'),
-    path('signup/', SignupView.as_view(), name='signup'),
-    path('verify-email/', VerifyEmailView.as_view(), name='verify_email'),
-    path('search-username/', SearchUsernameView.as_view(), name='search_username'),
-    # IsUsernameTakenView path
-    path('is-username-taken/', IsUsernameTakenView.as_view(), name='is_username_taken'),, ProtectedView.as_view(), name='protected'),
-
+from .views import lazy_view
 
+# Views are imported on their first request; async views must be declared as such
+urlpatterns = [
+    path('', lazy_view('DefaultUsersView'), name='default_users'),
+    path('register/', lazy_view('RegisterView'), name='register'),
+    path('login/', lazy_view('LoginView'), name='login'),
+    path('logout/', lazy_view('LogoutView'), name='logout'),
+    path('signin/', lazy_view('SigninView', asynchronous=True), name='signin'),
+    path('signup/', lazy_view('SignupView', asynchronous=True), name='signup'),
+    path('verify-email/', lazy_view('VerifyEmailView', asynchronous=True), name='verify_email'),
+    path('verify-account/<int:user_id>/<str:token>/', lazy_view('VerifyAccountView', asynchronous=True), name='verify_account'),
+    path('search-username/', lazy_view('SearchUsernameView'), name='search_username'),
+    path('autocomplete-username/', lazy_view('AutocompleteUsernameView'), name='autocomplete_username'),
+    path('export/', lazy_view('UserDataExportView'), name='data_export'),
+    path('export/<int:job_id>/', lazy_view('DataExportStatusView'), name='data_export_status'),
+    path('export/<int:job_id>/download/', lazy_view('DataExportDownloadView'), name='data_export_download'),
+    path('is-username-taken/', lazy_view('IsUsernameTakenView', asynchronous=True), name='is_username_taken'),
+    path('availability/', lazy_view('AvailabilityView', asynchronous=True), name='availability'),
+    path('delete-account/', lazy_view('DeleteAccountView'), name='delete_account'),
+    path('delete-inactive-users/', lazy_view('DeleteInactiveUsersView'), name='delete_inactive_users'),
+    path('forgot-password/send-code/', lazy_view('ForgotPasswordSendCodeView'), name='forgot_password_send_code'),
+    path('forgot-password/check-code/', lazy_view('ForgotPasswordCheckCodeView'), name='forgot_password_check_code'),
+    path('forgot-password/change-password/', lazy_view('ForgotPasswordChangePasswordView'), name='forgot_password_change_password'),
+    path('protected/', lazy_view('ProtectedView'), name='protected'),
 ]
@@ -0,0 +1,112 @@
+"""
+Views of the users app, one module per endpoint group.
+
+Submodules are imported on first use rather than when the URLconf loads, so a
+worker only pays for the views (and their DRF, JWT, email and export
+dependencies) it actually serves. urls.py routes through lazy_view(), and
+`from users.views import SigninView` still works through __getattr__.
+"""
+from importlib import import_module
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import ImproperlyConfigured
+
+# View name -> submodule defining it
+VIEW_MODULES = {
+    'DefaultUsersView': 'auth',
+    'RegisterView': 'auth',
+    'LoginView': 'auth',
+    'LogoutView': 'auth',
+    'ProtectedView': 'auth',
+    'SigninView': 'signin',
+    'SignupView': 'signup',
+    'VerifyEmailView': 'verify_email',
+    'VerifyAccountView': 'verify_account',
+    'SearchUsernameView': 'search',
+    'AutocompleteUsernameView': 'autocomplete',
+    'UserDataExportView': 'export',
+    'DataExportStatusView': 'export',
+    'DataExportDownloadView': 'export',
+    'RefreshJWT': 'refresh',
+    'IsUsernameTakenView': 'availability',
+    'IsEmailTakenView': 'availability',
+    'AvailabilityView': 'availability',
+    'MeView': 'me',
+    'DeleteInactiveUsersView': 'purge',
+    'DeleteAccountView': 'delete_account',
+    'ForgotPasswordSendCodeView': 'forgot_password',
+    'ForgotPasswordCheckCodeView': 'forgot_password',
+    'ForgotPasswordChangePasswordView': 'forgot_password',
+}
+
+
+def load_view(name):
+    """
+    Imports the submodule defining a view and returns the view class.
+    """
+    return getattr(import_module(f'{__name__}.{VIEW_MODULES[name]}'), name)
+
+
+def __getattr__(name):
+    if name not in VIEW_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return load_view(name)
+
+
+class LazyView:
+    """
+    URL callback that imports its view class and calls as_view() on the first request.
+    Args:
+        name (str): A view name from VIEW_MODULES.
+        asynchronous (bool): Whether the view's handlers are async. Django picks
+            sync or async dispatch before the view is loaded, so this must be
+            declared up front; a mismatch raises ImproperlyConfigured on first use.
+        initkwargs: Passed to as_view().
+    """
+
+    # Read by URL resolver introspection (URLPattern.lookup_str, ResolverMatch),
+    # not only by requests; answered without importing the view until it is loaded
+    INTROSPECTION_ATTRIBUTES = ('view_class', 'view_initkwargs')
+
+    def __init__(self, name, asynchronous=False, **initkwargs):
+        if name not in VIEW_MODULES:
+            raise ImproperlyConfigured(f'Unknown view {name!r}; add it to users.views.VIEW_MODULES')
+        # The dotted path the resolver reports for the view, without importing it
+        self.__module__ = f'{__name__}.{VIEW_MODULES[name]}'
+        self.__name__ = self.__qualname__ = name
+        self.name = name
+        self.asynchronous = asynchronous
+        self.initkwargs = initkwargs
+        self._view = None
+        if asynchronous:
+            markcoroutinefunction(self)
+
+    @property
+    def view(self):
+        if self._view is None:
+            view = load_view(self.name).as_view(**self.initkwargs)
+            if iscoroutinefunction(view) != self.asynchronous:
+                raise ImproperlyConfigured(
+                    f'{self.name} is {"async" if iscoroutinefunction(view) else "sync"}; '
+                    f'pass asynchronous={not self.asynchronous} to lazy_view()'
+                )
+            self._view = view
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # Attributes set by as_view() and decorators (csrf_exempt, ...) are read
+        # by middleware before the view runs, so they load it
+        if name.startswith('_') or name == 'view':
+            raise AttributeError(name)
+        if name in self.INTROSPECTION_ATTRIBUTES and self._view is None:
+            raise AttributeError(name)
+        return getattr(self.view, name)
+
+    def __repr__(self):
+        return f'<LazyView {self.name}>'
+
+
+def lazy_view(name, asynchronous=False, **initkwargs):
+    return LazyView(name, asynchronous, **initkwargs)
@@ -0,0 +1,100 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import IsAuthenticated
+from django.contrib.auth import authenticate
+from jwt import InvalidTokenError
+from JWTManager import JWTManager
+from ..authentication import CachedTokenAuthentication
+from ..hashing import HashingBusy
+from ..serializers import UserSerializer
+
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+class DefaultUsersView(APIView):
+    """
+    Default view for /api/users/
+    """
+    def get(self, request):
+        return Response({
+            "message": "Welcome to the Users API!",
+            "endpoints": {
+                "register": "/api/users/register/",
+                "login": "/api/users/login/",
+                "logout": "/api/users/logout/",
+                "protected": "/api/users/protected/",
+            }
+        })
+
+
+class RegisterView(APIView):
+    """
+    Endpoint to register a new user.
+    """
+    def post(self, request):
+        serializer = UserSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                user = serializer.save()
+            except HashingBusy:
+                return Response({'error': 'Server busy, please retry'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            # Generate a token for the newly registered user
+            token = Token.objects.create(user=user)
+            return Response({'token': token.key}, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LoginView(APIView):
+    """
+    Endpoint to log in an existing user.
+    """
+    def post(self, request):
+        username = request.data.get('username')
+        password = request.data.get('password')
+        try:
+            # Checks the password on the hashing pool (see users.backends)
+            user = authenticate(request, username=username, password=password)
+        except HashingBusy:
+            return Response({'error': 'Server busy, please retry'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if user:
+            # Generate or retrieve an existing token
+            token, created = Token.objects.get_or_create(user=user)
+            return Response({'token': token.key}, status=status.HTTP_200_OK)
+        return Response({'error': 'Invalid Credentials'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LogoutView(APIView):
+    """
+    Endpoint to log out the current user by invalidating the token.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        # Revoke the JWT refresh token too when the client sends it
+        refresh_token = request.data.get('refresh_token')
+        if refresh_token:
+            try:
+                payload = JWTManager.validate_refresh_token(refresh_token)
+                # Only the token's owner may revoke it
+                if payload.get('user_id') != request.user.pk:
+                    return Response({'error': 'Refresh token belongs to another user'}, status=status.HTTP_403_FORBIDDEN)
+                JWTManager.revoke_refresh_token(refresh_token)
+            except InvalidTokenError:  # Includes expired and already revoked tokens
+                return Response({'error': 'Invalid refresh token'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Delete the token, effectively logging out the user
+        request.auth.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class ProtectedView(APIView):
+    """
+    Example of a protected endpoint. Requires token authentication.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({'message': 'This is a protected view!'}, status=200)
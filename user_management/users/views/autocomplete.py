@@ -0,0 +1,38 @@
+from user_management.fastjson import JsonResponse
+from django.views import View
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from ..authentication import jwt_required
+from ..autocomplete import autocomplete_usernames
+
+
+@method_decorator(jwt_required(), name='dispatch')
+class AutocompleteUsernameView(View):
+    """
+    Usernames starting with what has been typed so far, for type-ahead.
+    Served from the in-memory prefix index, so it doesn't cost a query per keystroke.
+    Query Parameters:
+        - prefix: The start of the username (required).
+        - limit: Maximum number of usernames (optional, default=settings.MAX_AUTOCOMPLETE_RESULTS).
+    """
+
+    def get(self, request):
+        try:
+            prefix = request.GET.get('prefix', '').strip()
+            limit = request.GET.get('limit', settings.MAX_AUTOCOMPLETE_RESULTS)
+
+            if not prefix:
+                return JsonResponse({'errors': ['Prefix is required']}, status=400)
+            try:
+                limit = min(int(limit), settings.MAX_AUTOCOMPLETE_RESULTS)  # Cap the limit
+            except ValueError:
+                return JsonResponse({'errors': ['Limit must be an integer']}, status=400)
+
+            if limit < 1:
+                return JsonResponse({'errors': ['Limit must be greater than 0']}, status=400)
+
+            usernames, source = autocomplete_usernames(prefix, limit)
+            return JsonResponse({'prefix': prefix, 'usernames': usernames, 'source': source}, status=200)
+
+        except Exception as e:
+            return JsonResponse({'errors': [f'An unexpected error occurred: {str(e)}']}, status=500)
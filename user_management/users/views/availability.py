@@ -0,0 +1,141 @@
+from django.conf import settings
+from user_management.fastjson import JsonResponse, loads
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.contrib.auth import get_user_model
+from django.core.validators import EmailValidator
+from ..availability import aresolve_availability, availability_filter
+from ..ratelimit import rate_limited
+import logging
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+class IsUsernameTakenView(View):
+    @rate_limited('is_username_taken')
+    async def get(self, request):
+        try:
+            username = request.GET.get('username', '').strip().lower()
+            
+            if not username:
+                return JsonResponse({'error': 'Username required'}, status=400)
+                
+            if len(username) < 3:
+                return JsonResponse({'error': 'Username too short'}, status=400)
+                
+            if len(username) > 30:
+                return JsonResponse({'error': 'Username too long'}, status=400)
+
+            if not await availability_filter.amight_contain_username(username):
+                return JsonResponse({'taken': False})
+
+            is_taken = await User.objects.filter(username__iexact=username).aexists()
+            return JsonResponse({'taken': is_taken})
+
+        except Exception as e:
+            logger.error(f'Username check failed: {e}')
+            return JsonResponse({'error': 'Check failed'}, status=500)
+        
+
+class IsEmailTakenView(View):
+    email_validator = EmailValidator()
+
+    @rate_limited('is_email_taken')
+    async def get(self, request):
+        try:
+            email = request.GET.get('email', '').strip().lower()
+            
+            if not email:
+                return JsonResponse({'error': 'Email required'}, status=400)
+            
+            try:
+                self.email_validator(email)
+            except:
+                return JsonResponse({'error': 'Invalid email'}, status=400)
+
+            if not await availability_filter.amight_contain_email(email):
+                return JsonResponse({'taken': False})
+
+            is_taken = await User.objects.filter(email__iexact=email).aexists()
+            return JsonResponse({'taken': is_taken})
+
+        except Exception as e:
+            logger.error(f'Email check failed: {e}')
+            return JsonResponse({'error': 'Check failed'}, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AvailabilityView(View):
+    """
+    Checks several usernames and emails at once, e.g. while a signup form is filled in.
+
+    POST {"usernames": [...], "emails": [...]} with at most
+    AVAILABILITY_BATCH_MAX_ITEMS values in total. The response maps each
+    normalized value to {"taken": bool}; taken usernames also get up to
+    AVAILABILITY_SUGGESTIONS free alternatives, and invalid values get an
+    "error" instead. Everything is answered by at most one query.
+    """
+    email_validator = EmailValidator()
+
+    def validate_username(self, username):
+        if len(username) < 3:
+            return 'Username too short'
+        if len(username) > 30:
+            return 'Username too long'
+        return None
+
+    def validate_email(self, email):
+        try:
+            self.email_validator(email)
+        except Exception:
+            return 'Invalid email'
+        return None
+
+    @rate_limited('availability_batch')
+    async def post(self, request):
+        try:
+            try:
+                data = loads(request.body)
+                usernames = data.get('usernames', [])
+                emails = data.get('emails', [])
+            except (ValueError, AttributeError):
+                return JsonResponse({'errors': ['Invalid JSON body']}, status=400)
+            if not isinstance(usernames, list) or not isinstance(emails, list):
+                return JsonResponse({'errors': ['usernames and emails must be lists']}, status=400)
+            if not all(isinstance(value, str) for value in usernames + emails):
+                return JsonResponse({'errors': ['usernames and emails must be strings']}, status=400)
+            if not usernames and not emails:
+                return JsonResponse({'errors': ['Usernames or emails required']}, status=400)
+            if len(usernames) + len(emails) > settings.AVAILABILITY_BATCH_MAX_ITEMS:
+                return JsonResponse(
+                    {'errors': [f'At most {settings.AVAILABILITY_BATCH_MAX_ITEMS} usernames and emails per request']},
+                    status=400,
+                )
+
+            username_results, email_results = {}, {}
+            valid_usernames, valid_emails = [], []
+            for username in dict.fromkeys(value.strip().lower() for value in usernames):
+                error = self.validate_username(username)
+                if error:
+                    username_results[username] = {'error': error}
+                else:
+                    valid_usernames.append(username)
+            for email in dict.fromkeys(value.strip().lower() for value in emails):
+                error = self.validate_email(email)
+                if error:
+                    email_results[email] = {'error': error}
+                else:
+                    valid_emails.append(email)
+
+            resolved_usernames, resolved_emails = await aresolve_availability(
+                valid_usernames, valid_emails, settings.AVAILABILITY_SUGGESTIONS,
+            )
+            username_results.update(resolved_usernames)
+            email_results.update(resolved_emails)
+            return JsonResponse({'usernames': username_results, 'emails': email_results})
+
+        except Exception as e:
+            logger.error(f'Batch availability check failed: {e}')
+            return JsonResponse({'error': 'Check failed'}, status=500)
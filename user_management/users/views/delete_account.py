@@ -0,0 +1,162 @@
+from user_management.fastjson import JsonResponse
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from django.db import transaction
+from JWTManager import JWTManager
+from ..authentication import jwt_required
+from ..models import User
+from ..ratelimit import rate_limited
+from ..totp import totp_service, TOTP_LOCKED, TOTP_VALID
+import logging
+
+logger = logging.getLogger(__name__)
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(jwt_required(), name='dispatch')
+@method_decorator(rate_limited('delete_account'), name='dispatch')
+class DeleteAccountView(View):
+    """
+    A view to allow users to delete their own accounts.
+    Requires authentication and handles 2FA if enabled.
+    Rate limited to 3 attempts per hour.
+    """
+    
+    def validate_credentials(self, user, request):
+        """Validate user credentials including password and 2FA if enabled"""
+        # Verify password
+        password = request.GET.get('password')
+        if not password or not user.check_password(password):
+            logger.warning(f"Password verification failed for user {user.id}")
+            return False, JsonResponse(
+                {'error': 'Password verification failed'}, 
+                status=401
+            )
+
+        # Check 2FA if enabled
+        if user.has_2fa:
+            twofa_code = request.GET.get('2fa_code')
+            outcome = totp_service.check(user, twofa_code)
+            if outcome == TOTP_LOCKED:
+                return False, JsonResponse(
+                    {'error': 'Too many failed 2FA attempts, try again later'},
+                    status=429
+                )
+            if outcome != TOTP_VALID:
+                logger.warning(f"2FA verification failed for user {user.id}")
+                return False, JsonResponse(
+                    {'error': '2FA verification failed'}, 
+                    status=401
+                )
+
+        return True, None
+
+    def generate_deletion_token(self, user_id):
+        """Generate JWT token for account deletion"""
+        try:
+            return JWTManager.create_access_token(user_id), None
+        except Exception as e:
+            logger.error(f"JWT generation failed for user {user_id}: {e}")
+            return None, JsonResponse(
+                {'error': 'Authorization token generation failed'}, 
+                status=500
+            )
+
+    def perform_account_deletion(self, user, access_token):
+        """
+        Handles the actual deletion of the user account.
+        Performs necessary cleanup tasks and external service notifications.
+        """
+        try:
+            with transaction.atomic():
+                # Example: Clean up user data in external services
+                # self.cleanup_external_services(user.id, access_token)
+                
+                # Example: Archive user data if needed
+                # self.archive_user_data(user)
+                
+                # Delete the user
+                user_id = user.id
+                user.delete()
+                
+                logger.info(f"Account successfully deleted for user {user_id}")
+                return True
+
+        except Exception as e:
+            logger.error(f"Error deleting account for user {user.id}: {e}")
+            return False
+
+    def cleanup_external_services(self, user_id, access_token):
+        """
+        Clean up user data in external services.
+        Implement API calls to external services here.
+        """
+        try:
+            # Example: Delete user data from external service
+            # response = delete_external_account(user_id, access_token)
+            # if not response.get('success'):
+            #     raise Exception("External service cleanup failed")
+            pass
+        except Exception as e:
+            logger.error(f"External service cleanup failed for user {user_id}: {e}")
+            raise
+
+    def archive_user_data(self, user):
+        """
+        Archive user data before deletion if required.
+        Implement archiving logic here.
+        """
+        try:
+            # Example: Create user data archive
+            # UserArchive.objects.create(
+            #     user_id=user.id,
+            #     email=user.email,
+            #     username=user.username,
+            #     data=self.collect_user_data(user)
+            # )
+            pass
+        except Exception as e:
+            logger.error(f"Data archiving failed for user {user.id}: {e}")
+            raise
+
+    def delete(self, request):
+        """Handle DELETE request for account deletion"""
+        try:
+            # Get authenticated user
+            user_id = request.user.id
+            user = User.objects.get(id=user_id)
+
+            # Validate credentials
+            is_valid, error_response = self.validate_credentials(user, request)
+            if not is_valid:
+                return error_response
+
+            # Generate deletion token
+            access_token, error_response = self.generate_deletion_token(user_id)
+            if error_response:
+                return error_response
+
+            # Perform account deletion
+            if self.perform_account_deletion(user, access_token):
+                return JsonResponse(
+                    {'message': 'Account deleted successfully'}, 
+                    status=200
+                )
+            else:
+                return JsonResponse(
+                    {'error': 'Account deletion failed'}, 
+                    status=500
+                )
+
+        except User.DoesNotExist:
+            logger.error("User not found during account deletion")
+            return JsonResponse(
+                {'error': 'User not found'}, 
+                status=404
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error during account deletion: {e}")
+            return JsonResponse(
+                {'error': f'Unexpected error occurred'}, 
+                status=500
+            )
@@ -0,0 +1,83 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_jwt.authentication import JSONWebTokenAuthentication
+from django.http import FileResponse
+import logging
+import os
+from ..models import DataExportJob
+from ..ratelimit import rate_limited
+
+logger = logging.getLogger(__name__)
+
+class UserDataExportView(APIView):
+    """
+    Queues a background export of the user's account data.
+    The archive is built by the run_export_jobs worker; poll DataExportStatusView for progress.
+    """
+    authentication_classes = [JSONWebTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @rate_limited('data_export')
+    def get(self, request):
+        try:
+            user = request.user  # JWT ensures the user is authenticated
+
+            # Reuse an export that is still in progress instead of queueing another one
+            job = DataExportJob.objects.filter(
+                user=user, status__in=[DataExportJob.STATUS_PENDING, DataExportJob.STATUS_RUNNING]
+            ).first()
+            if job is None:
+                job = DataExportJob.objects.create(user=user)
+
+            return Response({
+                'message': 'Data export has been queued; you will receive an email when it is ready',
+                'job_id': job.id,
+                'status': job.status,
+            }, status=status.HTTP_202_ACCEPTED)
+
+        except Exception as e:
+            logger.error(f'Data export failed: {e}')
+            return Response({'error': f'Export failed: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class DataExportStatusView(APIView):
+    """
+    Reports the status of one of the user's export jobs.
+    """
+    authentication_classes = [JSONWebTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = DataExportJob.objects.filter(id=job_id, user=request.user).first()
+        if job is None:
+            return Response({'error': 'Export not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'job_id': job.id,
+            'status': job.status,
+            'created_at': job.created_at,
+            'finished_at': job.finished_at,
+            'error': job.error or None,
+        })
+
+
+class DataExportDownloadView(APIView):
+    """
+    Streams a finished export archive.
+    """
+    authentication_classes = [JSONWebTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = DataExportJob.objects.filter(id=job_id, user=request.user, status=DataExportJob.STATUS_DONE).first()
+        if job is None or not os.path.exists(job.archive_path):
+            return Response({'error': 'Export not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        return FileResponse(
+            open(job.archive_path, 'rb'),
+            as_attachment=True,
+            filename=os.path.basename(job.archive_path),
+            content_type='application/zip',
+        )
@@ -0,0 +1,124 @@
+from django.conf import settings
+from user_management.fastjson import JsonResponse, loads
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from ..models import User
+from ..hashing import hashing_service, HashingBusy
+from ..outbox import enqueue_email
+from ..reset_codes import CODE_EXPIRED, CODE_LOCKED, CODE_VALID, check_reset_code, issue_reset_code
+
+CODE_ERRORS = {
+    CODE_EXPIRED: ('Reset code has expired', 400),
+    CODE_LOCKED: ('Too many attempts, request a new code', 429),
+}
+
+
+def code_error_response(result):
+    message, status = CODE_ERRORS.get(result, ('Invalid reset code', 400))
+    return JsonResponse({'errors': [message]}, status=status)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ForgotPasswordSendCodeView(View):
+    """
+    Sends a password reset code to the user's email.
+    """
+    @staticmethod
+    def post(request):
+        try:
+            # Parse the request
+            json_request = loads(request.body)
+            user_email = json_request.get('email')
+
+            if not user_email:
+                return JsonResponse({'errors': ['Email is required']}, status=400)
+
+            # Find user
+            user = User.objects.filter(email=user_email).first()
+            if not user:
+                return JsonResponse({'errors': ['User not found']}, status=404)
+
+            # Stored in the reset code table; the user row isn't written
+            random_code = issue_reset_code(user_email)
+
+            # Send email
+            subject = "Password Reset Code"
+            message = f"Your password reset code is: {random_code}"
+            enqueue_email(subject, message, [user_email], from_email=settings.EMAIL_HOST_USER)
+
+            return JsonResponse({'message': 'Reset code sent to your email'}, status=200)
+        except Exception as e:
+            return JsonResponse({'errors': [f'Error sending reset code: {e}']}, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ForgotPasswordCheckCodeView(View):
+    """
+    Validates the password reset code.
+    """
+    @staticmethod
+    def post(request):
+        try:
+            # Parse the request
+            json_request = loads(request.body)
+            user_email = json_request.get('email')
+            code_provided = json_request.get('code')
+
+            if not user_email or not code_provided:
+                return JsonResponse({'errors': ['Email and code are required']}, status=400)
+
+            # Codes only exist for known users, so no user lookup is needed
+            result = check_reset_code(user_email, code_provided)
+            if result != CODE_VALID:
+                return code_error_response(result)
+
+            return JsonResponse({'message': 'Reset code is valid'}, status=200)
+        except Exception as e:
+            return JsonResponse({'errors': [f'Error verifying code: {e}']}, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ForgotPasswordChangePasswordView(View):
+    """
+    Changes the user's password after verifying the reset code.
+    """
+    @staticmethod
+    def post(request):
+        try:
+            json_request = loads(request.body)
+            user_email = json_request.get('email')
+            code_provided = json_request.get('code')
+            new_password = json_request.get('new_password')
+
+            if not user_email or not code_provided or not new_password:
+                return JsonResponse({'errors': ['Email, code, and new password are required']}, status=400)
+
+            # Checked before the code is consumed so a rejected password doesn't use it up
+            if len(new_password) < settings.PASSWORD_MIN_LENGTH:
+                return JsonResponse({'errors': [f'Password must be at least {settings.PASSWORD_MIN_LENGTH} characters long']}, status=400)
+
+            # Wrong codes are turned away before paying for a password hash
+            result = check_reset_code(user_email, code_provided)
+            if result != CODE_VALID:
+                return code_error_response(result)
+
+            try:
+                hashed_password = hashing_service.make_password(new_password)
+            except HashingBusy:
+                return JsonResponse({'errors': ['Server busy, please retry']}, status=503)
+
+            result = check_reset_code(user_email, code_provided, consume=True)
+            if result != CODE_VALID:
+                return code_error_response(result)
+
+            user = User.objects.filter(email=user_email).first()
+            if not user:
+                return JsonResponse({'errors': ['User not found']}, status=404)
+
+            user.password = hashed_password
+            user.save(update_fields=['password'])
+
+            return JsonResponse({'message': 'Password reset successfully'}, status=200)
+        except Exception as e:
+            return JsonResponse({'errors': [f'Error resetting password: {e}']}, status=500)
@@ -0,0 +1,59 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_jwt.authentication import JSONWebTokenAuthentication
+from rest_framework_jwt.settings import api_settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from ..authentication import CachedTokenUser
+from ..profile import get_profile
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadJSONWebTokenAuthentication(JSONWebTokenAuthentication):
+    """
+    JSONWebTokenAuthentication that verifies the token but doesn't load the user.
+    request.user is a CachedTokenUser carrying the id and username from the
+    payload; views using it must check that the user still exists and is active.
+    """
+
+    def authenticate_credentials(self, payload):
+        user_id = api_settings.JWT_PAYLOAD_GET_USER_ID_HANDLER(payload)
+        if not user_id:
+            raise AuthenticationFailed('Invalid payload.')
+        return CachedTokenUser(user_id, api_settings.JWT_PAYLOAD_GET_USERNAME_HANDLER(payload))
+
+
+class MeView(APIView):
+    """
+    Returns the authenticated user's profile.
+    The serialized profile is kept in a per-process cache (users.profile)
+    until the user is saved on any worker, so repeat polls cost no query or
+    JSON encoding. Clients sending If-None-Match or If-Modified-Since get a 304
+    when the profile hasn't changed.
+    """
+    authentication_classes = [PayloadJSONWebTokenAuthentication]
+
+    def get(self, request):
+        try:
+            profile = get_profile(request.user.id)
+            if profile is None or not profile['is_active']:
+                return Response({'error': 'User not found or inactive'}, status=status.HTTP_401_UNAUTHORIZED)
+
+            response = get_conditional_response(
+                request, etag=profile['etag'], last_modified=int(profile['last_modified'])
+            )
+            if response is None:
+                response = HttpResponse(profile['body'], content_type='application/json')
+            response['ETag'] = profile['etag']
+            response['Last-Modified'] = http_date(profile['last_modified'])
+            response['Cache-Control'] = 'private, no-cache'
+            return response
+        except Exception as e:
+            logger.error(f'Profile fetch failed: {e}')
+            return Response({'error': 'Failed to fetch profile'}, 
+                          status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.http import HttpRequest
+from user_management.fastjson import JsonResponse
+from django.utils import timezone
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from ..authentication import jwt_required
+from ..models import User
+from ..purge import purge_in_chunks
+import logging
+
+logger = logging.getLogger(__name__)
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(jwt_required(staff=True), name='dispatch')
+class DeleteInactiveUsersView(View):
+    """
+    Purges inactive users and unverified accounts past their grace period.
+    Called by a staff account, e.g. from a scheduled job.
+    """
+    def delete(self, request: HttpRequest) -> JsonResponse:
+        try:
+            # Remove inactive users
+            inactive_reports, inactive_response = self.remove_inactive_users()
+            if inactive_response:
+                return JsonResponse({'errors': [inactive_response]}, status=500)
+
+            # Remove old pending accounts
+            pending_reports, pending_response = self.remove_old_pending_accounts()
+            if pending_response:
+                return JsonResponse({'errors': [pending_response]}, status=500)
+
+            return JsonResponse({
+                'message': 'Inactive and pending users deleted successfully',
+                'inactive_users': inactive_reports,
+                'pending_accounts': pending_reports,
+            }, status=200)
+
+        except Exception as e:
+            logger.error(f"Error in DeleteInactiveUsersView: {e}")
+            return JsonResponse({'errors': [f"Unexpected error: {e}"]}, status=500)
+
+    @staticmethod
+    def inactive_users(cutoff):
+        return User.objects.filter(last_activity__lt=cutoff, is_active=True)
+
+    @staticmethod
+    def old_pending_accounts(cutoff):
+        return User.objects.filter(email_verified=False, date_joined__lt=cutoff)
+
+    def remove_inactive_users(self):
+        try:
+            # Find users inactive for the configured period
+            inactivity_cutoff = timezone.now() - timezone.timedelta(
+                days=settings.MAX_INACTIVITY_DAYS_BEFORE_DELETION
+            )
+            reports = purge_in_chunks('inactive_users', self.inactive_users, inactivity_cutoff)
+            logger.info(f"Successfully deleted {sum(r['rows'] for r in reports)} inactive users.")
+            return reports, None  # No errors
+
+        except Exception as e:
+            # The checkpoint keeps the chunks already deleted; the next run resumes from there
+            logger.error(f"Error removing inactive users: {e}")
+            return None, f"Error removing inactive users: {e}"
+
+    def remove_old_pending_accounts(self):
+        try:
+            # Find unverified accounts past their grace period
+            pending_cutoff = timezone.now() - timezone.timedelta(
+                days=settings.MAX_DAYS_BEFORE_PENDING_ACCOUNTS_DELETION
+            )
+            reports = purge_in_chunks('pending_accounts', self.old_pending_accounts, pending_cutoff)
+            logger.info(f"Successfully deleted {sum(r['rows'] for r in reports)} pending accounts.")
+            return reports, None  # No errors
+
+        except Exception as e:
+            logger.error(f"Error removing pending accounts: {e}")
+            return None, f"Error removing pending accounts: {e}"
@@ -0,0 +1,75 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from jwt import InvalidTokenError
+from JWTManager import JWTManager
+import logging
+from ..ratelimit import rate_limited
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+class RefreshJWT(APIView):
+    """
+    Exchanges a refresh token from JWTManager for a new access token and a new
+    refresh token. The old refresh token is revoked in the same step, so each
+    one can be used once and a token revoked at logout is refused by every worker.
+    """
+    permission_classes = []
+
+    @rate_limited('refresh_jwt')
+    def post(self, request):
+        try:
+            refresh_token = request.data.get('refresh_token')
+            if not refresh_token:
+                return Response(
+                    {'error': 'Refresh token is required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            try:
+                payload = JWTManager.validate_refresh_token(refresh_token)
+            except InvalidTokenError as e:  # Includes ExpiredSignatureError and revoked tokens
+                logger.info(f"Refresh token rejected: {e}")
+                return Response(
+                    {'error': 'Invalid refresh token'},
+                    status=status.HTTP_401_UNAUTHORIZED
+                )
+
+            user = User.objects.filter(pk=payload.get('user_id')).first()
+            if user is None or not user.is_active or getattr(user, 'account_deleted', False):
+                return Response(
+                    {'error': 'User account is inactive or deleted'},
+                    status=status.HTTP_401_UNAUTHORIZED
+                )
+
+            try:
+                # Revokes refresh_token atomically, so a concurrent refresh with it fails here
+                access_token, new_refresh_token = JWTManager.refresh_access_token(refresh_token, rotate=True)
+            except InvalidTokenError:
+                return Response(
+                    {'error': 'Invalid refresh token'},
+                    status=status.HTTP_401_UNAUTHORIZED
+                )
+
+            # Update user's last login or activity
+            user.last_login = timezone.now()
+            if hasattr(user, 'update_latest_activity'):
+                user.update_latest_activity()
+            user.save(update_fields=['last_login'])
+
+            logger.info(f"Token refreshed for user: {user.id}")
+            return Response({
+                'access_token': access_token,
+                'refresh_token': new_refresh_token,
+                'user_id': user.id
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Token refresh failed: {str(e)}")
+            return Response(
+                {'error': 'Token refresh failed'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,67 @@
+from user_management.fastjson import JsonResponse, loads
+from django.views import View
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from ..authentication import jwt_required
+from ..search import search_usernames, estimate_total
+
+
+@method_decorator(jwt_required(), name='dispatch')
+@method_decorator(csrf_exempt, name='dispatch')
+class SearchUsernameView(View):
+    """
+    Search for users by username using POST.
+    Query Parameters:
+        - username: The search term (required).
+        - cursor: The next_cursor returned with the previous page (optional).
+        - limit: Results per page (optional, default=settings.MAX_USERNAME_SEARCH_RESULTS).
+        - estimate_total: Include the planner's estimate of the number of matches (optional, default=False).
+    """
+
+    def post(self, request):
+        try:
+            # Parse JSON request body
+            try:
+                json_request = loads(request.body)
+            except ValueError:  # Includes UnicodeDecodeError for bodies that aren't UTF-8
+                return JsonResponse({'errors': ['Invalid JSON format in the request body']}, status=400)
+            search_query = json_request.get('username', '').strip()
+            cursor = json_request.get('cursor')
+            limit = json_request.get('limit', settings.MAX_USERNAME_SEARCH_RESULTS)
+            with_estimate = bool(json_request.get('estimate_total', False))
+
+            # Validate inputs
+            if not search_query:
+                return JsonResponse({'errors': ['Username is required']}, status=400)
+            try:
+                limit = min(int(limit), settings.MAX_USERNAME_SEARCH_RESULTS)  # Cap the limit
+            except ValueError:
+                return JsonResponse({'errors': ['Limit must be an integer']}, status=400)
+
+            if limit < 1:
+                return JsonResponse({'errors': ['Limit must be greater than 0']}, status=400)
+
+            if cursor is not None and not isinstance(cursor, str):
+                return JsonResponse({'errors': ['Cursor must be a string']}, status=400)
+
+            # Perform the search
+            try:
+                usernames, next_cursor = search_usernames(search_query, limit, cursor)
+            except ValueError:
+                return JsonResponse({'errors': ['Invalid cursor']}, status=400)
+
+            # Build the response
+            response = {
+                'query': search_query,
+                'limit': limit,
+                'users': [{'username': username} for username in usernames],
+                'next_cursor': next_cursor,
+            }
+            if with_estimate:
+                response['estimated_total'] = estimate_total(search_query)
+
+            return JsonResponse(response, status=200)
+
+        except Exception as e:
+            return JsonResponse({'errors': [f'An unexpected error occurred: {str(e)}']}, status=500)
@@ -0,0 +1,78 @@
+from user_management.fastjson import JsonResponse, loads
+from django.views import View
+from JWTManager import JWTManager
+from ..models import User
+from ..hashing import hashing_service, HashingBusy
+from ..totp import totp_service, TOTP_LOCKED, TOTP_VALID
+
+
+from django.conf import settings
+
+class SigninView(View):
+    async def post(self, request):
+        # Parse JSON request
+        try:
+            data = loads(request.body)
+        except ValueError:  # Includes UnicodeDecodeError for bodies that aren't UTF-8
+            return JsonResponse({'message': 'Invalid JSON format'}, status=400)
+
+        # Extract login details
+        email = data.get('email')
+        password = data.get('password')
+
+        # Validate input
+        if not email or len(email) > settings.EMAIL_MAX_LENGTH:
+            return JsonResponse({'message': f'Email is required and must be less than {settings.EMAIL_MAX_LENGTH} characters'}, status=400)
+        
+        if not password or len(password) < settings.PASSWORD_MIN_LENGTH or len(password) > settings.PASSWORD_MAX_LENGTH:
+            return JsonResponse({
+                'message': f'Password must be between {settings.PASSWORD_MIN_LENGTH} and {settings.PASSWORD_MAX_LENGTH} characters'
+            }, status=400)
+
+        user = await User.objects.filter(email=email).afirst()
+        if not user:
+            return JsonResponse({'message': 'User not found'}, status=404)
+
+        try:
+            password_valid = await hashing_service.acheck_password(password, user.password)
+        except HashingBusy:
+            return JsonResponse({'message': 'Server busy, please retry'}, status=503)
+        if not password_valid:
+            return JsonResponse({'message': 'Invalid password'}, status=401)
+
+        if not user.email_verified:
+            return JsonResponse({'message': 'Email not verified'}, status=403)
+
+        if settings.SIGNIN_2FA_ENABLED and user.has_2fa:
+            twofa_code = data.get('2fa_code')
+            if not twofa_code:
+                return JsonResponse({'message': '2FA code required', '2fa_required': True}, status=401)
+            outcome = await totp_service.acheck(user, twofa_code)
+            if outcome == TOTP_LOCKED:
+                return JsonResponse({'message': 'Too many failed 2FA attempts, try again later'}, status=429)
+            if outcome != TOTP_VALID:
+                return JsonResponse({'message': 'Invalid 2FA code'}, status=401)
+
+        return JsonResponse({
+            'access_token': JWTManager.create_access_token(user.pk),
+            'refresh_token': JWTManager.create_refresh_token(user.pk),
+            'user_id': user.pk,
+        }, status=200)
+
+    @staticmethod
+    def get_user(email):
+        """
+        Retrieves a user by email or username.
+        """
+        try:
+            # First try fetching by email
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            try:
+                # Fall back to username lookup
+                user = User.objects.get(username=email)
+            except User.DoesNotExist:
+                return None, 'User not found'
+        except Exception as e:
+            return None, str(e)
+        return user, None
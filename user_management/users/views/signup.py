@@ -0,0 +1,69 @@
+from user_management.fastjson import JsonResponse, loads
+from django.contrib.auth.tokens import default_token_generator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.decorators import method_decorator
+from ..models import User
+from ..hashing import hashing_service, HashingBusy
+from ..outbox import aenqueue_email
+
+@method_decorator(csrf_exempt, name='dispatch')
+class SignupView(View):
+    async def post(self, request):
+        try:
+            data = loads(request.body)
+            username = data.get('username')
+            email = data.get('email')
+            password = data.get('password')
+        except ValueError:  # Includes UnicodeDecodeError for bodies that aren't UTF-8
+            return JsonResponse({'message': 'Invalid JSON format'}, status=400)
+
+        # Validate inputs
+        if not username or not email or not password:
+            return JsonResponse({'message': 'Username, email, and password are required'}, status=400)
+
+        if len(username) < 2 or len(username) > 20:
+            return JsonResponse({'message': 'Username must be between 2 and 20 characters'}, status=400)
+
+        if len(password) < 8 or len(password) > 100:
+            return JsonResponse({'message': 'Password must be between 8 and 100 characters'}, status=400)
+
+        if await User.objects.filter(username=username).aexists():
+            return JsonResponse({'message': 'Username is already taken'}, status=400)
+
+        if await User.objects.filter(email=email).aexists():
+            return JsonResponse({'message': 'Email is already registered'}, status=400)
+
+        try:
+            hashed_password = await hashing_service.amake_password(password)
+        except HashingBusy:
+            return JsonResponse({'message': 'Server busy, please retry'}, status=503)
+
+        # Create the user
+        try:
+            user = await User.objects.acreate(
+                username=username,
+                email=email,
+                password=hashed_password,
+                email_verified=False,
+            )
+
+            # Send verification email
+            await self.send_verification_email(user)
+
+        except Exception as e:
+            return JsonResponse({'message': f'Error creating user: {e}'}, status=500)
+
+        return JsonResponse({'message': 'User registered successfully. Please verify your email to activate your account.'}, status=201)
+
+    async def send_verification_email(self, user):
+        token = default_token_generator.make_token(user)
+        verification_url = f"http://localhost:8000/api/users/verify-email/?uid={user.pk}&token={token}"
+        subject = "Verify your email"
+        message = f"Hi {user.username},\n\nPlease click the link below to verify your email:\n\n{verification_url}\n\nThank you!"
+        await aenqueue_email(
+            subject,
+            message,
+            [user.email],
+            from_email='your-email@example.com',  # Replace with your email
+        )
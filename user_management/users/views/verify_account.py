@@ -0,0 +1,48 @@
+from django.contrib.auth.tokens import default_token_generator
+from django.utils import timezone
+from user_management.fastjson import JsonResponse
+from django.views import View
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from JWTManager import JWTManager
+from ..models import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class VerifyAccountView(View):
+    """
+    Verifies the email of a new account with the token sent by SignupView and
+    signs the user in, returning a refresh token. Tokens come from
+    default_token_generator and expire after PASSWORD_RESET_TIMEOUT.
+    """
+
+    async def post(self, request, user_id, token):
+        try:
+            # Fetch user by ID
+            user = await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
+            return JsonResponse({'errors': ['User not found']}, status=404)
+
+        if user.email_verified:
+            return JsonResponse({'errors': ['User already verified']}, status=400)
+
+        # Check the token validity, including its age
+        if not default_token_generator.check_token(user, token):
+            return JsonResponse({'errors': ['Invalid or expired verification token']}, status=401)
+
+        try:
+            # Mark email as verified and record the sign-in
+            user.email_verified = True
+            user.last_login = timezone.now()
+            await user.asave(update_fields=['email_verified', 'last_login'])
+
+            refresh_token = JWTManager.create_refresh_token(user.id)
+
+            logger.info(f"User {user_id} verified successfully.")
+            return JsonResponse({'message': 'User verified', 'refresh_token': refresh_token}, status=200)
+
+        except Exception as e:
+            logger.error(f"Unexpected error during verification: {e}")
+            return JsonResponse({'errors': [f'An unexpected error occurred: {e}']}, status=500)
@@ -0,0 +1,30 @@
+from django.contrib.auth.tokens import default_token_generator
+from user_management.fastjson import JsonResponse
+from django.views import View
+from ..models import User
+
+class VerifyEmailView(View):
+    async def get(self, request):
+        uid = request.GET.get('uid')
+        token = request.GET.get('token')
+
+        if not uid or not token:
+            return JsonResponse({'message': 'Verification token is required'}, status=400)
+
+        try:
+            user = await User.objects.aget(pk=uid)
+        except (User.DoesNotExist, ValueError):
+            return JsonResponse({'message': 'Invalid or expired token'}, status=400)
+
+        if user.email_verified:
+            return JsonResponse({'message': 'Email is already verified'}, status=400)
+
+        # Signed by SignupView with default_token_generator; expires after PASSWORD_RESET_TIMEOUT
+        if not default_token_generator.check_token(user, token):
+            return JsonResponse({'message': 'Invalid or expired token'}, status=400)
+
+        # Verify the email
+        user.email_verified = True
+        await user.asave(update_fields=['email_verified'])
+
+        return JsonResponse({'message': 'Email verified successfully'}, status=200)